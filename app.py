@@ -9,6 +9,8 @@ os.environ["OMP_NUM_THREADS"] = "1"
 # Handle import errors gracefully
 try:
     from components.chat_interface import render_chat_interface
+    from core.telemetry import start_metrics_server
+    from core.warmup import start_warmup
 except ImportError as e:
     st.error(f"Import error: {e}")
     st.info("There might be a dependency issue. Please check the requirements.txt file.")
@@ -38,21 +40,14 @@ if 'user_data' not in st.session_state:
 if 'conversation_flow' not in st.session_state:
     st.session_state.conversation_flow = 'onboarding'
 
-# Check if vector database needs initialization  
-if 'db_initialized' not in st.session_state:
-    if not os.path.exists('./chroma_db'):
-        st.warning("🔧 First time setup: Initializing career database...")
-        try:
-            from data.career_embeddings import populate_career_database
-            populate_career_database()
-            st.success("✅ Database initialized successfully!")
-            st.session_state.db_initialized = True
-        except Exception as e:
-            st.error(f"❌ Database initialization failed: {e}")
-            st.info("Database will be initialized automatically when you start chatting.")
-            st.session_state.db_initialized = False
-    else:
-        st.session_state.db_initialized = True
+# Warm up once per server process in a background thread: sync the career
+# catalog, load the embedding model, open the collection and prime the search
+# kernels while the user is on the onboarding screens. No request ever runs
+# ingestion or loads the model itself; steps that need them wait for readiness.
+start_warmup()
+
+# Prometheus /metrics endpoint for the whole process (only when TELEMETRY_ENABLED)
+start_metrics_server()
 
 # Render the chat interface based on the current flow state
 try:
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: blocking LLMManager vs AsyncLLMManager against the local fake Groq server.
+
+Issues the same N preference-extraction calls sequentially through the
+blocking client and concurrently through AsyncLLMManager.gather, and
+reports wall time for each. No network access or API key is needed. The
+LLM response cache and single-flight are turned off, so both paths make
+every call (and ./llm_cache.sqlite3 is not touched).
+
+Usage:
+    python benchmarks/bench_async_llm.py --calls 8 --latency 0.3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fake_groq_server import start_fake_groq_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    server, base_url = start_fake_groq_server(latency=args.latency)
+    os.environ["GROQ_BASE_URL"] = base_url
+    os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder-key")
+    # Otherwise the blocking loop fills the cache with the exact prompts the async run sends
+    os.environ.update({"LLM_CACHE_ENABLED": "false", "LLM_SINGLE_FLIGHT": "false"})
+
+    from core.async_llm_manager import AsyncLLMManager
+    from core.llm_manager import LLMManager
+
+    histories = [f"User Stage: Student\nSelected Interest Categories: interest {i}" for i in range(args.calls)]
+
+    blocking = LLMManager()
+    started = time.perf_counter()
+    for history in histories:
+        blocking.extract_preferences(history, "interests")
+    sequential = time.perf_counter() - started
+
+    manager = AsyncLLMManager(max_concurrency=args.max_concurrency)
+
+    async def fan_out():
+        return await manager.gather(**{
+            f"call_{i}": manager.extract_preferences(history, "interests")
+            for i, history in enumerate(histories)
+        })
+
+    started = time.perf_counter()
+    results = manager.run_sync(fan_out())
+    concurrent = time.perf_counter() - started
+    errors = [name for name, result in results.items() if isinstance(result, Exception) or "error" in result]
+
+    print(f"{args.calls} calls, {args.latency:.2f}s simulated latency, "
+          f"max {args.max_concurrency} in flight per model")
+    print(f"  blocking LLMManager (sequential): {sequential:.2f}s")
+    print(f"  AsyncLLMManager.gather:           {concurrent:.2f}s ({sequential / concurrent:.1f}x)")
+    if errors:
+        print(f"  ⚠️ {len(errors)} calls failed: {errors}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
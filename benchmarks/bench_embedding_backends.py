@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sentence-transformers (float32) vs ONNX Runtime (int8) embeddings.
+
+Accuracy: embeds the career catalog and a set of catalog-derived queries
+with both backends and reports how often the int8 top-k agrees with the
+float32 top-k. Two cases are checked: int8 queries against a float32
+collection (switching backends without re-ingesting) and int8 for both.
+Exits non-zero if mean top-k overlap falls below --min-agreement.
+
+Throughput: sentences/second for each backend at batch sizes 1, 8 and 64.
+
+Run `python data/export_onnx_model.py` first.
+
+Usage:
+    python benchmarks/bench_embedding_backends.py --top-k 5 --queries 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from measure import catalog_queries
+
+BATCH_SIZES = (1, 8, 64)
+
+
+def top_k(query_vectors, corpus_vectors, k):
+    import numpy as np
+    scores = query_vectors @ corpus_vectors.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def agreement(reference, candidate):
+    """Mean fraction of the reference top-k that the candidate also returns, and exact top-1 match rate"""
+    overlap = [len(set(ref) & set(cand)) / len(ref) for ref, cand in zip(reference, candidate)]
+    top1 = [ref[0] == cand[0] for ref, cand in zip(reference, candidate)]
+    return sum(overlap) / len(overlap), sum(top1) / len(top1)
+
+
+def normalized(vectors):
+    import numpy as np
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def throughput(model, texts, batch_size, rounds):
+    """Sentences per second encoding texts batch_size at a time"""
+    model.encode(texts[:batch_size], batch_size=batch_size)  # warm up
+    started = time.perf_counter()
+    encoded = 0
+    for _ in range(rounds):
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            model.encode(batch, batch_size=batch_size)
+            encoded += len(batch)
+    return encoded / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the texts per throughput run")
+    parser.add_argument("--min-agreement", type=float, default=0.9,
+                        help="Minimum mean top-k overlap for the int8 model")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    from core.embeddings import get_embedding_model
+    from core.ingestion import career_document
+    from data.career_catalog import load_career_catalog
+
+    careers = load_career_catalog()
+    documents = [career_document(career) for career in careers]
+    rng = random.Random(args.seed)
+    queries = catalog_queries(careers, args.queries, rng)
+
+    models = {
+        "float32 (sentence-transformers)": get_embedding_model(backend="sentence-transformers"),
+        "int8 (onnx)": get_embedding_model(backend="onnx")
+    }
+    reference_model, onnx_model = models.values()
+
+    print(f"Catalog: {len(documents)} careers, {len(queries)} queries, top-{args.top_k}")
+    float_corpus = normalized(reference_model.encode(documents, batch_size=64))
+    float_queries = normalized(reference_model.encode(queries, batch_size=64))
+    int8_corpus = normalized(onnx_model.encode(documents, batch_size=64))
+    int8_queries = normalized(onnx_model.encode(queries, batch_size=64))
+
+    reference = top_k(float_queries, float_corpus, args.top_k)
+    cosine = float((float_corpus * int8_corpus).sum(axis=1).mean())
+    print(f"Mean cosine(float32, int8) over catalog documents: {cosine:.4f}")
+
+    worst = 1.0
+    for name, candidate in (
+        ("int8 queries vs float32 collection", top_k(int8_queries, float_corpus, args.top_k)),
+        ("int8 queries vs int8 collection", top_k(int8_queries, int8_corpus, args.top_k))
+    ):
+        overlap, top1 = agreement(reference, candidate)
+        worst = min(worst, overlap)
+        print(f"  {name}: top-{args.top_k} overlap {overlap:.3f}, top-1 match {top1:.3f}")
+
+    print("\nThroughput (sentences/second):")
+    print(f"{'backend':>34} " + " ".join(f"{f'batch {size}':>10}" for size in BATCH_SIZES))
+    for name, model in models.items():
+        rates = [throughput(model, queries, size, args.rounds) for size in BATCH_SIZES]
+        print(f"{name:>34} " + " ".join(f"{rate:>10.1f}" for rate in rates))
+
+    if worst < args.min_agreement:
+        print(f"\n❌ int8 top-{args.top_k} agreement {worst:.3f} is below {args.min_agreement}")
+        sys.exit(1)
+    print(f"\n✅ int8 top-{args.top_k} agreement {worst:.3f} >= {args.min_agreement}")
+
+
+if __name__ == "__main__":
+    main()
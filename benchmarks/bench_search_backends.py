@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Chroma vs in-process NumPy search backend latency.
+
+Query embeddings are computed once up front so only the vector search is
+timed (the result cache is bypassed). Reports p50/p99 per backend over
+the local catalog, plus the BM25 lexical index fused into every search.
+Run `python setup.py` first so the collection exists.
+
+Usage:
+    python benchmarks/bench_search_backends.py --iterations 500 --top-k 4
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from measure import catalog_queries, percentile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    from core.chroma_manager import ChromaManager
+    from core.embeddings import encode_texts
+    from core.lexical_index import SharedLexicalIndex
+    from core.search_backends import SEARCH_BACKENDS
+    from data.career_catalog import load_career_catalog
+
+    chroma_manager = ChromaManager()
+    collection = chroma_manager.get_collection()
+    careers = load_career_catalog()
+    print(f"Catalog: {collection.count()} careers")
+
+    rng = random.Random(args.seed)
+    queries = catalog_queries(careers, args.iterations, rng)
+    embeddings = encode_texts(queries)
+
+    def report(name, latencies):
+        print(f"{name:>7}: p50={percentile(latencies, 50):.3f} ms  p99={percentile(latencies, 99):.3f} ms  "
+              f"mean={statistics.mean(latencies):.3f} ms over {len(latencies)} queries")
+
+    for name, backend_class in SEARCH_BACKENDS.items():
+        backend = backend_class(chroma_manager, collection)
+        backend.query_embeddings(embeddings[:1], args.top_k)  # load / warm up
+        latencies = []
+        for embedding in embeddings:
+            started = time.perf_counter()
+            backend.query_embeddings([embedding], args.top_k)
+            latencies.append((time.perf_counter() - started) * 1000)
+        report(name, latencies)
+
+    lexical_index = SharedLexicalIndex(chroma_manager)
+    lexical_index.search(queries[0], args.top_k)  # load
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        lexical_index.search(query, args.top_k * 2)
+        latencies.append((time.perf_counter() - started) * 1000)
+    report("bm25", latencies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-session CareerCounselor vs the process-wide shared counselor.
+
+For 1, 10 and 100 simulated sessions this reports peak RSS and the
+time-to-first-match (counselor lookup + first career search) seen by each
+session. Every (mode, sessions) pair runs in a fresh subprocess so RSS
+numbers are not polluted by earlier runs.
+
+Usage:
+    python benchmarks/bench_shared_counselor.py
+    python benchmarks/bench_shared_counselor.py --sessions 1 10 --query "data analysis"
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from measure import current_rss_mb, peak_rss_mb
+
+MODES = ("per_session", "shared")
+DEFAULT_SESSIONS = (1, 10, 100)
+
+
+def run_sessions(mode, sessions, query):
+    """Simulate concurrent sessions in this process and return a result dict"""
+    os.chdir(ROOT)
+    os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder-key")
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+    from core.career_counselor import CareerCounselor, get_career_counselor
+
+    rss_before = current_rss_mb()
+    latencies = [None] * sessions
+    counselors = [None] * sessions
+    start_barrier = threading.Barrier(sessions)
+
+    def session(index):
+        start_barrier.wait()
+        started = time.perf_counter()
+        if mode == "shared":
+            counselor = get_career_counselor()
+        else:
+            counselor = CareerCounselor()
+        counselor.search_career_data(query, top_k=4)
+        latencies[index] = time.perf_counter() - started
+        # Keep per-session counselors alive like st.session_state would
+        counselors[index] = counselor
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    wall_start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - wall_start
+
+    return {
+        "mode": mode,
+        "sessions": sessions,
+        "distinct_counselors": len({id(c) for c in counselors}),
+        "rss_before_mb": rss_before,
+        "rss_after_mb": current_rss_mb(),
+        "peak_rss_mb": peak_rss_mb(),
+        "first_match_p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "first_match_max_ms": round(max(latencies) * 1000, 1),
+        "wall_time_s": round(wall, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=list(DEFAULT_SESSIONS))
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--query", default="creative design technology")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "SESSIONS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, sessions = args.child[0], int(args.child[1])
+        print(json.dumps(run_sessions(mode, sessions, args.query)))
+        return
+
+    results = []
+    for sessions in args.sessions:
+        for mode in args.modes:
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, str(sessions),
+                 "--query", args.query],
+                capture_output=True, text=True, cwd=ROOT
+            )
+            if completed.returncode != 0:
+                print(f"❌ {mode} x{sessions} failed:\n{completed.stderr}")
+                continue
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            results.append(result)
+            print(f"{mode:>12} x{sessions:<4} counselors={result['distinct_counselors']:<4} "
+                  f"peak_rss={result['peak_rss_mb']:>8.1f} MB  "
+                  f"first_match p50={result['first_match_p50_ms']:>8.1f} ms "
+                  f"max={result['first_match_max_ms']:>8.1f} ms")
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
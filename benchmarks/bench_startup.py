@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start import profile of the Streamlit entry points.
+
+Runs `python -X importtime` in fresh interpreters for the modules the
+first paint needs (components.chat_interface) and for the deferred
+search/LLM stack (core.career_counselor), then prints the slowest imports
+by cumulative time. Exits non-zero if time-to-first-paint imports exceed
+--budget-ms, so it can guard cold start in CI.
+
+Usage:
+    python benchmarks/bench_startup.py --budget-ms 1500 --top 15
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# First paint (welcome/context check screens) vs. everything deferred behind it
+TARGETS = {
+    "first_paint": "import components.chat_interface",
+    "deferred_stack": "import core.career_counselor"
+}
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_imports(statement):
+    """(total_ms, [(cumulative_ms, self_ms, depth, module)]) for statement in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="0")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise RuntimeError(f"{statement!r} failed: {tail[0]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, (len(indent) - 1) // 2, module))
+    # Top-level imports (depth 0) add up to the whole statement
+    total_ms = sum(cumulative for cumulative, _, depth, _ in rows if depth == 0)
+    return total_ms, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=1500.0,
+                        help="Import budget for the first paint")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list per target")
+    args = parser.parse_args()
+
+    totals = {}
+    for name, statement in TARGETS.items():
+        # One throwaway run so .pyc compilation doesn't count
+        profile_imports(statement)
+        total_ms, rows = profile_imports(statement)
+        totals[name] = total_ms
+        print(f"\n{name}: {statement}  ->  {total_ms:.1f} ms")
+        print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        for cumulative, self_ms, depth, module in sorted(rows, reverse=True)[:args.top]:
+            print(f"{cumulative:>14.1f} {self_ms:>9.1f}  {'  ' * depth}{module}")
+
+    heavy = [module for module in ("groq", "chromadb", "sentence_transformers", "torch")
+             if module in {row[3] for row in profile_imports(TARGETS["first_paint"])[1]}]
+    if heavy:
+        print(f"\nWARNING: first paint imports heavy modules: {', '.join(heavy)}")
+
+    print(f"\nFirst paint: {totals['first_paint']:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if totals["first_paint"] > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
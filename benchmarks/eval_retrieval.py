@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Retrieval-quality evaluation: recall@k, MRR and nDCG@k next to latency.
+
+Runs the labeled interest queries in benchmarks/fixtures/labeled_queries.json
+(expected career ids from data/career_data.json, graded 2 = what the user
+asked for, 1 = also reasonable) through every combination of:
+  - embedding backend (--embedding-backends, e.g. sentence-transformers onnx)
+  - search backend (every entry in SEARCH_BACKENDS, e.g. chroma numpy)
+  - mode: "vector" (the backend alone) or "hybrid" (search_career_data,
+    i.e. the backend fused with the BM25 index)
+
+Every configuration searches the existing collection, so a second
+embedding backend is measured as a drop-in query encoder (the switch
+without re-ingesting). Query embedding and search result caches are
+cleared before every query, so latency is the uncached cost. Run
+`python setup.py` first so the collection exists; the ONNX backend also
+needs `python data/export_onnx_model.py`.
+
+Usage:
+    python benchmarks/eval_retrieval.py --k 5
+    python benchmarks/eval_retrieval.py --embedding-backends sentence-transformers onnx --output eval.json
+    python benchmarks/eval_retrieval.py --compare eval.json --min-ndcg 0.6
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from measure import compare_results, git_revision, latency_summary, timed, write_results
+
+LABELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "labeled_queries.json")
+MODES = ("vector", "hybrid")
+
+
+def recall_at_k(ranked_ids, relevant, k):
+    """Share of the relevant careers found in the top k"""
+    return len(set(ranked_ids[:k]) & set(relevant)) / len(relevant)
+
+
+def reciprocal_rank(ranked_ids, relevant):
+    """1 / rank of the first relevant career (0 if none was returned)"""
+    for rank, career_id in enumerate(ranked_ids, 1):
+        if career_id in relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranked_ids, relevant, k):
+    """Graded nDCG@k with gain 2^grade - 1 and a log2 position discount"""
+    dcg = sum((2 ** relevant.get(career_id, 0) - 1) / math.log2(rank + 1)
+              for rank, career_id in enumerate(ranked_ids[:k], 1))
+    ideal = sorted(relevant.values(), reverse=True)[:k]
+    ideal_dcg = sum((2 ** grade - 1) / math.log2(rank + 1) for rank, grade in enumerate(ideal, 1))
+    return dcg / ideal_dcg if ideal_dcg else 0.0
+
+
+def load_labeled_queries(path=LABELS_PATH):
+    """Labeled queries, checked against the ids in data/career_data.json"""
+    from data.career_catalog import CAREER_DATA_PATH, iter_catalog_records
+
+    with open(path, 'r', encoding='utf-8') as file:
+        labeled = json.load(file)["queries"]
+    known_ids = {career.get('id') for career in iter_catalog_records(CAREER_DATA_PATH)}
+    unknown = sorted({career_id for item in labeled for career_id in item["relevant"]} - known_ids)
+    if unknown:
+        raise ValueError(f"Labeled queries reference careers not in career_data.json: {unknown}")
+    return labeled
+
+
+def evaluate(search, labeled, k, clear_caches):
+    """Mean metrics and latency of search(query, k) over the labeled queries"""
+    recalls, reciprocal_ranks, ndcgs, latencies, misses = [], [], [], [], []
+    search(labeled[0]["query"], k)  # warm up
+    for item in labeled:
+        clear_caches()
+        results, seconds = timed(search, item["query"], k)
+        ranked_ids = [result.get('id') for result in results]
+        relevant = item["relevant"]
+        recalls.append(recall_at_k(ranked_ids, relevant, k))
+        reciprocal_ranks.append(reciprocal_rank(ranked_ids, relevant))
+        ndcgs.append(ndcg_at_k(ranked_ids, relevant, k))
+        latencies.append(seconds)
+        if reciprocal_ranks[-1] == 0.0:
+            misses.append(item["query"])
+    return {
+        f"recall_at_{k}": round(sum(recalls) / len(recalls), 4),
+        "mrr": round(sum(reciprocal_ranks) / len(reciprocal_ranks), 4),
+        f"ndcg_at_{k}": round(sum(ndcgs) / len(ndcgs), 4),
+        "latency": latency_summary(latencies),
+        "missed_queries": misses
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--labels", default=LABELS_PATH)
+    parser.add_argument("--embedding-backends", nargs="+",
+                        help="Embedding backends to query with (default: EMBEDDING_BACKEND)")
+    parser.add_argument("--search-backends", nargs="+", help="Search backends (default: all)")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--min-ndcg", type=float, help="Exit non-zero if any configuration scores below this")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder-key")
+    from core.career_counselor import CareerCounselor
+    from core.embeddings import get_embedding_backend, query_embedding_cache
+    from core.search_backends import SEARCH_BACKENDS, cached_search, search_result_cache
+
+    labeled = load_labeled_queries(args.labels)
+    counselor = CareerCounselor()
+    embedding_backends = args.embedding_backends or [get_embedding_backend()]
+    search_backends = args.search_backends or list(SEARCH_BACKENDS)
+
+    def clear_caches():
+        query_embedding_cache.clear()
+        search_result_cache.clear()
+
+    results = {"meta": {"git_revision": git_revision(ROOT), "k": args.k, "queries": len(labeled)},
+               "configurations": {}}
+    print(f"{len(labeled)} labeled queries, k={args.k}\n")
+    print(f"{'configuration':<44} {'recall':>7} {'MRR':>7} {'nDCG':>7} {'p50 ms':>8} {'p95 ms':>8}")
+    for embedding_backend in embedding_backends:
+        # Read on every call, so the same process can query with each backend in turn
+        os.environ["EMBEDDING_BACKEND"] = embedding_backend
+        for search_backend_name in search_backends:
+            backend = SEARCH_BACKENDS[search_backend_name](counselor.chroma_manager, counselor.collection)
+            counselor.search_backend = backend
+            searches = {
+                "vector": lambda query, k, backend=backend: cached_search(backend, query, k),
+                "hybrid": counselor.search_career_data
+            }
+            for mode in MODES:
+                name = f"{embedding_backend}/{search_backend_name}/{mode}"
+                metrics = evaluate(searches[mode], labeled, args.k, clear_caches)
+                results["configurations"][name] = metrics
+                print(f"{name:<44} {metrics[f'recall_at_{args.k}']:>7.3f} {metrics['mrr']:>7.3f} "
+                      f"{metrics[f'ndcg_at_{args.k}']:>7.3f} {metrics['latency']['p50_ms']:>8.2f} "
+                      f"{metrics['latency']['p95_ms']:>8.2f}")
+
+    if args.output:
+        write_results(results, args.output)
+        print(f"\nResults written to {args.output}")
+
+    failed = False
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        compare_results(baseline, results)
+        for name, metrics in results["configurations"].items():
+            before = baseline.get("configurations", {}).get(name, {}).get(f"ndcg_at_{args.k}")
+            if before is not None and metrics[f"ndcg_at_{args.k}"] < before:
+                print(f"  ⚠️ {name}: nDCG@{args.k} {before:.3f} -> {metrics[f'ndcg_at_{args.k}']:.3f}")
+
+    if args.min_ndcg is not None:
+        for name, metrics in results["configurations"].items():
+            if metrics[f"ndcg_at_{args.k}"] < args.min_ndcg:
+                print(f"❌ {name}: nDCG@{args.k} {metrics[f'ndcg_at_{args.k}']:.3f} is below {args.min_ndcg}")
+                failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Local fake of Groq's OpenAI-compatible chat completions endpoint.
+
+Serves POST /openai/v1/chat/completions with a fixed artificial latency so
+LLM code can be exercised and timed without network access or an API key.
+Point the Groq clients at it with GROQ_BASE_URL=http://127.0.0.1:<port>.
+
+Usage:
+    python benchmarks/fake_groq_server.py --port 8787 --latency 0.3
+
+Or in-process:
+    server, base_url = start_fake_groq_server(latency=0.3)
+    ...
+    server.shutdown()
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+DEFAULT_JSON_REPLY = {
+    "primary_interests": ["TECHNICAL", "CREATIVE"],
+    "secondary_interests": ["ANALYTICAL"],
+    "extracted_keywords": ["design", "programming"],
+    "personality_traits": ["curious", "creative"],
+    "values": ["making an impact"],
+    "confidence_level": "medium",
+    "missing_info": ["work environment preferences"]
+}
+
+
+def default_responder(request):
+    """Reply with JSON when the system prompt asks for it, otherwise plain text"""
+    system_prompt = request["messages"][0]["content"] if request.get("messages") else ""
+    if "JSON" in system_prompt:
+        return json.dumps(DEFAULT_JSON_REPLY)
+    return "This career is a great fit because it blends your creativity with problem solving."
+
+
+def make_handler(latency, responder, token_delay):
+    class FakeGroqHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            if self.path != COMPLETIONS_PATH:
+                self.send_error(404)
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            time.sleep(latency)
+            content = responder(request)
+            if request.get("stream"):
+                self._stream(request, content)
+            else:
+                self._complete(request, content)
+
+        def _complete(self, request, content):
+            body = json.dumps({
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self, request, content):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            tokens = content.split(" ")
+            for i, token in enumerate(tokens):
+                delta = token if i == 0 else " " + token
+                chunk = {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": request.get("model", "fake"),
+                    "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(token_delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+            self.close_connection = True
+
+    return FakeGroqHandler
+
+
+def start_fake_groq_server(host="127.0.0.1", port=0, latency=0.2, responder=default_responder,
+                           token_delay=0.01):
+    """Start the fake server in a daemon thread; returns (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), make_handler(latency, responder, token_delay))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Groq-compatible chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before each response")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Seconds between streamed tokens")
+    args = parser.parse_args()
+
+    server, base_url = start_fake_groq_server(args.host, args.port, args.latency,
+                                              token_delay=args.token_delay)
+    print(f"Fake Groq server listening on {base_url} (export GROQ_BASE_URL={base_url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
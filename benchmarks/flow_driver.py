@@ -0,0 +1,162 @@
+"""
+Headless driver for the conversation flow.
+
+Runs the backend work behind each stage of components/chat_interface.py
+(LLM profile extraction, fused career search, explanation lookup or
+streaming, related roles, clarifying questions) against a CareerCounselor,
+without Streamlit. The work itself lives in core/conversation_steps.py and
+is shared with the UI; this module only decides which stages run, in what
+order and with which answers. Session state is a plain dict shaped like
+st.session_state.user_data.
+"""
+
+import time
+
+from core import conversation_steps
+from core.explanation_store import USER_STAGES
+
+INTERESTS = tuple(conversation_steps.INTEREST_OPTIONS)
+FREEFORM_INTERESTS = (
+    "",
+    "I like solving puzzles and building small games",
+    "drawing, photography and making videos for friends",
+    "coaching my younger brother's football team",
+    "spreadsheets, statistics and figuring out patterns",
+    "volunteering at the animal shelter and helping people",
+    "fixing bikes and building things with my hands",
+    "writing stories and running a school newsletter"
+)
+
+# The straight path through the flow, from the welcome screen to the final pick
+FLOW_STAGES = (
+    "onboarding",
+    "context_check",
+    "interest_exploration",
+    "preference_validation",
+    "career_matching",
+    "detailed_path_exploration",
+    "final_recommendation"
+)
+
+
+def _clear_analysis(user_data, rng):
+    user_data.pop('llm_analysis', None)
+
+
+def _skip_questions(user_data, rng):
+    user_data['selected_interests'] = list(conversation_steps.SKIPPED_QUESTIONS_INTERESTS)
+
+
+def _restart(user_data, rng):
+    user_data.clear()
+    user_data.update(new_session(rng))
+
+
+# Buttons on each screen as (next stage, weight, effect on user_data); None ends the session.
+# "related_roles" stands for the "See related roles" button, which stays on the detail page.
+TRANSITIONS = {
+    "onboarding": [("context_check", 0.95, None), (None, 0.05, None)],
+    "context_check": [("interest_exploration", 1.0, None)],
+    "interest_exploration": [("preference_validation", 1.0, None)],
+    "preference_validation": [("career_matching", 0.75, None), ("fallback_engine", 0.15, None),
+                              ("interest_exploration", 0.10, _clear_analysis)],
+    "fallback_engine": [("preference_validation", 0.7, _clear_analysis), ("career_matching", 0.3, _skip_questions)],
+    "career_matching": [("detailed_path_exploration", 0.85, None), ("interest_exploration", 0.15, None)],
+    "detailed_path_exploration": [("final_recommendation", 0.6, None), ("related_roles", 0.2, None),
+                                  ("career_matching", 0.2, None)],
+    "related_roles": [("final_recommendation", 0.6, None), ("career_matching", 0.4, None)],
+    "final_recommendation": [("feedback", 0.7, None), ("onboarding", 0.1, _restart), (None, 0.2, None)],
+    "feedback": [(None, 1.0, None)]
+}
+
+
+def new_session(rng):
+    """Answers a user would give on the onboarding screens (picked with rng)"""
+    return {
+        "current_stage": rng.choice(USER_STAGES),
+        "selected_interests": rng.sample(INTERESTS, rng.randint(1, 3)),
+        "freeform_interests": rng.choice(FREEFORM_INTERESTS)
+    }
+
+
+class FlowDriver:
+    """
+    Runs flow stages for simulated sessions against one counselor.
+
+    run_stage(stage, user_data) does what the stage's display_* function
+    does on its first render and returns the seconds it took. pick is
+    called with the matched careers to choose the one the user opens
+    (default: the first).
+    """
+
+    def __init__(self, counselor, explanation_store=None, pick=None):
+        self.counselor = counselor
+        self.explanation_store = explanation_store
+        self.pick = pick or (lambda careers: careers[0])
+
+    def run_stage(self, stage, user_data):
+        handler = getattr(self, f"_{stage}")
+        started = time.perf_counter()
+        handler(user_data)
+        return time.perf_counter() - started
+
+    def run_session(self, user_data, stages=FLOW_STAGES):
+        """Run stages in order; returns [(stage, seconds), ...]"""
+        return [(stage, self.run_stage(stage, user_data)) for stage in stages]
+
+    def walk(self, user_data, rng, max_steps=40, think_time=0.0):
+        """
+        Random walk through TRANSITIONS from onboarding until the session
+        ends or max_steps stages have run; returns [(stage, seconds), ...].
+        think_time seconds are slept between stages (not included).
+        """
+        timings = []
+        stage = "onboarding"
+        while stage is not None and len(timings) < max_steps:
+            timings.append((stage, self.run_stage(stage, user_data)))
+            choices = TRANSITIONS[stage]
+            stage, _, effect = rng.choices(choices, weights=[weight for _, weight, _ in choices])[0]
+            if effect is not None:
+                effect(user_data, rng)
+            if think_time and stage is not None:
+                time.sleep(think_time)
+        return timings
+
+    def _static_stage(self, user_data):
+        """Screens that only collect answers (already in user_data) or show fixed text"""
+
+    _onboarding = _context_check = _interest_exploration = _final_recommendation = _feedback = _static_stage
+
+    # Stages that call the LLM or search
+
+    def _preference_validation(self, user_data):
+        if 'llm_analysis' not in user_data:
+            user_data['llm_analysis'] = conversation_steps.analyze_preferences(self.counselor, user_data)
+
+    def _career_matching(self, user_data):
+        careers = conversation_steps.match_careers(self.counselor, user_data, top_k=4)
+        user_data['matched_careers'] = careers
+        if careers:
+            user_data['selected_career'] = dict(self.pick(careers))
+
+    def _detailed_path_exploration(self, user_data):
+        career = user_data.get('selected_career')
+        if not career:
+            return
+        career_key = career.get('id', career.get('title'))
+        explanations = user_data.setdefault('career_explanations', {})
+        explanation = explanations.get(career_key)
+        if not explanation and self.explanation_store is not None:
+            explanation = conversation_steps.stored_explanation(self.explanation_store, user_data, career_key)
+        if not explanation:
+            explanation = "".join(conversation_steps.stream_explanation(self.counselor, user_data, career))
+        explanations[career_key] = explanation
+
+    def _related_roles(self, user_data):
+        """The "See related roles" button on the detail page"""
+        career = user_data.get('selected_career')
+        if career:
+            user_data['related_careers'] = conversation_steps.related_careers(self.counselor, career, top_k=3)
+
+    def _fallback_engine(self, user_data):
+        user_data['clarifying_questions'] = conversation_steps.clarifying_questions(self.counselor, user_data)
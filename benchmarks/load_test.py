@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Headless load generator for the conversation flow.
+
+Simulates --users concurrent users, one thread each (as Streamlit runs
+one script thread per session), sharing the process-wide CareerCounselor
+like the app does. Every user walks a randomized path through the flow
+(benchmarks/flow_driver.py: clarifications, refined searches, related
+roles, restarts) for --sessions-per-user sessions. The LLM is the local
+fake Groq server replaying benchmarks/fixtures/groq_responses.json
+through the real clients, with each fixture's latency scaled by
+--llm-latency-scale, so no network or API key is needed.
+
+Reports session and stage throughput, per-stage latency percentiles,
+RSS growth per session and the size of each session's state. Run
+`python setup.py` first so the collection exists. The LLM response cache
+goes to a temporary file, so ./llm_cache.sqlite3 is not touched.
+
+Usage:
+    python benchmarks/load_test.py --users 20 --sessions-per-user 3
+    python benchmarks/load_test.py --users 50 --llm-latency-scale 0 --output load.json
+"""
+
+import argparse
+import os
+import pickle
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flow_driver import FlowDriver, new_session
+from measure import current_rss_mb, latency_summary, peak_rss_mb, write_results
+from recorded_groq import FIXTURES_PATH, start_recorded_groq_server
+
+
+def plain(value):
+    """value with read-only result mappings (MappingProxyType) turned into dicts, so it pickles"""
+    if isinstance(value, Mapping):
+        return {key: plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [plain(item) for item in value]
+    return value
+
+
+def session_state_bytes(user_data):
+    """Pickled size of a session's state, as a proxy for what Streamlit keeps per session"""
+    return len(pickle.dumps(plain(user_data)))
+
+
+def run_user(user, counselor, args, start_barrier):
+    """Walk sessions_per_user random sessions; returns a list of per-session records"""
+    rng = random.Random(args.seed * 100003 + user)
+    driver = FlowDriver(counselor, pick=rng.choice)
+    records = []
+    start_barrier.wait()
+    for _ in range(args.sessions_per_user):
+        user_data = new_session(rng)
+        started = time.perf_counter()
+        error = None
+        try:
+            timings = driver.walk(user_data, rng, args.max_steps, args.think_time)
+        except Exception as e:
+            # A stage that raises would show Streamlit's error page; count it and move on
+            timings, error = [], f"{type(e).__name__}: {e}"
+        records.append({
+            "timings": timings,
+            "seconds": time.perf_counter() - started,
+            "state_bytes": session_state_bytes(user_data),
+            "error": error
+        })
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="Concurrent simulated users")
+    parser.add_argument("--sessions-per-user", type=int, default=3)
+    parser.add_argument("--max-steps", type=int, default=40, help="Stages per session before giving up")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds a user pauses between stages")
+    parser.add_argument("--llm-latency-scale", type=float, default=1.0,
+                        help="Multiply each fixture's latency_ms (0 = instant fake LLM)")
+    parser.add_argument("--fixtures", default=FIXTURES_PATH)
+    parser.add_argument("--no-llm-cache", action="store_true", help="Send every LLM call to the fake server")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="career-load-")
+    server, base_url, responder = start_recorded_groq_server(args.llm_latency_scale, args.fixtures)
+    os.environ.update({
+        "GROQ_BASE_URL": base_url,
+        "GROQ_API_KEY": "benchmark-placeholder-key",
+        "LLM_CACHE_PATH": os.path.join(workdir, "llm_cache.sqlite3"),
+        "TELEMETRY_ENABLED": "true",
+        "TOKENIZERS_PARALLELISM": "false"
+    })
+    if args.no_llm_cache:
+        os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.chdir(ROOT)
+
+    try:
+        from core import telemetry
+        from core.career_counselor import get_career_counselor
+
+        counselor = get_career_counselor()
+        # Load the model and indexes before the clock starts, as the boot warm-up does
+        counselor.search_fused(["warm up"], top_k=1)
+        rss_before = current_rss_mb()
+
+        start_barrier = threading.Barrier(args.users)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            futures = [pool.submit(run_user, user, counselor, args, start_barrier) for user in range(args.users)]
+            sessions = [record for future in futures for record in future.result()]
+        wall = time.perf_counter() - started
+        rss_after = current_rss_mb()
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    per_stage = {}
+    for session in sessions:
+        for stage, seconds in session["timings"]:
+            per_stage.setdefault(stage, []).append(seconds)
+    stage_count = sum(len(samples) for samples in per_stage.values())
+    errors = [session["error"] for session in sessions if session["error"]]
+
+    results = {
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "wall_seconds": round(wall, 3),
+        "sessions": len(sessions),
+        "sessions_per_second": round(len(sessions) / wall, 3),
+        "stages_per_second": round(stage_count / wall, 3),
+        "session_seconds": latency_summary([session["seconds"] for session in sessions]),
+        "stages_per_session": round(stage_count / len(sessions), 2),
+        "stages": {stage: latency_summary(samples) for stage, samples in sorted(per_stage.items())},
+        "memory": {
+            "rss_before_mb": rss_before,
+            "rss_after_mb": rss_after,
+            "peak_rss_mb": peak_rss_mb(),
+            "rss_growth_per_session_mb": round((rss_after - rss_before) / len(sessions), 3),
+            "mean_session_state_bytes": round(sum(session["state_bytes"] for session in sessions) / len(sessions))
+        },
+        "errors": errors,
+        "llm_fixtures_served": dict(responder.served),
+        "telemetry": telemetry.snapshot()
+    }
+
+    print(f"{args.users} users x {args.sessions_per_user} sessions, LLM latency x{args.llm_latency_scale}")
+    print(f"  {results['sessions_per_second']} sessions/s, {results['stages_per_second']} stages/s "
+          f"over {results['wall_seconds']}s ({results['stages_per_session']} stages per session)")
+    print(f"  session: p50 {results['session_seconds']['p50_ms']:.0f} ms  "
+          f"p95 {results['session_seconds']['p95_ms']:.0f} ms")
+    for stage, summary in results["stages"].items():
+        print(f"  {stage:<28} n={summary['count']:<5} p50 {summary['p50_ms']:>9.2f} ms  "
+              f"p95 {summary['p95_ms']:>9.2f} ms  p99 {summary['p99_ms']:>9.2f} ms")
+    memory = results["memory"]
+    print(f"  RSS {memory['rss_before_mb']} -> {memory['rss_after_mb']} MB (peak {memory['peak_rss_mb']} MB), "
+          f"{memory['rss_growth_per_session_mb']} MB and {memory['mean_session_state_bytes']} state bytes per session")
+    if errors:
+        print(f"  ⚠️ {len(errors)} sessions failed, e.g. {errors[0]}")
+
+    if args.output:
+        write_results(results, args.output)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Latency percentiles, RSS, catalog queries and result-file helpers shared by the benchmark suite."""
+
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def latency_summary(seconds):
+    """p50/p95/p99/mean/max in milliseconds for a list of durations in seconds"""
+    if not seconds:
+        return {"count": 0}
+    ms = [value * 1000 for value in seconds]
+    return {
+        "count": len(ms),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "mean_ms": round(statistics.mean(ms), 3),
+        "max_ms": round(max(ms), 3)
+    }
+
+
+def timed(function, *args, **kwargs):
+    """(result, seconds) for one call"""
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB (Linux /proc, falls back to peak)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def catalog_queries(careers, count, rng):
+    """Queries built from random catalog careers, as a user might phrase them"""
+    return [
+        f"{career['industry']} {rng.choice(career['skills'])} {rng.choice(career['personality_match'])}"
+        for career in rng.choices(careers, k=count)
+    ]
+
+
+def git_revision(root):
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_results(results, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def flatten(results, prefix=""):
+    """{"a": {"b": 1}} -> {"a.b": 1}, keeping numeric leaves only"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare_results(baseline, current, max_regression=None):
+    """
+    Print every latency (*_ms, *_seconds) and memory (*_mb) metric present
+    in both result files with its relative change. Returns the metrics that
+    grew by more than max_regression (a fraction, e.g. 0.2 for +20%).
+    """
+    before, after = flatten(baseline), flatten(current)
+    regressions = []
+    print(f"\nCompared with {baseline.get('meta', {}).get('git_revision', 'baseline')}:")
+    for name in sorted(set(before) & set(after)):
+        if not name.endswith(("_ms", "_seconds", "_mb")) or name.startswith("meta."):
+            continue
+        old, new = before[name], after[name]
+        change = (new - old) / old if old else 0.0
+        flag = ""
+        if max_regression is not None and change > max_regression:
+            regressions.append(name)
+            flag = "  ❌"
+        print(f"  {name:<60} {old:>12.3f} -> {new:>12.3f}  {change:+7.1%}{flag}")
+    return regressions
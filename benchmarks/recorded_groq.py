@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Replay canned Groq responses through the local fake Groq server.
+
+Each request is answered with the first fixture entry whose "match"
+strings all occur in the request's messages, after sleeping for the
+entry's latency_ms times a scale factor (0 = answer immediately). The
+real Groq/AsyncGroq clients and httpx stack are exercised end to end, but
+nothing leaves the machine.
+
+Usage:
+    server, base_url = start_recorded_groq_server(latency_scale=0.0)
+    os.environ["GROQ_BASE_URL"] = base_url
+    ...
+    server.shutdown()
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+from fake_groq_server import start_fake_groq_server
+
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "groq_responses.json")
+
+
+def load_recorded_responses(path=FIXTURES_PATH):
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)["responses"]
+
+
+class RecordedResponder:
+    """fake_groq_server responder that replays fixtures and counts which ones were served"""
+
+    def __init__(self, responses, latency_scale=0.0):
+        self.responses = responses
+        self.latency_scale = latency_scale
+        self.served = Counter()
+        self._lock = threading.Lock()
+
+    def match(self, request):
+        text = "\n".join(str(message.get("content", "")) for message in request.get("messages", []))
+        for response in self.responses:
+            if all(fragment in text for fragment in response["match"]):
+                return response
+        raise LookupError("No recorded response matches the request")
+
+    def __call__(self, request):
+        response = self.match(request)
+        with self._lock:
+            self.served[response["name"]] += 1
+        if self.latency_scale > 0:
+            time.sleep(response["latency_ms"] / 1000 * self.latency_scale)
+        return response["content"]
+
+
+def start_recorded_groq_server(latency_scale=0.0, path=FIXTURES_PATH, token_delay=0.0):
+    """Start the fake server replaying fixtures; returns (server, base_url, responder)"""
+    responder = RecordedResponder(load_recorded_responses(path), latency_scale)
+    server, base_url = start_fake_groq_server(latency=0.0, responder=responder, token_delay=token_delay)
+    return server, base_url, responder
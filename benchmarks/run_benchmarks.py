@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the retrieval and conversation pipeline.
+
+Runs with no network: Groq is replaced by the local fake server replaying
+benchmarks/fixtures/groq_responses.json through the real clients, and the
+embedding model must already be in the local Hugging Face cache (or an
+exported ONNX model, with EMBEDDING_BACKEND=onnx). Everything is written
+to a fresh temporary working directory (Chroma, sidecar indexes, LLM
+response cache), so runs never touch ./chroma_db and are reproducible.
+
+Measures, against the local career catalog:
+  - ingestion throughput (records/s, embedding model load excluded)
+  - query embedding latency, uncached and cached
+  - vector search p50/p95/p99 per search backend, plus BM25
+  - end-to-end time per flow stage, onboarding -> final_recommendation
+  - peak RSS after each phase
+
+Results (plus the telemetry counters and span summaries) are written as
+JSON, so two commits can be diffed with --compare.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sessions 50 --output results/head.json
+    python benchmarks/run_benchmarks.py --compare results/main.json --max-regression 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flow_driver import FLOW_STAGES, FlowDriver, new_session
+from measure import catalog_queries, compare_results, git_revision, latency_summary, peak_rss_mb, timed, write_results
+from recorded_groq import FIXTURES_PATH, start_recorded_groq_server
+
+
+def bench_ingestion(chroma_manager, careers, batch_size, chunk_size):
+    from core.embeddings import get_embedding_model
+    from core.ingestion import sync_careers
+
+    _, model_load = timed(get_embedding_model)
+    stats = sync_careers(chroma_manager, careers, batch_size=batch_size, chunk_size=chunk_size)
+    # A second pass over the unchanged catalog only compares content hashes
+    noop = sync_careers(chroma_manager, careers, batch_size=batch_size, chunk_size=chunk_size)
+    return {
+        "records": stats["processed"],
+        "model_load_seconds": round(model_load, 3),
+        "sync_seconds": round(stats["elapsed"], 3),
+        "records_per_second": round(stats["records_per_second"], 1),
+        "unchanged_sync_seconds": round(noop["elapsed"], 3)
+    }
+
+
+def bench_query_embedding(queries):
+    from core.embeddings import encode_query, query_embedding_cache
+
+    encode_query(queries[0])  # warm up
+    uncached, cached = [], []
+    for query in queries:
+        query_embedding_cache.clear()
+        uncached.append(timed(encode_query, query)[1])
+        cached.append(timed(encode_query, query)[1])
+    return {"uncached": latency_summary(uncached), "cached": latency_summary(cached)}
+
+
+def bench_search(chroma_manager, collection, queries, top_k):
+    from core.embeddings import encode_texts
+    from core.lexical_index import SharedLexicalIndex
+    from core.search_backends import SEARCH_BACKENDS
+
+    embeddings = encode_texts(queries)
+    results = {}
+    for name, backend_class in SEARCH_BACKENDS.items():
+        backend = backend_class(chroma_manager, collection)
+        backend.query_embeddings(embeddings[:1], top_k)  # load / warm up
+        results[name] = latency_summary([timed(backend.query_embeddings, [embedding], top_k)[1]
+                                         for embedding in embeddings])
+
+    lexical_index = SharedLexicalIndex(chroma_manager)
+    lexical_index.search(queries[0], top_k)  # load
+    results["bm25"] = latency_summary([timed(lexical_index.search, query, top_k * 2)[1] for query in queries])
+    return results
+
+
+def bench_flow(sessions, rng, use_explanation_store):
+    from core.career_counselor import CareerCounselor
+
+    counselor, construction = timed(CareerCounselor)
+    store = None
+    if use_explanation_store:
+        from core.explanation_store import get_explanation_store
+        store = get_explanation_store()
+    driver = FlowDriver(counselor, store)
+
+    per_stage = {stage: [] for stage in FLOW_STAGES}
+    totals = []
+    for _ in range(sessions):
+        timings = driver.run_session(new_session(rng))
+        for stage, seconds in timings:
+            per_stage[stage].append(seconds)
+        totals.append(sum(seconds for _, seconds in timings))
+    return {
+        "sessions": sessions,
+        "counselor_construction_seconds": round(construction, 3),
+        "stages": {stage: latency_summary(samples) for stage, samples in per_stage.items()},
+        "session_total": latency_summary(totals)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200, help="Queries for the embedding/search phases")
+    parser.add_argument("--sessions", type=int, default=20, help="Simulated sessions through the flow")
+    parser.add_argument("--top-k", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--llm-latency-scale", type=float, default=0.0,
+                        help="Multiply each fixture's latency_ms (0 = measure only local overhead)")
+    parser.add_argument("--fixtures", default=FIXTURES_PATH)
+    parser.add_argument("--skip-explanation-store", action="store_true",
+                        help="Always stream explanations instead of using data/career_explanations.jsonl")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<git revision>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--max-regression", type=float,
+                        help="With --compare, exit non-zero if a latency/memory metric grows by more than this fraction")
+    parser.add_argument("--keep-workdir", action="store_true")
+    args = parser.parse_args()
+
+    revision = git_revision(ROOT)
+    output = os.path.abspath(args.output or os.path.join(ROOT, "benchmarks", "results", f"{revision}.json"))
+    workdir = tempfile.mkdtemp(prefix="career-bench-")
+
+    server, base_url, responder = start_recorded_groq_server(args.llm_latency_scale, args.fixtures)
+    os.environ.update({
+        "GROQ_BASE_URL": base_url,
+        "GROQ_API_KEY": "benchmark-placeholder-key",
+        "LLM_CACHE_PATH": os.path.join(workdir, "llm_cache.sqlite3"),
+        "TELEMETRY_ENABLED": "true",
+        "TOKENIZERS_PARALLELISM": "false",
+        "HF_HUB_OFFLINE": "1",
+        "TRANSFORMERS_OFFLINE": "1"
+    })
+    # Chroma and its sidecar files live under ./chroma_db
+    os.chdir(workdir)
+
+    from core import telemetry
+    from core.chroma_manager import ChromaManager
+    from data.career_catalog import load_career_catalog
+
+    rng = random.Random(args.seed)
+    careers = load_career_catalog()
+    queries = catalog_queries(careers, args.queries, rng)
+    results = {
+        "meta": {
+            "git_revision": revision,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "embedding_model": os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+            "embedding_backend": os.getenv("EMBEDDING_BACKEND", "sentence-transformers"),
+            "catalog_size": len(careers),
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+        },
+        "peak_rss_mb": {"start": peak_rss_mb()}
+    }
+
+    try:
+        print(f"Catalog: {len(careers)} careers, workdir {workdir}")
+        chroma_manager = ChromaManager()
+        results["ingestion"] = bench_ingestion(chroma_manager, careers, args.batch_size, args.chunk_size)
+        results["peak_rss_mb"]["ingestion"] = peak_rss_mb()
+        print(f"  ingestion: {results['ingestion']['records_per_second']} records/s")
+
+        results["query_embedding"] = bench_query_embedding(queries)
+        results["peak_rss_mb"]["query_embedding"] = peak_rss_mb()
+        print(f"  query embedding (uncached): p50 {results['query_embedding']['uncached']['p50_ms']} ms")
+
+        results["search"] = bench_search(chroma_manager, chroma_manager.get_collection(), queries, args.top_k)
+        results["peak_rss_mb"]["search"] = peak_rss_mb()
+        for name, summary in results["search"].items():
+            print(f"  search {name}: p50 {summary['p50_ms']} ms  p95 {summary['p95_ms']} ms  p99 {summary['p99_ms']} ms")
+
+        results["flow"] = bench_flow(args.sessions, rng, not args.skip_explanation_store)
+        results["peak_rss_mb"]["flow"] = peak_rss_mb()
+        for stage, summary in results["flow"]["stages"].items():
+            print(f"  {stage}: p50 {summary['p50_ms']} ms  p95 {summary['p95_ms']} ms")
+
+        results["llm_fixtures_served"] = dict(responder.served)
+        results["telemetry"] = telemetry.snapshot()
+    finally:
+        server.shutdown()
+        os.chdir(ROOT)
+        if not args.keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    write_results(results, output)
+    print(f"\nPeak RSS: {results['peak_rss_mb']['flow']} MB. Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            regressions = compare_results(json.load(file), results, args.max_regression)
+        if regressions:
+            print(f"\n❌ {len(regressions)} metrics regressed by more than {args.max_regression:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,33 @@ import os
 # Add the parent directory to the path so we can import from core
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-try:
-    from core.career_counselor import CareerCounselor
-    VECTOR_DB_AVAILABLE = True
-except ImportError:
-    VECTOR_DB_AVAILABLE = False
+# core.career_counselor pulls in groq, chromadb and the LLM stack, which the
+# onboarding screens don't need, so it is only imported on first use
+from core.lazy_imports import is_available, lazy_import
+from core import conversation_steps, telemetry
+from core.explanation_store import USER_STAGES
+
+def vector_db_available():
+    """Whether the search/LLM stack can be imported (imports it on first call)"""
+    return is_available("core.career_counselor")
+
+def get_career_counselor():
+    """
+    Process-wide CareerCounselor, built by the server warm-up. If warm-up is
+    still running (a very early user), wait for it rather than loading the
+    model or syncing the catalog inside this request.
+
+    Returns None if warm-up did not finish in time or failed (it is retried
+    in the background), so callers fall back to sample careers.
+    """
+    warmup = lazy_import("core.warmup")
+    if not warmup.is_ready():
+        with st.spinner("🔧 Getting career search ready..."):
+            warmup.start_warmup()
+            ready = warmup.wait_until_ready(timeout=float(os.getenv("WARMUP_WAIT_TIMEOUT", "120")))
+        if not ready:
+            return None
+    return lazy_import("core.career_counselor").get_career_counselor()
 
 # Chat UI components
 
@@ -39,7 +61,7 @@ def display_context_check():
     # Progress Bar
     st.progress(1/9, text="1/9 Steps")
 
-    options = ["School Student", "College Student", "Working Professional", "Career Switcher"]
+    options = list(USER_STAGES)
     
     # Using st.columns to make buttons more visually appealing and spaced
     cols = st.columns(len(options))
@@ -62,13 +84,7 @@ def display_interest_exploration():
         st.session_state.user_data['selected_interests'] = []
     
     # Interest categories with checkboxes
-    interests = {
-        "🎨 Creative": "design, writing, art",
-        "📊 Analytical": "math, coding, puzzles", 
-        "🤝 Social": "teaching, counseling, teamwork",
-        "🏃 Physical": "sports, crafting, hands-on",
-        "💻 Tech": "robotics, gaming, gadgets"
-    }
+    interests = conversation_steps.INTEREST_OPTIONS
     
     # Display checkboxes in columns for better layout
     cols = st.columns(3)
@@ -99,52 +115,25 @@ def display_preference_validation():
     st.markdown("### 🧠 Preference Extraction & Validation")
     st.progress(3/9, text="3/9 Steps")
     
-    # Get conversation history for LLM analysis
-    selected_interests = st.session_state.user_data.get('selected_interests', [])
-    freeform = st.session_state.user_data.get('freeform_interests', '')
-    current_stage = st.session_state.user_data.get('current_stage', 'Student')
-    
-    # Create conversation history for LLM analysis
-    conversation_history = f"""
-    User Stage: {current_stage}
-    Selected Interest Categories: {', '.join(selected_interests)}
-    Additional Details: {freeform}
-    """
+    user_data = st.session_state.user_data
     
     # Use LLM to extract and analyze preferences
-    if 'llm_analysis' not in st.session_state.user_data:
-        if VECTOR_DB_AVAILABLE:
+    if 'llm_analysis' not in user_data:
+        if vector_db_available():
             try:
-                counselor = st.session_state.get('career_counselor')
+                counselor = get_career_counselor()
                 if counselor and counselor.llm_manager:
                     with st.spinner("🤔 Analyzing your preferences..."):
-                        # Extract preferences using LLM
-                        llm_analysis = counselor.llm_manager.extract_preferences(
-                            conversation_history, 
-                            analysis_type="interests"
-                        )
-                        st.session_state.user_data['llm_analysis'] = llm_analysis
+                        user_data['llm_analysis'] = conversation_steps.analyze_preferences(counselor, user_data)
                 else:
                     # Fallback to basic analysis
-                    st.session_state.user_data['llm_analysis'] = {
-                        "primary_interests": selected_interests,
-                        "extracted_keywords": freeform.split() if freeform else [],
-                        "confidence_level": "medium"
-                    }
+                    user_data['llm_analysis'] = conversation_steps.basic_profile(user_data)
             except Exception as e:
                 st.warning(f"Advanced analysis unavailable: {e}")
-                st.session_state.user_data['llm_analysis'] = {
-                    "primary_interests": selected_interests,
-                    "extracted_keywords": freeform.split() if freeform else [],
-                    "confidence_level": "medium"
-                }
+                user_data['llm_analysis'] = conversation_steps.basic_profile(user_data)
         else:
             # Basic fallback
-            st.session_state.user_data['llm_analysis'] = {
-                "primary_interests": selected_interests,
-                "extracted_keywords": freeform.split() if freeform else [],
-                "confidence_level": "medium"
-            }
+            user_data['llm_analysis'] = conversation_steps.basic_profile(user_data)
     
     llm_analysis = st.session_state.user_data.get('llm_analysis', {})
     
@@ -172,6 +161,25 @@ def display_preference_validation():
         traits_text = ", ".join(traits)
         st.markdown(f"*{traits_text}*")
     
+    # Skills (if extracted)
+    identified_skills = llm_analysis.get('identified_skills', {})
+    if isinstance(identified_skills, dict):
+        skill_names = [
+            item.get('skill') if isinstance(item, dict) else str(item)
+            for items in identified_skills.values() if isinstance(items, list)
+            for item in items
+        ]
+        if skill_names:
+            st.markdown("**🛠️ Skills I Noticed:**")
+            st.markdown(f"*{', '.join(name for name in skill_names if name)}*")
+    
+    # Core values (if extracted)
+    core_values = llm_analysis.get('core_values', [])
+    if isinstance(core_values, list) and core_values:
+        value_names = [item.get('value') if isinstance(item, dict) else str(item) for item in core_values]
+        st.markdown("**💎 What Matters to You:**")
+        st.markdown(f"*{', '.join(str(name).title() for name in value_names if name)}*")
+    
     # Confidence level indicator
     confidence = llm_analysis.get('confidence_level', 'medium')
     confidence_emoji = {"high": "🎯", "medium": "✅", "low": "❓"}
@@ -212,33 +220,18 @@ def display_career_matching():
     st.markdown("Here are career paths that fit your interests and skills. Tap any to learn more!")
     st.progress(4/9, text="4/9 Steps")
     
-    # Get user preferences for intelligent matching
-    selected_interests = st.session_state.user_data.get('selected_interests', [])
-    freeform_interests = st.session_state.user_data.get('freeform_interests', '')
-    llm_analysis = st.session_state.user_data.get('llm_analysis', {})
-    current_stage = st.session_state.user_data.get('current_stage', 'Student')
-    
-    # Create search query from LLM analysis or fallback to basic interests
-    if llm_analysis:
-        # Use intelligent preferences from LLM analysis
-        primary_interests = llm_analysis.get('primary_interests', selected_interests)
-        keywords = llm_analysis.get('extracted_keywords', [])
-        search_query = " ".join(primary_interests + keywords).strip()
-    else:
-        # Fallback to basic search
-        search_query = " ".join(selected_interests) + " " + freeform_interests
-        search_query = search_query.strip()
+    # One search query per interest, from LLM analysis or the basic interests
+    user_data = st.session_state.user_data
+    search_queries = conversation_steps.career_search_queries(user_data)
     
     careers = []
     
-    if VECTOR_DB_AVAILABLE and search_query:
+    if vector_db_available() and search_queries:
         try:
-            # Initialize career counselor and search for relevant careers
-            if 'career_counselor' not in st.session_state:
-                st.session_state.career_counselor = CareerCounselor()
-            
-            counselor = st.session_state.career_counselor
-            vector_results = counselor.search_career_data(search_query, top_k=4)
+            counselor = get_career_counselor()
+            if counselor is None:
+                raise RuntimeError("career search is not ready")
+            vector_results = conversation_steps.match_careers(counselor, user_data, top_k=4)
             
             # Convert vector results to career format
             for career_data in vector_results:
@@ -298,6 +291,7 @@ def display_career_matching():
 
 def get_fallback_careers():
     """Fallback careers when vector database is not available"""
+    telemetry.increment("fallbacks_total", call="career_matching")
     return [
         {
             "id": "graphic_designer",
@@ -341,19 +335,41 @@ def display_detailed_path_exploration():
         st.markdown(f"## {title}")
         st.markdown(selected_career.get('description', 'No description available.'))
         
-        # Show personalized LLM explanation if available
-        llm_explanation = selected_career.get('llm_explanation')
+        # Show personalized LLM explanation, streaming it in the first time
+        explanations = st.session_state.user_data.setdefault('career_explanations', {})
+        career_key = selected_career.get('id', title)
+        llm_explanation = selected_career.get('llm_explanation') or explanations.get(career_key)
+        if not llm_explanation:
+            # Pre-generated offline by data/build_explanations.py, so detail pages open instantly
+            try:
+                from core.explanation_store import get_explanation_store
+                llm_explanation = conversation_steps.stored_explanation(
+                    get_explanation_store(), st.session_state.user_data, career_key
+                )
+            except Exception:
+                llm_explanation = None
         if llm_explanation:
             st.markdown("### 🎯 Why This Career Matches You")
             st.info(llm_explanation)
             st.markdown("---")
+        elif vector_db_available():
+            try:
+                counselor = get_career_counselor()
+                if counselor and counselor.llm_manager:
+                    st.markdown("### 🎯 Why This Career Matches You")
+                    explanations[career_key] = st.write_stream(
+                        conversation_steps.stream_explanation(counselor, st.session_state.user_data, selected_career)
+                    )
+                    st.markdown("---")
+            except Exception:
+                pass
         
         # Skills section
         skills = selected_career.get('skills', [])
         if skills:
             st.markdown("### 🛠️ Key Skills:")
-            # Handle both list format and string format from ChromaDB
-            if isinstance(skills, list):
+            # Lists (restored from the typed metadata) or legacy comma-joined strings
+            if isinstance(skills, (list, tuple)):
                 skills_text = ", ".join(skills)
             else:
                 skills_text = str(skills)  # Already a comma-separated string
@@ -363,8 +379,8 @@ def display_detailed_path_exploration():
         education = selected_career.get('education', [])
         if education:
             st.markdown("### 🎓 Typical Education:")
-            # Handle both list format and string format from ChromaDB
-            if isinstance(education, list):
+            # Lists (restored from the typed metadata) or legacy comma-joined strings
+            if isinstance(education, (list, tuple)):
                 education_text = ", ".join(education)
             else:
                 education_text = str(education)  # Already a comma-separated string
@@ -384,8 +400,8 @@ def display_detailed_path_exploration():
         companies = selected_career.get('companies', [])
         if companies:
             st.markdown("### 🏢 Where You Could Work:")
-            # Handle both list format and string format from ChromaDB
-            if isinstance(companies, list):
+            # Lists (restored from the typed metadata) or legacy comma-joined strings
+            if isinstance(companies, (list, tuple)):
                 companies_text = ", ".join(companies[:5])  # Show first 5 companies
             else:
                 # Already a string, just limit length if too long
@@ -398,8 +414,8 @@ def display_detailed_path_exploration():
         career_paths = selected_career.get('career_paths', [])
         if career_paths:
             st.markdown("### 🚀 Career Progression:")
-            # Handle both list format and string format from ChromaDB
-            if isinstance(career_paths, list):
+            # Lists (restored from the typed metadata) or legacy comma-joined strings
+            if isinstance(career_paths, (list, tuple)):
                 paths_list = career_paths
             else:
                 paths_list = str(career_paths).split(', ')
@@ -411,8 +427,8 @@ def display_detailed_path_exploration():
         personality_match = selected_career.get('personality_match', [])
         if personality_match:
             st.markdown("### 🎯 Perfect for people who are:")
-            # Handle both list format and string format from ChromaDB
-            if isinstance(personality_match, list):
+            # Lists (restored from the typed metadata) or legacy comma-joined strings
+            if isinstance(personality_match, (list, tuple)):
                 personality_text = ", ".join(personality_match)
             else:
                 personality_text = str(personality_match)  # Already a comma-separated string
@@ -431,16 +447,19 @@ def display_detailed_path_exploration():
         with col2:
             if st.button("🔗 See related roles", key="related_roles", use_container_width=True):
                 # Show related careers based on industry or skills
-                if VECTOR_DB_AVAILABLE:
+                if vector_db_available():
                     try:
-                        counselor = st.session_state.get('career_counselor')
+                        counselor = get_career_counselor()
                         if counselor:
-                            industry = selected_career.get('industry', '')
-                            related_results = counselor.search_career_data(industry, top_k=3)
+                            # Precomputed at ingestion from skills, personality and industry
+                            related_results = conversation_steps.related_careers(counselor, selected_career, top_k=3)
                             st.markdown("### 🔗 Related Careers:")
                             for career in related_results:
-                                if career.get('id') != selected_career.get('id'):
-                                    st.markdown(f"- **{career.get('title', 'Unknown')}**: {career.get('tagline', 'No description')}")
+                                st.markdown(f"- **{career.get('emoji', '')} {career.get('title', 'Unknown')}**: {career.get('tagline', 'No description')}")
+                            if not related_results:
+                                st.info("No related roles yet. Run `python setup.py` to build them.")
+                        else:
+                            st.info("Related roles are still loading. Please try again in a moment.")
                     except:
                         st.info("Related roles feature coming soon!")
                 else:
@@ -461,29 +480,18 @@ def display_fallback_engine():
     
     st.markdown("I'd like to understand your preferences better! Let me ask a few targeted questions.")
     
-    # Get previous conversation context
-    selected_interests = st.session_state.user_data.get('selected_interests', [])
-    freeform = st.session_state.user_data.get('freeform_interests', '')
-    llm_analysis = st.session_state.user_data.get('llm_analysis', {})
-    
-    # Generate clarifying questions using LLM if available
+    # Generate clarifying questions using LLM if available, asking about
+    # what the previous analysis said was missing
     clarifying_questions = []
     
-    if VECTOR_DB_AVAILABLE:
+    if vector_db_available():
         try:
-            counselor = st.session_state.get('career_counselor')
+            counselor = get_career_counselor()
             if counselor and counselor.llm_manager:
-                # Get missing information from LLM analysis
-                missing_info = llm_analysis.get('missing_info', ['interests', 'skills', 'values'])
-                user_context = f"Selected: {', '.join(selected_interests)}, Additional: {freeform}"
-                
                 with st.spinner("🤔 Generating personalized questions..."):
-                    question_response = counselor.llm_manager.generate_clarifying_questions(
-                        user_context, missing_info, "interest_exploration"
+                    clarifying_questions = conversation_steps.clarifying_questions(
+                        counselor, st.session_state.user_data
                     )
-                    
-                    if 'error' not in question_response:
-                        clarifying_questions = question_response.get('clarifying_questions', [])
         except Exception as e:
             st.warning(f"Smart question generation unavailable: {e}")
     
@@ -534,7 +542,7 @@ def display_fallback_engine():
     st.markdown("---")
     if st.button("💫 Skip questions - show me anything interesting!", key="skip_clarification", use_container_width=True):
         # Set some default interests and proceed
-        st.session_state.user_data['selected_interests'] = ["🎨 Creative", "💻 Tech"]
+        st.session_state.user_data['selected_interests'] = list(conversation_steps.SKIPPED_QUESTIONS_INTERESTS)
         st.session_state.conversation_flow = 'career_matching'
         st.rerun()
 
@@ -659,10 +667,44 @@ def display_feedback():
         st.session_state.conversation_flow = 'onboarding'
         st.rerun()
 
+def display_debug_panel():
+    """Sidebar view of this session's recent spans and the process-wide counters"""
+    with st.sidebar.expander("🔬 Telemetry", expanded=False):
+        trace = list(st.session_state.get('trace', ()))
+        if trace:
+            st.caption("This session (most recent first)")
+            st.dataframe([
+                {"span": entry["span"], "ms": round(entry["ms"], 1), "error": entry["error"] or "",
+                 "labels": ", ".join(f"{key}={value}" for key, value in entry["labels"].items())}
+                for entry in reversed(trace[-50:])
+            ], use_container_width=True)
+        metrics = telemetry.snapshot()
+        if metrics["spans"]:
+            st.caption("All sessions: span count and mean latency")
+            st.dataframe([{"span": labels, "count": summary["count"], "mean ms": round(summary["mean_ms"], 1)}
+                          for labels, summary in sorted(metrics["spans"].items())],
+                         use_container_width=True)
+        if metrics["histograms"]:
+            st.caption("All sessions: other latencies (e.g. time to first streamed token)")
+            st.dataframe([{"metric": name, "count": summary["count"], "mean ms": round(summary["mean_ms"], 1)}
+                          for name, summary in sorted(metrics["histograms"].items())],
+                         use_container_width=True)
+        if metrics["counters"]:
+            st.caption("All sessions: counters")
+            st.json(metrics["counters"], expanded=False)
+
 # This function will be called from app.py to render the correct UI
 def render_chat_interface():
     flow_stage = st.session_state.get('conversation_flow', 'onboarding')
 
+    if telemetry.ENABLED:
+        # Rendered before the stage so it shows the spans of the previous run
+        display_debug_panel()
+    with telemetry.session_trace(st.session_state.setdefault('trace', telemetry.new_trace_buffer())), \
+            telemetry.span("ui.stage", stage=flow_stage):
+        render_flow_stage(flow_stage)
+
+def render_flow_stage(flow_stage):
     if flow_stage == 'onboarding':
         display_welcome_message()
     elif flow_stage == 'context_check':
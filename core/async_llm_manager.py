@@ -0,0 +1,253 @@
+# Asyncio counterpart of LLMManager built on AsyncGroq with a pooled HTTP client
+import asyncio
+import os
+import threading
+from typing import Any, Dict, List
+
+import httpx
+from groq import AsyncGroq
+
+from .llm_cache import LLMResponseCache
+from .llm_manager import PROFILE_ANALYSES, SINGLE_FLIGHT, BaseLLMManager
+from .single_flight import AsyncSingleFlight
+from .telemetry import increment, span
+
+class BackgroundEventLoop:
+    """
+    Event loop running forever in a daemon thread.
+
+    The pooled HTTP client and the per-model semaphores belong to one event
+    loop, so blocking callers (Streamlit script threads) submit coroutines
+    here instead of starting a fresh loop with asyncio.run on every call.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="llm-event-loop", daemon=True)
+        self.thread.start()
+
+    def run(self, coro, timeout: float = None):
+        """Run a coroutine on the background loop and block for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+class AsyncLLMManager(BaseLLMManager):
+    """
+    Non-blocking LLMManager: same prompts, models and fallbacks, but every
+    call is a coroutine so independent requests can overlap.
+
+    All requests share one pooled httpx.AsyncClient, and at most
+    max_concurrency requests per model are in flight at once. The client
+    honours GROQ_BASE_URL, so it can be pointed at a local Groq-compatible
+    server (see benchmarks/fake_groq_server.py).
+    """
+
+    def __init__(self, max_concurrency: int = None, max_connections: int = None,
+                 timeout: float = None, base_url: str = None):
+        super().__init__()
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+        self.profile_timeout = float(os.getenv("PROFILE_EXTRACTION_TIMEOUT", "20"))
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections or int(os.getenv("LLM_MAX_CONNECTIONS", "20")),
+                max_keepalive_connections=max_connections or int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+            ),
+            timeout=timeout or float(os.getenv("LLM_TIMEOUT", "60"))
+        )
+        self.groq_client = AsyncGroq(
+            api_key=os.getenv("GROQ_API_KEY"),
+            base_url=base_url or os.getenv("GROQ_BASE_URL") or None,
+            http_client=self.http_client
+        )
+        self._semaphores = {}
+        self._inflight_requests = AsyncSingleFlight()
+        self._background_loop = None
+        self._loop_lock = threading.Lock()
+
+    def _limit(self, model: str) -> asyncio.Semaphore:
+        """Semaphore capping in-flight requests for one model"""
+        semaphore = self._semaphores.get(model)
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault(model, asyncio.Semaphore(self.max_concurrency))
+        return semaphore
+
+    async def complete(self, request: Dict[str, Any], call: str = "complete") -> str:
+        """Send one chat completion request within its model's concurrency limit"""
+        async with self._limit(request["model"]):
+            with span("llm.request", call=call, model=request["model"]):
+                response = await self.groq_client.chat.completions.create(**request)
+        return response.choices[0].message.content
+
+    async def complete_json(self, request: Dict[str, Any], call: str = "complete_json") -> Dict[str, Any]:
+        """Complete a structured request, serving identical requests from the persistent cache"""
+        if self.response_cache:
+            cached = await asyncio.to_thread(self.response_cache.get, request)
+            increment("cache_requests_total", cache="llm_response", result="miss" if cached is None else "hit")
+            if cached is not None:
+                return self.parse_json_response(cached)
+
+        if not SINGLE_FLIGHT:
+            return self.parse_json_response(await self._request_json_content(request, call))
+        # Concurrent tasks with the same cache key await one request (and its error)
+        content, shared = await self._inflight_requests.do(LLMResponseCache.make_key(request),
+                                                           self._request_json_content, request, call)
+        if shared:
+            increment("llm_requests_deduplicated_total", call=call)
+        # Parsed per caller, so no two sessions share a mutable result
+        return self.parse_json_response(content)
+
+    async def _request_json_content(self, request: Dict[str, Any], call: str) -> str:
+        """Send a structured request and cache the reply text if it is valid JSON"""
+        content = await self.complete(request, call)
+        # Only valid JSON is worth replaying
+        if self.response_cache and "parsing_error" not in self.parse_json_response(content):
+            await asyncio.to_thread(self.response_cache.set, request, content)
+        return content
+
+    async def extract_preferences(self, conversation_history: str, analysis_type: str = "interests") -> Dict[str, Any]:
+        """Async LLMManager.extract_preferences"""
+        request = self._preferences_request(conversation_history, analysis_type)
+        if request is None:
+            return {"error": f"Could not load {analysis_type} extraction prompt"}
+
+        try:
+            return await self.complete_json(request, "extract_preferences")
+        except Exception as e:
+            increment("errors_total", operation="extract_preferences")
+            return {"error": f"LLM request failed: {str(e)}"}
+
+    async def extract_full_profile(self, conversation_history: str, timeout: float = None) -> Dict[str, Any]:
+        """
+        Run the interests, skills and values extractions concurrently and merge them.
+
+        Returns after the slowest leg or after timeout seconds, whichever
+        comes first; unfinished legs are cancelled and reported in
+        "failed_analyses" alongside any that errored.
+        """
+        timeout = timeout or self.profile_timeout
+        tasks = {
+            analysis: asyncio.ensure_future(self.extract_preferences(conversation_history, analysis))
+            for analysis in PROFILE_ANALYSES
+        }
+        done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+        for task in pending:
+            task.cancel()
+
+        results, errors = {}, {}
+        for analysis, task in tasks.items():
+            if task in pending:
+                errors[analysis] = f"Timed out after {timeout:g}s"
+            elif task.exception() is not None:
+                errors[analysis] = f"LLM request failed: {task.exception()}"
+            else:
+                results[analysis] = task.result()
+        profile = self.merge_profile(results, errors)
+        if profile["partial"]:
+            increment("fallbacks_total", call="extract_full_profile")
+        return profile
+
+    async def map_to_career_categories(self, user_preferences: Dict[str, Any], category: str = "general") -> Dict[str, Any]:
+        """Async LLMManager.map_to_career_categories"""
+        request = self._career_mapping_request(user_preferences, category)
+        if request is None:
+            return {"error": f"Could not load {category} career mapping prompt"}
+
+        try:
+            return await self.complete_json(request, "map_to_career_categories")
+        except Exception as e:
+            increment("errors_total", operation="map_to_career_categories")
+            return {"error": f"Career mapping failed: {str(e)}"}
+
+    async def generate_career_explanation(self, career_name: str, user_profile: Dict[str, Any],
+                                          match_score: float, user_stage: str = "Student",
+                                          raise_errors: bool = False) -> str:
+        """
+        Async LLMManager.generate_career_explanation.
+
+        With raise_errors the canned fallback text is never returned: a
+        missing prompt or failed request raises instead (used by batch jobs
+        that must not store fallbacks).
+        """
+        request = self._explanation_request(career_name, user_profile, match_score, user_stage)
+        if request is None:
+            if raise_errors:
+                raise FileNotFoundError("Career explanation prompt template is missing")
+            increment("fallbacks_total", call="generate_career_explanation")
+            return f"This career matches your interests and skills based on our analysis."
+
+        try:
+            return await self.complete(request, "generate_career_explanation")
+        except Exception as e:
+            if raise_errors:
+                raise
+            increment("fallbacks_total", call="generate_career_explanation")
+            return f"I believe {career_name} would be a great fit for you based on your interests and skills!"
+
+    async def generate_clarifying_questions(self, user_response: str, missing_info: List[str],
+                                            conversation_stage: str = "interest_exploration") -> Dict[str, Any]:
+        """Async LLMManager.generate_clarifying_questions"""
+        request = self._clarifying_questions_request(user_response, missing_info, conversation_stage)
+        if request is None:
+            increment("fallbacks_total", call="generate_clarifying_questions")
+            return self._default_clarifying_questions()
+
+        try:
+            return self._parse_clarifying_questions(await self.complete(request, "generate_clarifying_questions"))
+        except Exception as e:
+            increment("fallbacks_total", call="generate_clarifying_questions")
+            return self._failed_clarifying_questions(e)
+
+    async def chat_response(self, user_input: str, conversation_context: str = "",
+                            system_prompt: str = "") -> str:
+        """Async LLMManager.chat_response"""
+        try:
+            return await self.complete(self._chat_request(user_input, conversation_context, system_prompt),
+                                       "chat_response")
+        except Exception as e:
+            increment("fallbacks_total", call="chat_response")
+            return "I'm here to help you explore career options! Could you tell me a bit about your interests?"
+
+    async def gather(self, **calls) -> Dict[str, Any]:
+        """
+        Await independent LLM coroutines concurrently and return {name: result}.
+
+        A call that raises has its exception returned in place of a result
+        rather than cancelling the others.
+
+            results = await manager.gather(
+                interests=manager.extract_preferences(history, "interests"),
+                questions=manager.generate_clarifying_questions(history, ["skills"]),
+            )
+        """
+        names = list(calls)
+        results = await asyncio.gather(*calls.values(), return_exceptions=True)
+        return dict(zip(names, results))
+
+    def run_sync(self, coro, timeout: float = None):
+        """
+        Run a coroutine from blocking code (e.g. a Streamlit script thread).
+
+        It executes on this manager's background event loop, so the pooled
+        client and concurrency limits are shared by every caller.
+        """
+        if self._background_loop is None:
+            with self._loop_lock:
+                if self._background_loop is None:
+                    self._background_loop = BackgroundEventLoop()
+        return self._background_loop.run(coro, timeout)
+
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        await self.http_client.aclose()
+
+# Process-wide async manager so the connection pool is shared by all sessions
+_shared_async_manager = None
+_shared_async_manager_lock = threading.Lock()
+
+def get_async_llm_manager() -> AsyncLLMManager:
+    """Return the process-wide AsyncLLMManager, creating it on first use"""
+    global _shared_async_manager
+    if _shared_async_manager is None:
+        with _shared_async_manager_lock:
+            if _shared_async_manager is None:
+                _shared_async_manager = AsyncLLMManager()
+    return _shared_async_manager
@@ -1,16 +1,32 @@
 from groq import Groq
 import streamlit as st
 import os
+import threading
 # This will be a relative import if ChromaManager is in the same directory (core)
 from .chroma_manager import ChromaManager 
 from .llm_manager import LLMManager
+from .career_metadata import CategoryCodes, category_codes_path, compile_filters, matches_nothing
+from .embeddings import get_embedding_model
+from .ingestion import sync_careers
+from .lexical_index import SharedLexicalIndex
+from .related_careers import RelatedCareers
+from .telemetry import increment, span
+from .search_backends import cached_search, cached_search_many, create_search_backend, reciprocal_rank_fusion
 
 class CareerCounselor:
     def __init__(self):
         self.groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
         self.chroma_manager = ChromaManager()
         self.collection = self.chroma_manager.get_or_create_collection()
+        # "chroma" (default) or "numpy", chosen by the SEARCH_BACKEND env var
+        self.search_backend = create_search_backend(self.chroma_manager, self.collection)
+        self.related_careers = RelatedCareers(self.chroma_manager)
+        # BM25 over skills/education/companies/personality, fused with vector results
+        self.lexical_index = SharedLexicalIndex(self.chroma_manager)
+        # Industry/job outlook codes used to push filters down into the search
+        self.category_codes = CategoryCodes(category_codes_path(self.chroma_manager))
         self._embedding_model = None
+        self._embedding_lock = threading.Lock()
         
         # Initialize the new LLM manager for advanced prompts
         try:
@@ -19,13 +35,10 @@ class CareerCounselor:
             st.warning(f"LLM Manager initialization failed: {e}")
             self.llm_manager = None
         
-    @st.cache_resource
-    def get_embedding_model(_self):
-        """Lazy load the embedding model with Streamlit caching to avoid PyTorch conflicts"""
+    def get_embedding_model(self):
+        """Lazy load the process-wide embedding model shared with ingestion"""
         try:
-            from sentence_transformers import SentenceTransformer
-            model_name = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
-            return SentenceTransformer(model_name)
+            return get_embedding_model()
         except Exception as e:
             st.error(f"Error loading embedding model: {e}")
             return None
@@ -34,29 +47,90 @@ class CareerCounselor:
     def embedding_model(self):
         """Property to get the embedding model with lazy loading"""
         if self._embedding_model is None:
-            self._embedding_model = self.get_embedding_model()
+            with self._embedding_lock:
+                if self._embedding_model is None:
+                    self._embedding_model = self.get_embedding_model()
         return self._embedding_model
         
-    def search_career_data(self, query, top_k=5):
-        """Search relevant career information from Chroma"""
+    def search_career_data(self, query, top_k=5, filters=None):
+        """
+        Search relevant career information through the configured search backend.
+
+        filters restricts results on typed metadata inside the search, e.g.
+        {"industry": {"Technology", "Design"}, "salary_min": {"$gte": 60000}}
+        (see core/career_metadata.compile_filters).
+        """
         try:
             if self.embedding_model is None:
                 st.error("Embedding model not available")
                 return []
-                
-            query_embedding = self.embedding_model.encode([query]).tolist()[0]
-            
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=top_k,
-                include=['metadatas', 'documents', 'distances']
-            )
-            
-            return results['metadatas'][0] if results['metadatas'] else []
+
+            with span("search.career_data", backend=self.search_backend.name):
+                where = compile_filters(filters, self.category_codes)
+                if matches_nothing(where):
+                    return []
+                # Query embeddings and results are cached across sessions
+                vector_results = cached_search(self.search_backend, query, top_k * 2, where)
+                return self._hybrid_results(query, vector_results, top_k, where)
         except Exception as e:
+            increment("errors_total", operation="search_career_data")
             st.error(f"Error searching career data: {e}")
             return []
     
+    def _hybrid_results(self, query, vector_results, top_k, where=None):
+        """
+        Fuse vector results with BM25 matches on exact terms (e.g. "Figma",
+        "SQL"). Queries with no indexed term keep the vector ranking.
+        """
+        try:
+            with span("search.lexical"):
+                lexical_results = self.lexical_index.search(query, top_k * 2, where)
+        except Exception as e:
+            increment("errors_total", operation="lexical_search")
+            print(f"Lexical search failed: {e}")
+            lexical_results = []
+        if not lexical_results:
+            return vector_results[:top_k]
+        return reciprocal_rank_fusion([vector_results, lexical_results], top_k)
+
+    def search_many(self, queries, top_k=5, filters=None):
+        """Top-k careers for each query, embedded and searched as one batch"""
+        if not queries:
+            return []
+        try:
+            if self.embedding_model is None:
+                st.error("Embedding model not available")
+                return [[] for _ in queries]
+
+            with span("search.many", backend=self.search_backend.name):
+                where = compile_filters(filters, self.category_codes)
+                if matches_nothing(where):
+                    return [[] for _ in queries]
+                result_lists = cached_search_many(self.search_backend, queries, top_k * 2, where)
+                return [self._hybrid_results(query, vector_results, top_k, where)
+                        for query, vector_results in zip(queries, result_lists)]
+        except Exception as e:
+            increment("errors_total", operation="search_many")
+            st.error(f"Error searching career data: {e}")
+            return [[] for _ in queries]
+
+    def search_fused(self, queries, top_k=5, per_query_k=None, filters=None):
+        """
+        Search each query separately and merge with reciprocal-rank fusion,
+        so distinct interests are not blurred into one embedding.
+        """
+        result_lists = self.search_many(queries, per_query_k or top_k * 2, filters)
+        return reciprocal_rank_fusion(result_lists, top_k)
+    
+    def get_related_careers(self, career_id, top_k=3):
+        """Precomputed nearest careers for career_id; no model call or search"""
+        try:
+            return self.related_careers.lookup(career_id, top_k)
+        except Exception as e:
+            increment("errors_total", operation="get_related_careers")
+            st.error(f"Error loading related careers: {e}")
+            return []
+    
     def generate_contextual_response(self, user_input, conversation_context, flow_stage):
         """Generate response using Groq with Chroma context"""
         try:
@@ -80,60 +154,59 @@ class CareerCounselor:
             - Be encouraging and supportive
             """
             
-            response = self.groq_client.chat.completions.create(
-                model="mixtral-8x7b-32768",
-                messages=[
-                    {"role": "system", "content": context},
-                    {"role": "user", "content": user_input}
-                ],
-                temperature=0.7,
-                max_tokens=1000
-            )
+            with span("llm.request", call="contextual_response", model="mixtral-8x7b-32768"):
+                response = self.groq_client.chat.completions.create(
+                    model="mixtral-8x7b-32768",
+                    messages=[
+                        {"role": "system", "content": context},
+                        {"role": "user", "content": user_input}
+                    ],
+                    temperature=0.7,
+                    max_tokens=1000
+                )
             
             return response.choices[0].message.content
         except Exception as e:
+            increment("errors_total", operation="generate_contextual_response")
             st.error(f"Error generating response: {e}")
             return "I'm sorry, I'm having trouble generating a response right now."
     
     def populate_career_database(self, career_data_list):
-        """Populate Chroma with career information"""
+        """Incrementally sync Chroma with career information (the list is the full catalog)"""
         try:
             if self.embedding_model is None:
                 st.error("Embedding model not available for database population")
                 return False
                 
-            documents = []
-            metadatas = []
-            ids = []
-            
-            for i, career in enumerate(career_data_list):
-                # Create text to embed for career description
-                skills_text = ' '.join(career.get('skills', []))
-                text_to_embed = f"{career['title']} {career['description']} {skills_text} {career['industry']}"
-                
-                # Convert metadata to ChromaDB-compatible format (no lists)
-                safe_metadata = {}
-                for key, value in career.items():
-                    if isinstance(value, list):
-                        # Convert lists to comma-separated strings
-                        safe_metadata[key] = ', '.join(str(item) for item in value)
-                    elif isinstance(value, (str, int, float, bool)):
-                        safe_metadata[key] = value
-                    else:
-                        # Convert other types to string
-                        safe_metadata[key] = str(value)
-                
-                documents.append(text_to_embed)
-                metadatas.append(safe_metadata)
-                ids.append(f"career_{career.get('id', i)}")
-            
-            # Add to collection
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
+            # Embeds new/changed careers with the same model used for queries
+            # and deletes careers that are no longer in the list
+            sync_careers(self.chroma_manager, career_data_list)
+            self.collection = self.chroma_manager.get_collection()
+            self.search_backend = create_search_backend(self.chroma_manager, self.collection)
             return True
         except Exception as e:
+            increment("errors_total", operation="populate_career_database")
             st.error(f"Error populating database: {e}")
             return False
+
+
+# Process-wide counselor shared by every Streamlit session. It only holds
+# read-only resources (Groq client, Chroma collection, embedding model, LLM
+# manager); per-user conversation state lives in st.session_state.user_data.
+_shared_counselor = None
+_shared_counselor_lock = threading.Lock()
+
+def get_career_counselor():
+    """Return the process-wide CareerCounselor, creating it on first use"""
+    global _shared_counselor
+    if _shared_counselor is None:
+        with _shared_counselor_lock:
+            if _shared_counselor is None:
+                _shared_counselor = CareerCounselor()
+    return _shared_counselor
+
+def reset_career_counselor():
+    """Drop the shared counselor so the next call builds a fresh one"""
+    global _shared_counselor
+    with _shared_counselor_lock:
+        _shared_counselor = None
@@ -0,0 +1,306 @@
+# Typed career metadata: interned category codes, salary columns, list side column,
+# per-value membership columns and filters
+import json
+import math
+import operator
+import os
+import re
+import threading
+
+# Single-valued categories stored as small integer codes ("<field>_code")
+CATEGORY_FIELDS = ("industry", "job_outlook")
+
+# Multi-valued fields; Chroma only stores scalars, so the lists travel in LISTS_COLUMN
+LIST_FIELDS = ("skills", "education", "companies", "career_paths", "personality_match")
+LISTS_COLUMN = "lists_json"
+
+# List fields that filters can match on: each value a career lists becomes a
+# boolean "<field>_has_<code>" column, since Chroma cannot test list membership
+MEMBERSHIP_FIELDS = ("skills", "personality_match")
+
+# Fields with an interned vocabulary in category_codes.json
+VOCABULARY_FIELDS = CATEGORY_FIELDS + MEMBERSHIP_FIELDS
+
+# Typed columns that filters can use
+NUMERIC_FIELDS = ("salary_min", "salary_max")
+
+FILTER_OPERATORS = ("$eq", "$ne", "$in", "$nin", "$gt", "$gte", "$lt", "$lte")
+
+SALARY_PATTERN = re.compile(r"\$?\s*(\d[\d,]*(?:\.\d+)?)\s*([kK])?")
+
+def parse_salary_range(salary_range):
+    """("$65,000 - $130,000") -> (65000, 130000); (None, None) if there are no amounts"""
+    amounts = []
+    for number, thousands in SALARY_PATTERN.findall(str(salary_range or "")):
+        value = float(number.replace(",", ""))
+        amounts.append(int(value * 1000 if thousands else value))
+    if not amounts:
+        return None, None
+    return min(amounts), max(amounts)
+
+def membership_column(field, code):
+    return f"{field}_has_{code}"
+
+def category_codes_path(chroma_manager):
+    return os.path.join(chroma_manager.path, "category_codes.json")
+
+class CategoryCodes:
+    """
+    Append-only vocabulary per category (and membership) field, so a value keeps its code
+    across re-ingestions and every process decodes codes the same way.
+    Reloaded when the file on disk changes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.values = {field: [] for field in VOCABULARY_FIELDS}
+        self.codes = {field: {} for field in VOCABULARY_FIELDS}
+        self.dirty = False
+        self._mtime = None
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """Re-read the vocabulary if the file changed since the last read"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as file:
+                    stored = json.load(file)
+            except (OSError, ValueError):
+                return
+            for field in VOCABULARY_FIELDS:
+                self.values[field] = list(stored.get(field, []))
+                self.codes[field] = {value: code for code, value in enumerate(self.values[field])}
+            self._mtime = mtime
+
+    def code(self, field, value):
+        """Existing code for value, or None"""
+        return self.codes[field].get(str(value))
+
+    def intern(self, field, value):
+        """Code for value, assigning the next one if it is new"""
+        value = str(value)
+        code = self.codes[field].get(value)
+        if code is None:
+            with self._lock:
+                code = self.codes[field].get(value)
+                if code is None:
+                    code = len(self.values[field])
+                    self.values[field].append(value)
+                    self.codes[field][value] = code
+                    self.dirty = True
+        return code
+
+    def decode(self, field, code):
+        values = self.values[field]
+        return values[code] if 0 <= code < len(values) else None
+
+    def save(self):
+        """Write the vocabulary if intern() added anything"""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.values, file, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+def typed_columns(career, codes):
+    """Filterable typed columns plus the list side column for a career"""
+    columns = {}
+    for field in CATEGORY_FIELDS:
+        if career.get(field):
+            columns[f"{field}_code"] = codes.intern(field, career[field])
+    salary_min, salary_max = parse_salary_range(career.get("salary_range"))
+    if salary_min is not None:
+        columns["salary_min"] = salary_min
+        columns["salary_max"] = salary_max
+    for field in MEMBERSHIP_FIELDS:
+        if isinstance(career.get(field), list):
+            for value in career[field]:
+                columns[membership_column(field, codes.intern(field, value))] = True
+    lists = {field: list(career[field]) for field in LIST_FIELDS if isinstance(career.get(field), list)}
+    if lists:
+        columns[LISTS_COLUMN] = json.dumps(lists, ensure_ascii=False)
+    return columns
+
+def restore_lists(metadata):
+    """Metadata with list fields as tuples (from the side column) and the column removed"""
+    metadata = dict(metadata)
+    encoded = metadata.pop(LISTS_COLUMN, None)
+    if encoded:
+        try:
+            for field, values in json.loads(encoded).items():
+                metadata[field] = tuple(values)
+        except ValueError:
+            pass
+    return metadata
+
+def compile_filters(filters, codes):
+    """
+    Turn user filters into clauses on typed columns.
+
+    filters maps a field to a value (equality), a list/set/tuple (membership)
+    or an operator dict such as {"$gte": 60000}. Category fields are matched
+    on their interned codes, and unknown category values match nothing.
+    On membership fields (skills, personality_match) a value matches careers
+    listing it and a set matches careers listing any of them; these compile
+    to ("skills", "$contains"/"$ncontains", codes) clauses over the
+    membership columns. Returns a tuple of (column, operator, value)
+    clauses, or None if there are no filters. For example:
+
+        {"industry": {"Technology", "Healthcare"}, "salary_min": {"$gte": 60000},
+         "skills": {"Python", "SQL"}}
+    """
+    if not filters:
+        return None
+    if codes is not None:
+        codes.reload()
+    clauses = []
+    for field, condition in sorted(filters.items()):
+        if isinstance(condition, dict):
+            conditions = list(condition.items())
+        elif isinstance(condition, (list, set, tuple, frozenset)):
+            conditions = [("$in", condition)]
+        else:
+            conditions = [("$eq", condition)]
+
+        for op, value in conditions:
+            if op not in FILTER_OPERATORS:
+                raise ValueError(f"Unsupported filter operator {op!r} for {field}")
+            if field in CATEGORY_FIELDS:
+                column = f"{field}_code"
+                if op in ("$in", "$nin"):
+                    value = sorted(code for code in (codes.code(field, item) for item in value) if code is not None)
+                elif op in ("$eq", "$ne"):
+                    value = codes.code(field, value)
+                    if value is None:
+                        # Unknown category: equality matches nothing, inequality everything
+                        op, value = ("$in", []) if op == "$eq" else ("$nin", [])
+                else:
+                    raise ValueError(f"{field} only supports equality and membership filters")
+            elif field in MEMBERSHIP_FIELDS:
+                column = field
+                if op not in ("$eq", "$ne", "$in", "$nin"):
+                    raise ValueError(f"{field} only supports equality and membership filters")
+                items = value if op in ("$in", "$nin") else [value]
+                # Unknown values have no column: they match nothing (or exclude nothing)
+                value = sorted({code for code in (codes.code(field, item) for item in items) if code is not None})
+                op = "$contains" if op in ("$eq", "$in") else "$ncontains"
+            elif field in NUMERIC_FIELDS:
+                column = field
+                value = sorted(value) if op in ("$in", "$nin") else value
+            else:
+                raise ValueError(f"Cannot filter on {field!r}; "
+                                 f"choose from {CATEGORY_FIELDS + MEMBERSHIP_FIELDS + NUMERIC_FIELDS}")
+            if op in ("$nin", "$ncontains") and not value:
+                continue
+            clauses.append((column, op, tuple(value) if isinstance(value, list) else value))
+    return tuple(clauses)
+
+def matches_nothing(clauses):
+    """True if a membership clause has no values left (e.g. an unknown industry)"""
+    return any(op in ("$in", "$contains") and not value for _, op, value in clauses or ())
+
+def chroma_where(clauses):
+    """Chroma `where` filter for compiled clauses"""
+    terms = []
+    for column, op, value in clauses:
+        if op == "$contains":
+            # Any of the values: $or over their membership columns
+            alternatives = [{membership_column(column, code): {"$eq": True}} for code in value]
+            terms.append(alternatives[0] if len(alternatives) == 1 else {"$or": alternatives})
+        elif op == "$ncontains":
+            terms.extend({membership_column(column, code): {"$ne": True}} for code in value)
+        else:
+            terms.append({column: {op: list(value) if isinstance(value, tuple) else value}})
+    return terms[0] if len(terms) == 1 else {"$and": terms}
+
+COMPARISONS = {
+    "$eq": operator.eq, "$ne": operator.ne,
+    "$gt": operator.gt, "$gte": operator.ge,
+    "$lt": operator.lt, "$lte": operator.le
+}
+
+def metadata_matches(metadata, clauses):
+    """Evaluate compiled clauses against one metadata mapping"""
+    for column, op, value in clauses or ():
+        if op in ("$contains", "$ncontains"):
+            listed = any(metadata.get(membership_column(column, code)) for code in value)
+            if listed != (op == "$contains"):
+                return False
+            continue
+        actual = metadata.get(column)
+        if actual is None:
+            # Like Chroma, a missing value only satisfies negative filters
+            if op in ("$ne", "$nin"):
+                continue
+            return False
+        if op == "$in":
+            matched = actual in value
+        elif op == "$nin":
+            matched = actual not in value
+        else:
+            matched = COMPARISONS[op](actual, value)
+        if not matched:
+            return False
+    return True
+
+def column_mask(columns, clauses):
+    """
+    Boolean row mask over NumPy typed columns (missing values are NaN).
+    Used by the NumPy backend to filter before argpartition.
+    """
+    import numpy as np
+
+    mask = None
+    for column, op, value in clauses:
+        if op in ("$contains", "$ncontains"):
+            # Values no loaded career lists have no column
+            rows = len(next(iter(columns.values())))
+            condition = np.zeros(rows, dtype=bool)
+            for code in value:
+                listed = columns.get(membership_column(column, code))
+                if listed is not None:
+                    condition |= listed
+            if op == "$ncontains":
+                condition = ~condition
+            mask = condition if mask is None else mask & condition
+            continue
+        data = columns[column]
+        if op == "$in":
+            condition = np.isin(data, value)
+        elif op == "$nin":
+            condition = ~np.isin(data, value)
+        else:
+            condition = COMPARISONS[op](data, value)
+        mask = condition if mask is None else mask & condition
+    return mask
+
+def typed_column_arrays(metadatas):
+    """
+    Float64 arrays of the filterable columns, NaN where a career has no
+    value, plus a boolean array per membership column some career has
+    """
+    import numpy as np
+
+    names = [f"{field}_code" for field in CATEGORY_FIELDS] + list(NUMERIC_FIELDS)
+    arrays = {
+        name: np.array([metadata.get(name, math.nan) for metadata in metadatas], dtype=np.float64)
+        for name in names
+    }
+    prefixes = tuple(membership_column(field, "") for field in MEMBERSHIP_FIELDS)
+    for row, metadata in enumerate(metadatas):
+        for name, value in metadata.items():
+            if value is True and name.startswith(prefixes):
+                if name not in arrays:
+                    arrays[name] = np.zeros(len(metadatas), dtype=bool)
+                arrays[name][row] = True
+    return arrays
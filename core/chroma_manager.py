@@ -4,40 +4,118 @@ from chromadb.config import Settings
 import os
 from dotenv import load_dotenv
 
+from .embeddings import get_embedding_model_name
+from .search_backends import ChromaSearchBackend, cached_search
+
 load_dotenv()
 
+class EmbeddingModelMismatchError(ValueError):
+    """Raised when a collection was embedded with a different model than the configured one"""
+
 class ChromaManager:
     def __init__(self):
         # Initialize Chroma client with persistent storage
-        self.client = chromadb.PersistentClient(path="./chroma_db")
+        self.path = "./chroma_db"
+        self.client = chromadb.PersistentClient(path=self.path)
         self.collection_name = "career-discovery-collection"
-        
-    def get_or_create_collection(self):
-        """Get or create Chroma collection"""
+        # Catalog version lives beside the database so every process sees bumps
+        self.version_path = os.path.join(self.path, "catalog_version")
+        self._version = 0
+        self._version_mtime = None
+
+    def catalog_version(self):
+        """Current catalog version; ingestion bumps it so cached search results go stale"""
+        try:
+            mtime = os.stat(self.version_path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+        if mtime != self._version_mtime:
+            try:
+                with open(self.version_path, 'r') as file:
+                    self._version = int(file.read().strip() or 0)
+            except (OSError, ValueError):
+                self._version = 0
+            self._version_mtime = mtime
+        return self._version
+
+    def bump_catalog_version(self):
+        """Record that the collection contents changed"""
+        version = self.catalog_version() + 1
+        os.makedirs(self.path, exist_ok=True)
+        temp_path = f"{self.version_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as file:
+            file.write(str(version))
+        os.replace(temp_path, self.version_path)
+        return version
+
+    def get_or_create_collection(self, embedding_model=None, embedding_dimension=None,
+                                 rebuild_on_mismatch=False):
+        """
+        Get or create Chroma collection.
+
+        The collection records the embedding model name (and dimension, once
+        known) in its metadata. If an existing collection was built with a
+        different model it is rebuilt when empty or when rebuild_on_mismatch
+        is set; otherwise EmbeddingModelMismatchError is raised.
+        """
+        embedding_model = embedding_model or get_embedding_model_name()
         try:
-            collection = self.client.get_collection(name=self.collection_name)
-        except ValueError:
+            collection = self.client.get_collection(name=self.collection_name, embedding_function=None)
+        except Exception:
             # Collection doesn't exist, create it
-            collection = self.client.create_collection(
-                name=self.collection_name,
-                metadata={"hnsw:space": "cosine"}  # Use cosine similarity
-            )
-        return collection
-    
+            return self._create_collection(embedding_model, embedding_dimension)
+
+        mismatch = self._embedding_mismatch(collection, embedding_model, embedding_dimension)
+        if mismatch is None:
+            return collection
+        if rebuild_on_mismatch or collection.count() == 0:
+            self.client.delete_collection(name=self.collection_name)
+            self.bump_catalog_version()
+            return self._create_collection(embedding_model, embedding_dimension)
+        raise EmbeddingModelMismatchError(
+            f"{mismatch}. Run `python setup.py` to rebuild the career database."
+        )
+
+    def _create_collection(self, embedding_model, embedding_dimension=None):
+        metadata = {
+            "hnsw:space": "cosine",  # Use cosine similarity
+            "embedding_model": embedding_model
+        }
+        if embedding_dimension:
+            metadata["embedding_dimension"] = int(embedding_dimension)
+        # No embedding function: every vector comes from our own model
+        return self.client.create_collection(
+            name=self.collection_name,
+            metadata=metadata,
+            embedding_function=None
+        )
+
+    @staticmethod
+    def _embedding_mismatch(collection, embedding_model, embedding_dimension=None):
+        """Describe why a collection does not match the model, or None if it does"""
+        metadata = collection.metadata or {}
+        recorded_model = metadata.get("embedding_model")
+        if recorded_model != embedding_model:
+            built_with = recorded_model or "Chroma's default embedding function"
+            return f"Collection was embedded with {built_with}, expected {embedding_model}"
+        recorded_dimension = metadata.get("embedding_dimension")
+        if embedding_dimension and recorded_dimension != int(embedding_dimension):
+            return (f"Collection has {recorded_dimension or 'unknown'}-dimensional embeddings, "
+                    f"{embedding_model} produces {embedding_dimension}")
+        return None
+
     def get_collection(self):
         """Get existing collection"""
-        return self.client.get_collection(name=self.collection_name)
-    
+        return self.client.get_collection(name=self.collection_name, embedding_function=None)
+
+    def search_collection(self, collection, query, top_k=5):
+        """Vector search through Chroma with the shared, version-keyed result cache"""
+        return cached_search(ChromaSearchBackend(self, collection), query, top_k)
+
     def search_careers(self, query, top_k=5):
         """Search careers using text query"""
         try:
-            collection = self.get_collection()
-            results = collection.query(
-                query_texts=[query],
-                n_results=top_k,
-                include=['metadatas', 'documents', 'distances']
-            )
-            return results['metadatas'][0] if results['metadatas'] else []
+            return self.search_collection(self.get_collection(), query, top_k)
         except Exception as e:
             print(f"Error searching careers: {e}")
             return []
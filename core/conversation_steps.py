@@ -0,0 +1,99 @@
+# Backend work behind each step of the conversation flow, without Streamlit.
+# components/chat_interface.py renders these results; benchmarks/flow_driver.py
+# runs the same functions headless, so both exercise identical logic.
+
+# Interest categories offered in the interest exploration step
+INTEREST_OPTIONS = {
+    "🎨 Creative": "design, writing, art",
+    "📊 Analytical": "math, coding, puzzles",
+    "🤝 Social": "teaching, counseling, teamwork",
+    "🏃 Physical": "sports, crafting, hands-on",
+    "💻 Tech": "robotics, gaming, gadgets"
+}
+
+# Interests assumed when the user skips the clarifying questions
+SKIPPED_QUESTIONS_INTERESTS = ["🎨 Creative", "💻 Tech"]
+
+# Asked about when the profile does not say what is missing
+DEFAULT_MISSING_INFO = ['interests', 'skills', 'values']
+
+def conversation_history(user_data):
+    """The user's answers so far, as the LLM profile extraction reads them"""
+    return f"""
+    User Stage: {user_data.get('current_stage', 'Student')}
+    Selected Interest Categories: {', '.join(user_data.get('selected_interests', []))}
+    Additional Details: {user_data.get('freeform_interests', '')}
+    """
+
+def basic_profile(user_data):
+    """Profile built from the raw answers, used when the LLM is unavailable"""
+    freeform = user_data.get('freeform_interests', '')
+    return {
+        "primary_interests": user_data.get('selected_interests', []),
+        "extracted_keywords": freeform.split() if freeform else [],
+        "confidence_level": "medium"
+    }
+
+def analyze_preferences(counselor, user_data):
+    """
+    LLM profile of the user's answers. Interests, skills and values are
+    extracted concurrently; any leg that fails or times out is simply left
+    out, and the basic profile fills in interests and keywords.
+    """
+    llm_analysis = counselor.llm_manager.extract_full_profile(conversation_history(user_data))
+    profile = basic_profile(user_data)
+    llm_analysis.setdefault('primary_interests', profile['primary_interests'])
+    llm_analysis.setdefault('extracted_keywords', profile['extracted_keywords'])
+    return llm_analysis
+
+def career_search_queries(user_data):
+    """One search query per interest plus one for the keywords (or the free text)"""
+    selected_interests = user_data.get('selected_interests', [])
+    llm_analysis = user_data.get('llm_analysis', {})
+    if llm_analysis:
+        primary_interests = llm_analysis.get('primary_interests', selected_interests)
+        queries = list(primary_interests) + [" ".join(llm_analysis.get('extracted_keywords', []))]
+    else:
+        queries = list(selected_interests) + [user_data.get('freeform_interests', '')]
+    return [str(query).strip() for query in queries if query and str(query).strip()]
+
+def match_careers(counselor, user_data, top_k=4):
+    """Search each interest separately in one batch and fuse the rankings"""
+    queries = career_search_queries(user_data)
+    if not queries:
+        return []
+    return counselor.search_fused(queries, top_k=top_k)
+
+def stored_explanation(explanation_store, user_data, career_key):
+    """Explanation pre-generated offline by data/build_explanations.py, or None"""
+    return explanation_store.lookup(
+        career_key,
+        user_data.get('current_stage', 'Student'),
+        user_data.get('selected_interests', [])
+    )
+
+def stream_explanation(counselor, user_data, career):
+    """Chunks of a personalized "why this career matches you" explanation"""
+    return counselor.llm_manager.stream_career_explanation(
+        career.get('title', 'this career'),
+        user_data.get('llm_analysis', {}),
+        career.get('match_score', 'N/A'),
+        user_data.get('current_stage', 'Student')
+    )
+
+def related_careers(counselor, career, top_k=3):
+    """Precomputed neighbours of a career (skills, personality and industry)"""
+    return counselor.get_related_careers(career.get('id'), top_k=top_k)
+
+def clarifying_questions(counselor, user_data):
+    """LLM follow-up questions for what the profile is missing ([] on error)"""
+    llm_analysis = user_data.get('llm_analysis', {})
+    missing_info = llm_analysis.get('missing_info', DEFAULT_MISSING_INFO)
+    user_context = (f"Selected: {', '.join(user_data.get('selected_interests', []))}, "
+                    f"Additional: {user_data.get('freeform_interests', '')}")
+    response = counselor.llm_manager.generate_clarifying_questions(
+        user_context, missing_info, "interest_exploration"
+    )
+    if 'error' in response:
+        return []
+    return response.get('clarifying_questions', [])
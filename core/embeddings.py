@@ -0,0 +1,130 @@
+# Shared sentence-transformer embedding model used for both ingestion and queries
+import os
+import threading
+
+from .cache import LRUCache
+from .telemetry import increment, span
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_BATCH_SIZE = 32
+
+# "sentence-transformers" (torch, float32) or "onnx" (ONNX Runtime, int8 by default)
+EMBEDDING_BACKENDS = ("sentence-transformers", "onnx")
+
+# Query embeddings shared across sessions, keyed by (model name, backend, normalized query)
+query_embedding_cache = LRUCache(
+    maxsize=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "3600"))
+)
+
+_models = {}
+_models_lock = threading.Lock()
+
+def get_embedding_model_name() -> str:
+    """Name of the configured embedding model (EMBEDDING_MODEL env var)"""
+    return os.getenv("EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+
+def get_embedding_backend() -> str:
+    """Configured embedding backend (EMBEDDING_BACKEND env var)"""
+    backend = os.getenv("EMBEDDING_BACKEND", "sentence-transformers").lower()
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND {backend!r}; choose from {EMBEDDING_BACKENDS}")
+    return backend
+
+def get_embedding_model(model_name: str = None, backend: str = None):
+    """
+    Load an encoder once per process and return the shared instance.
+
+    Both backends expose encode() and get_sentence_embedding_dimension().
+    The ONNX backend loads the model exported by data/export_onnx_model.py
+    from a local directory (EMBEDDING_ONNX_DIR) and never touches the network.
+    """
+    model_name = model_name or get_embedding_model_name()
+    backend = backend or get_embedding_backend()
+    key = (model_name, backend)
+    model = _models.get(key)
+    if model is None:
+        with _models_lock:
+            model = _models.get(key)
+            if model is None:
+                with span("embedding.model_load", backend=backend):
+                    if backend == "onnx":
+                        from .onnx_embeddings import OnnxSentenceEncoder, default_onnx_model_dir
+                        model = OnnxSentenceEncoder(default_onnx_model_dir(model_name))
+                    else:
+                        from sentence_transformers import SentenceTransformer
+                        model = SentenceTransformer(model_name)
+                _models[key] = model
+    return model
+
+def get_embedding_dimension(model_name: str = None) -> int:
+    """Output dimension of the configured embedding model"""
+    return get_embedding_model(model_name).get_sentence_embedding_dimension()
+
+def encode_texts(texts, model_name: str = None, batch_size: int = DEFAULT_BATCH_SIZE):
+    """Encode texts with the shared model and return plain lists for Chroma"""
+    if not texts:
+        return []
+    model = get_embedding_model(model_name)
+    with span("embedding.encode", call="documents"):
+        return model.encode(list(texts), batch_size=batch_size).tolist()
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and case so equivalent queries share a cache entry"""
+    return " ".join(str(query).split()).casefold()
+
+def encode_query(query: str, model_name: str = None):
+    """
+    Embed a search query, reusing a cached vector for repeated queries.
+
+    The normalized text is what gets encoded, so a cache hit returns exactly
+    what a miss would have computed.
+    """
+    model_name = model_name or get_embedding_model_name()
+    text = normalize_query(query)
+    key = (model_name, get_embedding_backend(), text)
+
+    embedding = query_embedding_cache.get(key)
+    increment("cache_requests_total", cache="query_embedding", result="miss" if embedding is None else "hit")
+    if embedding is None:
+        model = get_embedding_model(model_name)
+        with span("embedding.encode", call="query"):
+            embedding = model.encode([text])[0]
+        # Read-only so no caller can corrupt the shared entry
+        embedding.setflags(write=False)
+        query_embedding_cache.set(key, embedding)
+    return embedding.tolist()
+
+def encode_queries(queries, model_name: str = None):
+    """
+    Embed several search queries, encoding every cache miss in one batch.
+
+    Returns one embedding per query, in order; duplicate queries (after
+    normalization) are encoded once.
+    """
+    model_name = model_name or get_embedding_model_name()
+    backend = get_embedding_backend()
+    texts = [normalize_query(query) for query in queries]
+
+    embeddings = {}
+    missing = []
+    for text in texts:
+        if text in embeddings or text in missing:
+            continue
+        embedding = query_embedding_cache.get((model_name, backend, text))
+        if embedding is None:
+            missing.append(text)
+        else:
+            embeddings[text] = embedding
+    increment("cache_requests_total", len(embeddings), cache="query_embedding", result="hit")
+    increment("cache_requests_total", len(missing), cache="query_embedding", result="miss")
+
+    if missing:
+        model = get_embedding_model(model_name)
+        with span("embedding.encode", call="queries"):
+            encoded = model.encode(missing)
+        for text, embedding in zip(missing, encoded):
+            embedding.setflags(write=False)
+            query_embedding_cache.set((model_name, backend, text), embedding)
+            embeddings[text] = embedding
+    return [embeddings[text].tolist() for text in texts]
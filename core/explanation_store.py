@@ -0,0 +1,88 @@
+# Pre-generated career explanations, built offline by data/build_explanations.py
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+EXPLANATIONS_PATH = Path(__file__).resolve().parent.parent / "data" / "career_explanations.jsonl"
+
+# Stages offered in the context check step
+USER_STAGES = ("School Student", "College Student", "Working Professional", "Career Switcher")
+
+# Interest clusters offered in the interest exploration step, plus a catch-all
+INTEREST_CLUSTERS = {
+    "creative": "Creative (design, writing, art)",
+    "analytical": "Analytical (math, coding, puzzles)",
+    "social": "Social (teaching, counseling, teamwork)",
+    "physical": "Physical (sports, crafting, hands-on)",
+    "tech": "Tech (robotics, gaming, gadgets)",
+    "general": "Broad, still-forming interests"
+}
+
+def interest_cluster(selected_interests: Iterable[str]) -> str:
+    """Cluster for a user's selected interest labels (first match wins, else "general")"""
+    for label in selected_interests or []:
+        words = str(label).lower().split()
+        for cluster in INTEREST_CLUSTERS:
+            if cluster in words:
+                return cluster
+    return "general"
+
+def explanation_key(career_id: str, user_stage: str, cluster: str) -> str:
+    return f"{career_id}|{user_stage}|{cluster}"
+
+class ExplanationStore:
+    """
+    Explanations keyed by (career id, user stage, interest cluster).
+
+    Stored as JSON Lines ({"key": ..., "text": ...}) so the batch job can
+    append as it goes and resume after a failure; a truncated last line is
+    ignored and later lines win.
+    """
+
+    def __init__(self, path=EXPLANATIONS_PATH):
+        self.path = Path(path)
+        self.explanations = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.explanations[entry["key"]] = entry["text"]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.explanations
+
+    def __len__(self) -> int:
+        return len(self.explanations)
+
+    def get(self, career_id: str, user_stage: str, cluster: str) -> Optional[str]:
+        return self.explanations.get(explanation_key(career_id, user_stage, cluster))
+
+    def lookup(self, career_id: str, user_stage: str, selected_interests: Iterable[str]) -> Optional[str]:
+        """Best stored explanation for a user, falling back to the general cluster"""
+        cluster = interest_cluster(selected_interests)
+        return self.get(career_id, user_stage, cluster) or self.get(career_id, user_stage, "general")
+
+    def append(self, key: str, text: str):
+        """Persist one explanation immediately (used by the batch job)"""
+        self.explanations[key] = text
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps({"key": key, "text": text}, ensure_ascii=False) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+def get_explanation_store() -> ExplanationStore:
+    """Process-wide explanation store, read from disk on first use"""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = ExplanationStore()
+    return _shared_store
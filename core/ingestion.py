@@ -0,0 +1,199 @@
+# Career catalog ingestion into the Chroma collection
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+from .career_metadata import CategoryCodes, category_codes_path, typed_columns
+from .chroma_manager import EmbeddingModelMismatchError
+from .embeddings import DEFAULT_BATCH_SIZE, encode_texts, get_embedding_dimension, get_embedding_model_name
+from .lexical_index import load_lexical_index, update_lexical_index
+from .related_careers import related_careers_version, update_related_careers, write_related_careers
+from .search_backends import numpy_index_dir, write_numpy_index
+from .telemetry import increment, record_span
+
+# Number of records compared/written per Chroma round trip
+DEFAULT_CHUNK_SIZE = 256
+
+def career_document(career: Dict[str, Any]) -> str:
+    """Text that gets embedded for a career"""
+    skills_text = ' '.join(career.get('skills', []))
+    return f"{career['title']} {career['description']} {skills_text} {career['industry']}"
+
+def safe_metadata(career: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert career metadata to ChromaDB-compatible format (no lists)"""
+    metadata = {}
+    for key, value in career.items():
+        if isinstance(value, list):
+            # Convert lists to comma-separated strings
+            metadata[key] = ', '.join(str(item) for item in value)
+        elif isinstance(value, (str, int, float, bool)):
+            metadata[key] = value
+        else:
+            # Convert other types to string
+            metadata[key] = str(value)
+    return metadata
+
+def career_record_id(career: Dict[str, Any], index: int) -> str:
+    """Stable Chroma id for a career"""
+    return f"career_{career.get('id', index)}"
+
+def build_career_records(career_data_list) -> Tuple[List[str], List[Dict[str, Any]], List[str]]:
+    """Build the documents, metadatas and ids lists for a list of careers"""
+    documents = []
+    metadatas = []
+    ids = []
+    for i, career in enumerate(career_data_list):
+        documents.append(career_document(career))
+        metadatas.append(safe_metadata(career))
+        ids.append(career_record_id(career, i))
+    return documents, metadatas, ids
+
+def content_hash(document: str, metadata: Dict[str, Any]) -> str:
+    """Hash of a career's embed text and metadata, used to detect changes"""
+    payload = json.dumps({"document": document, "metadata": metadata}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _open_collection(chroma_manager, model_name):
+    """Open the collection for syncing, loading the model only if it must be (re)built"""
+    try:
+        collection = chroma_manager.get_or_create_collection(embedding_model=model_name)
+    except EmbeddingModelMismatchError:
+        collection = None
+    if collection is None or collection.count() == 0:
+        # Everything will be (re)embedded, so record the dimension up front
+        collection = chroma_manager.get_or_create_collection(
+            embedding_model=model_name,
+            embedding_dimension=get_embedding_dimension(model_name),
+            rebuild_on_mismatch=True
+        )
+    return collection
+
+def sync_careers(chroma_manager, career_data_list, batch_size: int = DEFAULT_BATCH_SIZE,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, progress=None) -> Dict[str, Any]:
+    """
+    Incrementally sync the collection with a career catalog.
+
+    career_data_list (any iterable, e.g. a streaming loader) is treated as
+    the complete catalog: records whose content hash changed (or that are
+    new) are re-embedded and upserted, records missing from it are deleted,
+    and unchanged records are left alone. Records are read, compared and
+    upserted chunk_size at a time and encoded batch_size at a time, so
+    documents and embeddings in memory are bounded by the chunk. What grows
+    is the set of seen record ids (one string per career) and, when the
+    lexical index or related-careers graph is updated incrementally, the
+    metadata of the changed records. The embedding model is only loaded when
+    something needs embedding.
+
+    progress, if given, is called with the running stats after every chunk.
+    Returns counts of added, updated, deleted and unchanged records plus the
+    number processed, elapsed seconds and throughput in records per second.
+    """
+    model_name = get_embedding_model_name()
+    collection = _open_collection(chroma_manager, model_name)
+    stats = {"added": 0, "updated": 0, "deleted": 0, "unchanged": 0,
+             "processed": 0, "elapsed": 0.0, "records_per_second": 0.0}
+    seen_ids = set()
+    # Interned industry/job outlook codes, shared with every reader
+    codes = CategoryCodes(category_codes_path(chroma_manager))
+    # Sidecars in step with the catalog are updated from the change alone;
+    # the others are rebuilt from the collection below
+    current_version = chroma_manager.catalog_version()
+    lexical_current = load_lexical_index(chroma_manager).get("version") == current_version
+    related_current = related_careers_version(chroma_manager) == current_version
+    # (record id, metadata) of every added/updated career, kept only for those incremental updates
+    upserted = [] if lexical_current or related_current else None
+    started = time.perf_counter()
+
+    def report():
+        stats["elapsed"] = time.perf_counter() - started
+        stats["records_per_second"] = stats["processed"] / stats["elapsed"] if stats["elapsed"] else 0.0
+        if progress:
+            progress(dict(stats))
+
+    def flush(chunk):
+        ids = [record_id for record_id, _, _ in chunk]
+        existing = collection.get(ids=ids, include=['metadatas'])
+        stored_hashes = {
+            record_id: (metadata or {}).get('content_hash')
+            for record_id, metadata in zip(existing['ids'], existing['metadatas'])
+        }
+
+        changed = [record for record in chunk if stored_hashes.get(record[0]) != record[2]['content_hash']]
+        stats["unchanged"] += len(chunk) - len(changed)
+        if changed:
+            for record_id, _, _ in changed:
+                stats["updated" if record_id in stored_hashes else "added"] += 1
+
+            # Readers must know every code before records using it appear
+            codes.save()
+            documents = [document for _, document, _ in changed]
+            collection.upsert(
+                ids=[record_id for record_id, _, _ in changed],
+                documents=documents,
+                embeddings=encode_texts(documents, model_name, batch_size=batch_size),
+                metadatas=[metadata for _, _, metadata in changed]
+            )
+            if upserted is not None:
+                upserted.extend((record_id, metadata) for record_id, _, metadata in changed)
+        stats["processed"] += len(chunk)
+        report()
+
+    chunk = []
+    for i, career in enumerate(career_data_list):
+        record_id = career_record_id(career, i)
+        if record_id in seen_ids:
+            continue
+        seen_ids.add(record_id)
+
+        document = career_document(career)
+        metadata = safe_metadata(career)
+        # Typed filter columns and the original lists (see core/career_metadata.py)
+        metadata.update(typed_columns(career, codes))
+        metadata['content_hash'] = content_hash(document, metadata)
+        chunk.append((record_id, document, metadata))
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+
+    # Ids are scanned a page at a time and deleted afterwards, so offsets stay valid
+    stale_ids = []
+    for offset in range(0, collection.count(), chunk_size):
+        page = collection.get(include=[], limit=chunk_size, offset=offset)['ids']
+        stale_ids.extend(record_id for record_id in page if record_id not in seen_ids)
+    for start in range(0, len(stale_ids), chunk_size):
+        collection.delete(ids=stale_ids[start:start + chunk_size])
+    stats["deleted"] = len(stale_ids)
+    changed = stats["added"] or stats["updated"] or stats["deleted"]
+    # Sidecars are written for the version the catalog is about to move to, and
+    # the version is bumped last, so no reader reloads before they are all on disk
+    version = current_version + (1 if changed else 0)
+    if changed or not os.path.exists(os.path.join(numpy_index_dir(chroma_manager), "metadata.json")):
+        # Keep the in-process NumPy search index in step with the collection
+        write_numpy_index(chroma_manager, collection, chunk_size=chunk_size, version=version)
+    if not lexical_current:
+        # Missing or out of step with the catalog: re-read everything
+        update_lexical_index(chroma_manager, rebuild_from=collection, version=version)
+    elif changed:
+        # Only re-tokenize what changed
+        update_lexical_index(chroma_manager, upserted=upserted, deleted=stale_ids, version=version)
+    # Precompute related roles so the UI never searches for them
+    if not related_current:
+        # Missing or out of step: rebuild, reusing stored facet vectors
+        write_related_careers(chroma_manager, collection, chunk_size=chunk_size, version=version)
+    elif changed and not update_related_careers(chroma_manager, upserted=upserted, deleted=stale_ids,
+                                                version=version):
+        # Only encodes what changed and recomputes the neighbour lists it can
+        # affect; it declines (e.g. a different k) and we rebuild
+        write_related_careers(chroma_manager, collection, chunk_size=chunk_size, version=version)
+    if changed:
+        # Invalidate cached search results in every process
+        chroma_manager.bump_catalog_version()
+    report()
+    record_span("ingestion.sync", stats["elapsed"], changed=bool(changed))
+    for outcome in ("added", "updated", "deleted", "unchanged"):
+        increment("ingested_records_total", stats[outcome], outcome=outcome)
+    return stats
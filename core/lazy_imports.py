@@ -0,0 +1,38 @@
+# Deferred imports of heavy dependencies (warmed at boot by core/warmup.py)
+import importlib
+
+# Imported by the matching/search/LLM steps but not by the onboarding screens,
+# in roughly the order a cold process would need them
+HEAVY_MODULES = (
+    "dotenv",
+    "groq",
+    "chromadb",
+    "sentence_transformers",
+    "core.career_counselor"
+)
+
+_failures = {}
+
+def lazy_import(name):
+    """
+    Import a module on first use and return it.
+
+    Python's import lock makes concurrent calls safe: a caller that arrives
+    while the warm-up thread is importing the same module waits for it rather
+    than importing twice. ImportError is raised again on every call.
+    """
+    if name in _failures:
+        raise _failures[name]
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        _failures[name] = e
+        raise
+
+def is_available(name):
+    """True if name imports cleanly (imports it if that hasn't happened yet)"""
+    try:
+        lazy_import(name)
+        return True
+    except ImportError:
+        return False
@@ -0,0 +1,305 @@
+# BM25 inverted index over skill-like career fields, fused with vector search
+import json
+import math
+import os
+import re
+import threading
+from array import array
+
+from .career_metadata import metadata_matches
+from .search_backends import freeze_metadata
+
+# Fields indexed for exact-term matching (skills, tools, schools, employers, traits)
+LEXICAL_FIELDS = ("skills", "education", "companies", "personality_match")
+
+# Keeps terms such as "c++", "c#" and "node.js" whole
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(str(text).casefold())
+
+def career_terms(metadata):
+    """Term frequencies for a career's lexical fields (lists or comma-joined strings)"""
+    terms = {}
+    for field in LEXICAL_FIELDS:
+        value = metadata.get(field) or ""
+        if isinstance(value, (list, tuple)):
+            value = " ".join(str(item) for item in value)
+        for term in tokenize(value):
+            terms[term] = terms.get(term, 0) + 1
+    return terms
+
+def lexical_index_path(chroma_manager):
+    return os.path.join(chroma_manager.path, "lexical_index.json")
+
+def lexical_changes_path(chroma_manager):
+    return os.path.join(chroma_manager.path, "lexical_index_changes.json")
+
+class LexicalIndex:
+    """
+    In-memory BM25 index with compact postings.
+
+    Each term maps to two parallel arrays: document slots (array('I')) and
+    term frequencies (array('H')). Adding a career appends a new slot, so
+    postings stay sorted without rewriting them. Removing one only
+    tombstones its slot. compact() drops tombstoned postings once they make
+    up a quarter of the slots.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.slot_ids = []
+        self.slot_metadata = []
+        self.lengths = array('I')
+        self.slots = {}
+        self.total_length = 0
+        self.tombstones = 0
+
+    @classmethod
+    def from_documents(cls, documents):
+        """Build from {record id: {"terms": {...}, "metadata": {...}}}"""
+        index = cls()
+        for record_id, document in documents.items():
+            index.add(record_id, document["terms"], document["metadata"])
+        return index
+
+    def __len__(self):
+        return len(self.slots)
+
+    def copy(self):
+        """Independent copy (postings arrays included) that can be updated while this one is searched"""
+        index = LexicalIndex()
+        index.postings = {term: (array('I', slots), array('H', frequencies))
+                          for term, (slots, frequencies) in self.postings.items()}
+        index.slot_ids = list(self.slot_ids)
+        index.slot_metadata = list(self.slot_metadata)
+        index.lengths = array('I', self.lengths)
+        index.slots = dict(self.slots)
+        index.total_length = self.total_length
+        index.tombstones = self.tombstones
+        return index
+
+    def add(self, record_id, terms, metadata):
+        """Index a career, replacing any previous version of it"""
+        self.remove(record_id)
+        slot = len(self.slot_ids)
+        self.slot_ids.append(record_id)
+        self.slot_metadata.append(freeze_metadata(metadata))
+        length = sum(terms.values())
+        self.lengths.append(length)
+        self.total_length += length
+        self.slots[record_id] = slot
+        for term, frequency in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = (array('I'), array('H'))
+            postings[0].append(slot)
+            postings[1].append(min(frequency, 0xFFFF))
+
+    def remove(self, record_id):
+        slot = self.slots.pop(record_id, None)
+        if slot is None:
+            return
+        self.total_length -= self.lengths[slot]
+        self.slot_ids[slot] = None
+        self.slot_metadata[slot] = None
+        self.tombstones += 1
+        if self.tombstones * 4 > len(self.slot_ids):
+            self.compact()
+
+    def compact(self):
+        """Renumber live slots and drop tombstoned postings"""
+        remap = {}
+        slot_ids, slot_metadata, lengths = [], [], array('I')
+        for slot, record_id in enumerate(self.slot_ids):
+            if record_id is not None:
+                remap[slot] = len(slot_ids)
+                slot_ids.append(record_id)
+                slot_metadata.append(self.slot_metadata[slot])
+                lengths.append(self.lengths[slot])
+
+        postings = {}
+        for term, (slots, frequencies) in self.postings.items():
+            live = [(remap[slot], frequency) for slot, frequency in zip(slots, frequencies) if slot in remap]
+            if live:
+                postings[term] = (array('I', (slot for slot, _ in live)),
+                                  array('H', (frequency for _, frequency in live)))
+
+        self.postings = postings
+        self.slot_ids, self.slot_metadata, self.lengths = slot_ids, slot_metadata, lengths
+        self.slots = {record_id: slot for slot, record_id in enumerate(slot_ids)}
+        self.tombstones = 0
+
+    def search(self, query, top_k=5, where=None):
+        """
+        Careers ranked by BM25 over the query terms (only careers matching a
+        term), restricted to those satisfying compiled filter clauses
+        """
+        count = len(self.slots)
+        if not count:
+            return []
+        average_length = self.total_length / count or 1.0
+        slot_ids, lengths = self.slot_ids, self.lengths
+
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            slots, frequencies = postings
+            document_frequency = len(slots)
+            if self.tombstones:
+                document_frequency = sum(1 for slot in slots if slot_ids[slot] is not None)
+            idf = math.log(1 + (count - document_frequency + 0.5) / (document_frequency + 0.5))
+            for slot, frequency in zip(slots, frequencies):
+                if slot_ids[slot] is None:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[slot] / average_length)
+                scores[slot] = scores.get(slot, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+        if where:
+            scores = {slot: score for slot, score in scores.items()
+                      if metadata_matches(self.slot_metadata[slot], where)}
+        ranked = sorted(scores, key=lambda slot: (-scores[slot], slot))[:top_k]
+        return [self.slot_metadata[slot] for slot in ranked]
+
+def load_lexical_index(chroma_manager):
+    """Stored index file {"version", "fields", "documents"}, or {} if missing"""
+    try:
+        with open(lexical_index_path(chroma_manager), 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def load_lexical_documents(chroma_manager):
+    """Stored forward index {record id: {"terms", "metadata"}}, or {} if missing"""
+    return load_lexical_index(chroma_manager).get("documents", {})
+
+def load_lexical_changes(chroma_manager):
+    """Stored last change {"previous", "version", "upserted", "deleted"}, or {} if missing"""
+    try:
+        with open(lexical_changes_path(chroma_manager), 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_lexical_changes(chroma_manager, previous, version, upserted, deleted):
+    path = lexical_changes_path(chroma_manager)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump({"previous": previous, "version": version, "upserted": upserted, "deleted": deleted},
+                  file, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+def save_lexical_documents(chroma_manager, documents, version=None):
+    path = lexical_index_path(chroma_manager)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump({"version": chroma_manager.catalog_version() if version is None else version,
+                   "fields": LEXICAL_FIELDS, "documents": documents}, file, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+def update_lexical_index(chroma_manager, upserted=(), deleted=(), rebuild_from=None, version=None):
+    """
+    Apply a catalog change to the stored index: upserted is an iterable of
+    (record id, metadata), deleted an iterable of record ids. Only those
+    careers are re-tokenized. rebuild_from, if given, is a collection to
+    re-read everything from (used when the stored index is missing). The
+    file is stamped with version (default: the current catalog version).
+
+    An incremental update also stores the change itself, so processes
+    holding the previous version apply it to their live index instead of
+    rebuilding it.
+    """
+    if version is None:
+        version = chroma_manager.catalog_version()
+    changes = {}
+    if rebuild_from is None:
+        stored = load_lexical_index(chroma_manager)
+        documents = stored.get("documents", {})
+        previous = stored.get("version")
+    else:
+        documents = {}
+        previous = None
+        total = rebuild_from.count()
+        for offset in range(0, total, 1024):
+            batch = rebuild_from.get(include=['metadatas'], limit=1024, offset=offset)
+            for record_id, metadata in zip(batch['ids'], batch['metadatas']):
+                documents[record_id] = {"terms": career_terms(metadata), "metadata": metadata}
+    for record_id, metadata in upserted:
+        documents[record_id] = changes[record_id] = {"terms": career_terms(metadata), "metadata": metadata}
+    deleted = [record_id for record_id in deleted if record_id not in changes]
+    for record_id in deleted:
+        documents.pop(record_id, None)
+    # previous None (after a rebuild) means readers must load the full index
+    save_lexical_changes(chroma_manager, previous, version, changes, deleted)
+    save_lexical_documents(chroma_manager, documents, version)
+    return len(documents)
+
+class SharedLexicalIndex:
+    """
+    Process-wide read side. When the catalog version moves on by one
+    ingestion, the stored change is applied to a copy of the live index
+    (add/remove), which then replaces it; otherwise the index is rebuilt
+    from the stored documents.
+    """
+
+    def __init__(self, chroma_manager):
+        self.chroma_manager = chroma_manager
+        self.index = LexicalIndex()
+        self.loaded_version = None
+        # (catalog version, file mtimes) last found unusable, so the files are not re-read per search
+        self.rejected = None
+        self._lock = threading.Lock()
+
+    def _file_state(self, version):
+        mtimes = []
+        for path in (lexical_index_path(self.chroma_manager), lexical_changes_path(self.chroma_manager)):
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return (version, *mtimes)
+
+    def ensure_current(self):
+        version = self.chroma_manager.catalog_version()
+        if self.loaded_version == version:
+            return
+        with self._lock:
+            if self.loaded_version == version:
+                return
+            checked = self._file_state(version)
+            if self.rejected == checked:
+                return
+            if self.loaded_version is not None and self._apply_changes(version):
+                return
+            stored = load_lexical_index(self.chroma_manager)
+            if stored.get("version") != version:
+                # Missing, or written for another catalog version: keep what is
+                # loaded until the catalog version or the files change
+                self.rejected = checked
+                return
+            self.index = LexicalIndex.from_documents(stored.get("documents", {}))
+            self.loaded_version = version
+
+    def _apply_changes(self, version):
+        """Move the live index from loaded_version to version using the stored change, if it covers that step"""
+        changes = load_lexical_changes(self.chroma_manager)
+        if changes.get("version") != version or changes.get("previous") != self.loaded_version:
+            return False
+        # Searches keep using the current index until the updated copy replaces it
+        index = self.index.copy()
+        for record_id in changes.get("deleted", []):
+            index.remove(record_id)
+        for record_id, document in changes.get("upserted", {}).items():
+            index.add(record_id, document["terms"], document["metadata"])
+        self.index = index
+        self.loaded_version = version
+        return True
+
+    def search(self, query, top_k=5, where=None):
+        self.ensure_current()
+        return self.index.search(query, top_k, where)
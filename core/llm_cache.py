@@ -0,0 +1,135 @@
+# Persistent on-disk cache for deterministic, structured LLM responses
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Request fields that change the completion; anything else (e.g. stream) is ignored
+KEY_FIELDS = ("model", "messages", "temperature", "max_tokens", "top_p", "seed", "stop", "response_format")
+
+class LLMResponseCache:
+    """
+    SQLite-backed response cache shared by every worker process.
+
+    Entries are keyed on the model, a hash of the prompt messages and the
+    sampling parameters. The database runs in WAL mode so concurrent
+    readers and writers in different processes don't block each other.
+    Entries expire after ttl seconds, and once the stored responses exceed
+    max_bytes the least recently used ones are evicted.
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = None, ttl: float = None):
+        self.path = path or os.getenv("LLM_CACHE_PATH", "./llm_cache.sqlite3")
+        self.max_bytes = max_bytes or int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.ttl = ttl if ttl is not None else float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._local = threading.local()
+        self._setup()
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not thread-safe)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _setup(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """Cache key for a chat completion request"""
+        prompt_hash = hashlib.sha256(
+            json.dumps(request.get("messages", []), sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        params = {field: request.get(field) for field in KEY_FIELDS if field != "messages"}
+        return hashlib.sha256(
+            json.dumps({"prompt": prompt_hash, **params}, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, request: Dict[str, Any]) -> Optional[str]:
+        """Return the cached response text for request, or None"""
+        key = self.make_key(request)
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or (self.ttl and row[1] < now - self.ttl):
+            self.misses += 1
+            return None
+        connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return row[0]
+
+    def set(self, request: Dict[str, Any], response: str):
+        """Store the response text for request and evict if over budget"""
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses (key, response, size, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (self.make_key(request), response, len(response.encode("utf-8")), now, now)
+        )
+        self._writes += 1
+        if self._writes % 50 == 1:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        connection = self._connection()
+        if self.ttl:
+            connection.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+        connection.execute(
+            """DELETE FROM responses WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC) AS running_size FROM responses
+                ) WHERE running_size > ?
+            )""",
+            (self.max_bytes,)
+        )
+
+    def clear(self):
+        """Remove every cached response"""
+        self._connection().execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus on-disk size"""
+        count, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": count, "bytes": size,
+                "max_bytes": self.max_bytes, "ttl": self.ttl}
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """Process-wide response cache, or None when LLM_CACHE_ENABLED is false"""
+    global _shared_cache
+    if os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = LLMResponseCache()
+    return _shared_cache
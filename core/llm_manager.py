@@ -1,22 +1,86 @@
 # LLM Manager for handling multiple AI providers (Groq + Mixtral integration)
 import os
 import json
-from typing import Dict, Any, Optional, List
+import time
+from typing import Dict, Any, Iterator, Optional, List
 from groq import Groq
 from dotenv import load_dotenv
 
+from .llm_cache import LLMResponseCache, get_llm_response_cache
+from .prompt_registry import get_prompt_registry
+from .single_flight import SingleFlight
+from .telemetry import increment, observe, record_span, span
+
 load_dotenv()
 
-class LLMManager:
+PREFERENCE_PROMPTS = {
+    "interests": "preference_extraction/interest_extraction",
+    "skills": "preference_extraction/skill_assessment", 
+    "values": "preference_extraction/values_identification"
+}
+
+CAREER_MAPPING_PROMPTS = {
+    "stem": "career_mapping/stem_careers",
+    "arts": "career_mapping/arts_careers",
+    "sports": "career_mapping/sports_careers",
+    "general": "career_mapping/general_mapping"
+}
+
+# Analyses run together by extract_full_profile; later ones win on key clashes
+PROFILE_ANALYSES = ("skills", "values", "interests")
+
+EXPLANATION_PROMPT = "explanation_generation/career_explanation"
+CLARIFYING_QUESTIONS_PROMPT = "fallback/clarifying_questions"
+
+# Placeholders each template is rendered with, checked once when prompts load
+PROMPT_FIELDS = {
+    **{name: {"conversation_history"} for name in PREFERENCE_PROMPTS.values()},
+    **{name: {"user_preferences"} for name in CAREER_MAPPING_PROMPTS.values()},
+    EXPLANATION_PROMPT: {"career_name", "user_profile", "match_score", "user_stage"},
+    CLARIFYING_QUESTIONS_PROMPT: {"user_context", "user_response", "missing_info", "conversation_stage"}
+}
+
+_prompts_checked = False
+
+# Identical structured requests in flight from any session share one provider call
+SINGLE_FLIGHT = os.getenv("LLM_SINGLE_FLIGHT", "true").lower() not in ("0", "false", "no")
+_inflight_requests = SingleFlight()
+
+def check_prompt_templates(registry):
     """
-    Manages multiple LLM providers for different tasks.
-    - Groq: Fast responses, real-time chat
-    - Mixtral: Complex reasoning, preference analysis
+    Check templates against PROMPT_FIELDS once per process. A missing
+    template only disables its request, but a placeholder mismatch raises
+    ValueError so a broken prompt fails at load instead of reaching the model.
+    """
+    global _prompts_checked
+    if _prompts_checked:
+        return
+    mismatches = []
+    for name, problem in registry.validate(PROMPT_FIELDS).items():
+        if problem.get("missing"):
+            print(f"Warning: Prompt template not found: prompts/{name}.txt")
+            continue
+        if problem["unused"]:
+            mismatches.append(f"prompts/{name}.txt never uses {sorted(problem['unused'])}")
+        if problem["unsupplied"]:
+            mismatches.append(f"prompts/{name}.txt has unsupplied {sorted(problem['unsupplied'])}")
+    if mismatches:
+        raise ValueError("Prompt template mismatch: " + "; ".join(mismatches))
+    _prompts_checked = True
+
+DEFAULT_CHAT_SYSTEM_PROMPT = """You are Brainy, a friendly and encouraging AI career counselor. 
+            Help users explore career options in a conversational, supportive way. 
+            Ask thoughtful questions and provide helpful guidance."""
+
+class BaseLLMManager:
+    """
+    Prompt construction and response parsing shared by the blocking
+    LLMManager and the asyncio AsyncLLMManager. Each *_request method returns
+    the keyword arguments for chat.completions.create, or None when its
+    prompt template is unavailable.
     """
     
     def __init__(self):
-        self.groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-        
         # Available models
         self.models = {
             "groq_fast": "mixtral-8x7b-32768",  # Fast Groq model
@@ -24,14 +88,239 @@ class LLMManager:
             "mixtral": "mixtral-8x7b-32768"  # Using Groq's Mixtral for now
         }
         
-    def load_prompt_template(self, prompt_path: str) -> str:
-        """Load a prompt template from the prompts directory"""
+        # Every prompt is read and compiled once per process
+        self.prompt_registry = get_prompt_registry()
+        check_prompt_templates(self.prompt_registry)
+        
+        # Persistent cache for deterministic structured (JSON) calls
         try:
-            with open(prompt_path, 'r', encoding='utf-8') as file:
-                return file.read().strip()
-        except FileNotFoundError:
+            self.response_cache = get_llm_response_cache()
+        except Exception as e:
+            print(f"Warning: LLM response cache unavailable: {e}")
+            self.response_cache = None
+        
+    def load_prompt_template(self, prompt_path: str) -> str:
+        """Raw text of a prompt template (served from the registry, no file I/O)"""
+        template = self.prompt_registry.get(prompt_path)
+        if template is None:
             print(f"Warning: Prompt template not found at {prompt_path}")
             return ""
+        return template.text
+    
+    def render_prompt(self, name: str, **values) -> Optional[str]:
+        """Render a precompiled template, or None if it does not exist or is empty"""
+        template = self.prompt_registry.get(name)
+        if template is None or not template.text:
+            return None
+        return template.render(**values)
+    
+    @staticmethod
+    def parse_json_response(result: str) -> Dict[str, Any]:
+        """Parse a JSON completion, returning the raw text if it is not a valid JSON object"""
+        try:
+            parsed = json.loads(result)
+        except (json.JSONDecodeError, TypeError):
+            parsed = None
+        if not isinstance(parsed, dict):
+            # Not JSON, or JSON that isn't an object (a list, number or null):
+            # return the raw text so callers can rely on dict access
+            return {"raw_analysis": result, "parsing_error": True}
+        return parsed
+    
+    def _preferences_request(self, conversation_history: str, analysis_type: str) -> Optional[Dict[str, Any]]:
+        # Format the prompt with conversation history
+        formatted_prompt = self.render_prompt(PREFERENCE_PROMPTS[analysis_type],
+                                              conversation_history=conversation_history)
+        if formatted_prompt is None:
+            return None
+        return {
+            "model": self.models["groq_detailed"],
+            "messages": [
+                {"role": "system", "content": "You are an expert career counselor. Always respond with valid JSON."},
+                {"role": "user", "content": formatted_prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 1500
+        }
+    
+    def _career_mapping_request(self, user_preferences: Dict[str, Any], category: str) -> Optional[Dict[str, Any]]:
+        # Use general mapping approach for unknown categories
+        prompt_name = CAREER_MAPPING_PROMPTS.get(category, CAREER_MAPPING_PROMPTS["general"])
+        
+        # Format preferences as string for the prompt
+        preferences_str = json.dumps(user_preferences, indent=2)
+        formatted_prompt = self.render_prompt(prompt_name, user_preferences=preferences_str)
+        if formatted_prompt is None:
+            return None
+        return {
+            "model": self.models["mixtral"],  # Use Mixtral for complex reasoning
+            "messages": [
+                {"role": "system", "content": "You are a career mapping specialist. Always respond with valid JSON."},
+                {"role": "user", "content": formatted_prompt}
+            ],
+            "temperature": 0.4,
+            "max_tokens": 2000
+        }
+    
+    def _explanation_request(self, career_name: str, user_profile: Dict[str, Any],
+                             match_score: float, user_stage: str) -> Optional[Dict[str, Any]]:
+        # Format the prompt with career details
+        formatted_prompt = self.render_prompt(
+            EXPLANATION_PROMPT,
+            career_name=career_name,
+            user_profile=json.dumps(user_profile, indent=2),
+            match_score=match_score,
+            user_stage=user_stage
+        )
+        if formatted_prompt is None:
+            return None
+        return {
+            "model": self.models["groq_fast"],  # Use fast model for explanations
+            "messages": [
+                {"role": "system", "content": "You are an encouraging career counselor. Write in a conversational, supportive tone."},
+                {"role": "user", "content": formatted_prompt}
+            ],
+            "temperature": 0.6,
+            "max_tokens": 800
+        }
+    
+    def _clarifying_questions_request(self, user_response: str, missing_info: List[str],
+                                      conversation_stage: str) -> Optional[Dict[str, Any]]:
+        # Format the prompt
+        formatted_prompt = self.render_prompt(
+            CLARIFYING_QUESTIONS_PROMPT,
+            user_context=user_response,
+            user_response=user_response,
+            missing_info=", ".join(missing_info),
+            conversation_stage=conversation_stage
+        )
+        if formatted_prompt is None:
+            return None
+        return {
+            "model": self.models["groq_fast"],
+            "messages": [
+                {"role": "system", "content": "You are a helpful career counselor. Always respond with valid JSON."},
+                {"role": "user", "content": formatted_prompt}
+            ],
+            "temperature": 0.5,
+            "max_tokens": 800
+        }
+    
+    def _chat_request(self, user_input: str, conversation_context: str, system_prompt: str) -> Dict[str, Any]:
+        messages = [{"role": "system", "content": system_prompt or DEFAULT_CHAT_SYSTEM_PROMPT}]
+        
+        if conversation_context:
+            messages.append({"role": "assistant", "content": f"Context: {conversation_context}"})
+        
+        messages.append({"role": "user", "content": user_input})
+        return {
+            "model": self.models["groq_fast"],
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": 500
+        }
+    
+    @staticmethod
+    def merge_profile(results: Dict[str, Any], errors: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Merge per-analysis extraction results into one profile dict.
+
+        Successful analyses are merged at the top level (their keys do not
+        overlap apart from the interests analysis' "values" list, which wins).
+        Failed or timed-out analyses are listed in "failed_analyses" and
+        "partial" is set, so callers can use whatever did come back.
+        """
+        errors = dict(errors)
+        profile = {}
+        for analysis in PROFILE_ANALYSES:
+            result = results.get(analysis)
+            if result is None:
+                continue
+            if "error" in result:
+                errors[analysis] = result["error"]
+            elif result.get("parsing_error"):
+                errors[analysis] = "Response was not valid JSON"
+            else:
+                profile.update(result)
+        profile["failed_analyses"] = errors
+        profile["partial"] = bool(errors)
+        return profile
+    
+    @staticmethod
+    def _default_clarifying_questions() -> Dict[str, Any]:
+        return {
+            "clarifying_questions": [
+                "What activities do you enjoy most in your free time?",
+                "What subjects or topics naturally interest you?",
+                "Do you prefer working with people, data, or hands-on projects?"
+            ],
+            "question_type": "general_exploration"
+        }
+    
+    @staticmethod
+    def _parse_clarifying_questions(result: str) -> Dict[str, Any]:
+        try:
+            return json.loads(result)
+        except json.JSONDecodeError:
+            return {
+                "clarifying_questions": [
+                    "Could you tell me more about what interests you?",
+                    "What kind of work environment appeals to you?",
+                    "What are your strongest skills or talents?"
+                ],
+                "question_type": "fallback"
+            }
+    
+    @staticmethod
+    def _failed_clarifying_questions(error: Exception) -> Dict[str, Any]:
+        return {
+            "clarifying_questions": [
+                "What activities make you feel most engaged and energized?",
+                "If you could solve any problem in the world, what would it be?",
+                "What does your ideal workday look like?"
+            ],
+            "question_type": "fallback",
+            "error": str(error)
+        }
+
+class LLMManager(BaseLLMManager):
+    """
+    Manages multiple LLM providers for different tasks.
+    - Groq: Fast responses, real-time chat
+    - Mixtral: Complex reasoning, preference analysis
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+    
+    def _complete_json(self, request: Dict[str, Any], call: str = "complete_json") -> Dict[str, Any]:
+        """Complete a structured request, serving identical requests from the persistent cache"""
+        cached = self.response_cache.get(request) if self.response_cache else None
+        if self.response_cache:
+            increment("cache_requests_total", cache="llm_response", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return self.parse_json_response(cached)
+        
+        if not SINGLE_FLIGHT:
+            return self.parse_json_response(self._request_json_content(request, call))
+        # Concurrent callers with the same cache key wait for one request (and its error)
+        content, shared = _inflight_requests.do(LLMResponseCache.make_key(request),
+                                                self._request_json_content, request, call)
+        if shared:
+            increment("llm_requests_deduplicated_total", call=call)
+        # Parsed per caller, so no two sessions share a mutable result
+        return self.parse_json_response(content)
+    
+    def _request_json_content(self, request: Dict[str, Any], call: str) -> str:
+        """Send a structured request and cache the reply text if it is valid JSON"""
+        with span("llm.request", call=call, model=request["model"]):
+            response = self.groq_client.chat.completions.create(**request)
+        content = response.choices[0].message.content
+        # Only valid JSON is worth replaying
+        if self.response_cache and "parsing_error" not in self.parse_json_response(content):
+            self.response_cache.set(request, content)
+        return content
     
     def extract_preferences(self, conversation_history: str, analysis_type: str = "interests") -> Dict[str, Any]:
         """
@@ -41,43 +330,31 @@ class LLMManager:
             conversation_history: Full conversation text
             analysis_type: "interests", "skills", or "values"
         """
-        
-        prompt_files = {
-            "interests": "prompts/preference_extraction/interest_extraction.txt",
-            "skills": "prompts/preference_extraction/skill_assessment.txt", 
-            "values": "prompts/preference_extraction/values_identification.txt"
-        }
-        
-        prompt_template = self.load_prompt_template(prompt_files[analysis_type])
-        if not prompt_template:
+        request = self._preferences_request(conversation_history, analysis_type)
+        if request is None:
             return {"error": f"Could not load {analysis_type} extraction prompt"}
         
-        # Format the prompt with conversation history
-        formatted_prompt = prompt_template.format(conversation_history=conversation_history)
-        
         try:
-            response = self.groq_client.chat.completions.create(
-                model=self.models["groq_detailed"],
-                messages=[
-                    {"role": "system", "content": "You are an expert career counselor. Always respond with valid JSON."},
-                    {"role": "user", "content": formatted_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1500
-            )
-            
-            result = response.choices[0].message.content
-            
-            # Try to parse as JSON
-            try:
-                return json.loads(result)
-            except json.JSONDecodeError:
-                # If JSON parsing fails, return the raw text
-                return {"raw_analysis": result, "parsing_error": True}
-                
+            return self._complete_json(request, "extract_preferences")
         except Exception as e:
+            increment("errors_total", operation="extract_preferences")
             return {"error": f"LLM request failed: {str(e)}"}
     
+    def extract_full_profile(self, conversation_history: str, timeout: float = None) -> Dict[str, Any]:
+        """
+        Run the interests, skills and values extractions concurrently and merge them.
+        
+        Latency is that of the slowest single call rather than the sum. Legs
+        that fail or exceed the timeout are reported in "failed_analyses"
+        and the rest are still returned (see BaseLLMManager.merge_profile).
+        """
+        from .async_llm_manager import get_async_llm_manager
+        
+        manager = get_async_llm_manager()
+        timeout = timeout or manager.profile_timeout
+        # The coroutine enforces the timeout itself; the margin only guards the bridge
+        return manager.run_sync(manager.extract_full_profile(conversation_history, timeout), timeout + 5)
+    
     def map_to_career_categories(self, user_preferences: Dict[str, Any], category: str = "general") -> Dict[str, Any]:
         """
         Map user preferences to specific career categories.
@@ -86,46 +363,14 @@ class LLMManager:
             user_preferences: Extracted preferences from previous analysis
             category: "stem", "arts", "sports", or "general"
         """
-        
-        prompt_files = {
-            "stem": "prompts/career_mapping/stem_careers.txt",
-            "arts": "prompts/career_mapping/arts_careers.txt",
-            "sports": "prompts/career_mapping/sports_careers.txt",
-            "general": "prompts/career_mapping/general_mapping.txt"
-        }
-        
-        if category in prompt_files:
-            prompt_template = self.load_prompt_template(prompt_files[category])
-        else:
-            # Use general mapping approach
-            prompt_template = self.load_prompt_template(prompt_files["general"])
-        
-        if not prompt_template:
+        request = self._career_mapping_request(user_preferences, category)
+        if request is None:
             return {"error": f"Could not load {category} career mapping prompt"}
         
-        # Format preferences as string for the prompt
-        preferences_str = json.dumps(user_preferences, indent=2)
-        formatted_prompt = prompt_template.format(user_preferences=preferences_str)
-        
         try:
-            response = self.groq_client.chat.completions.create(
-                model=self.models["mixtral"],  # Use Mixtral for complex reasoning
-                messages=[
-                    {"role": "system", "content": "You are a career mapping specialist. Always respond with valid JSON."},
-                    {"role": "user", "content": formatted_prompt}
-                ],
-                temperature=0.4,
-                max_tokens=2000
-            )
-            
-            result = response.choices[0].message.content
-            
-            try:
-                return json.loads(result)
-            except json.JSONDecodeError:
-                return {"raw_analysis": result, "parsing_error": True}
-                
+            return self._complete_json(request, "map_to_career_categories")
         except Exception as e:
+            increment("errors_total", operation="map_to_career_categories")
             return {"error": f"Career mapping failed: {str(e)}"}
     
     def generate_career_explanation(self, career_name: str, user_profile: Dict[str, Any], 
@@ -133,33 +378,17 @@ class LLMManager:
         """
         Generate a personalized explanation for why a career matches the user.
         """
-        
-        prompt_template = self.load_prompt_template("prompts/explanation_generation/career_explanation.txt")
-        if not prompt_template:
+        request = self._explanation_request(career_name, user_profile, match_score, user_stage)
+        if request is None:
+            increment("fallbacks_total", call="generate_career_explanation")
             return f"This career matches your interests and skills based on our analysis."
         
-        # Format the prompt with career details
-        formatted_prompt = prompt_template.format(
-            career_name=career_name,
-            user_profile=json.dumps(user_profile, indent=2),
-            match_score=match_score,
-            user_stage=user_stage
-        )
-        
         try:
-            response = self.groq_client.chat.completions.create(
-                model=self.models["groq_fast"],  # Use fast model for explanations
-                messages=[
-                    {"role": "system", "content": "You are an encouraging career counselor. Write in a conversational, supportive tone."},
-                    {"role": "user", "content": formatted_prompt}
-                ],
-                temperature=0.6,
-                max_tokens=800
-            )
-            
+            with span("llm.request", call="generate_career_explanation", model=request["model"]):
+                response = self.groq_client.chat.completions.create(**request)
             return response.choices[0].message.content
-            
         except Exception as e:
+            increment("fallbacks_total", call="generate_career_explanation")
             return f"I believe {career_name} would be a great fit for you based on your interests and skills!"
     
     def generate_clarifying_questions(self, user_response: str, missing_info: List[str], 
@@ -167,88 +396,92 @@ class LLMManager:
         """
         Generate clarifying questions when user preferences are unclear.
         """
-        
-        prompt_template = self.load_prompt_template("prompts/fallback/clarifying_questions.txt")
-        if not prompt_template:
-            return {
-                "clarifying_questions": [
-                    "What activities do you enjoy most in your free time?",
-                    "What subjects or topics naturally interest you?",
-                    "Do you prefer working with people, data, or hands-on projects?"
-                ],
-                "question_type": "general_exploration"
-            }
-        
-        # Format the prompt
-        formatted_prompt = prompt_template.format(
-            user_context=user_response,
-            missing_info=", ".join(missing_info),
-            conversation_stage=conversation_stage
-        )
+        request = self._clarifying_questions_request(user_response, missing_info, conversation_stage)
+        if request is None:
+            increment("fallbacks_total", call="generate_clarifying_questions")
+            return self._default_clarifying_questions()
         
         try:
-            response = self.groq_client.chat.completions.create(
-                model=self.models["groq_fast"],
-                messages=[
-                    {"role": "system", "content": "You are a helpful career counselor. Always respond with valid JSON."},
-                    {"role": "user", "content": formatted_prompt}
-                ],
-                temperature=0.5,
-                max_tokens=800
-            )
-            
-            result = response.choices[0].message.content
-            
-            try:
-                return json.loads(result)
-            except json.JSONDecodeError:
-                return {
-                    "clarifying_questions": [
-                        "Could you tell me more about what interests you?",
-                        "What kind of work environment appeals to you?",
-                        "What are your strongest skills or talents?"
-                    ],
-                    "question_type": "fallback"
-                }
-                
+            with span("llm.request", call="generate_clarifying_questions", model=request["model"]):
+                response = self.groq_client.chat.completions.create(**request)
+            return self._parse_clarifying_questions(response.choices[0].message.content)
         except Exception as e:
-            return {
-                "clarifying_questions": [
-                    "What activities make you feel most engaged and energized?",
-                    "If you could solve any problem in the world, what would it be?",
-                    "What does your ideal workday look like?"
-                ],
-                "question_type": "fallback",
-                "error": str(e)
-            }
+            increment("fallbacks_total", call="generate_clarifying_questions")
+            return self._failed_clarifying_questions(e)
+    
+    def _stream(self, call: str, request: Dict[str, Any], fallback: str) -> Iterator[str]:
+        """
+        Yield completion text as the provider sends it, recording total time
+        and time-to-first-token in telemetry (shown in the debug panel).
+        
+        If the request fails before any text arrives the fallback is yielded
+        instead; if it fails mid-stream the text already shown is kept.
+        """
+        started = time.perf_counter()
+        first_token_at = None
+        chunks = 0
+        try:
+            stream = self.groq_client.chat.completions.create(**request, stream=True)
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                chunks += 1
+                yield delta
+        except Exception:
+            if chunks == 0:
+                increment("fallbacks_total", call=call)
+                yield fallback
+        finally:
+            record_span("llm.stream", time.perf_counter() - started, call=call, model=request["model"])
+            if first_token_at is not None:
+                observe("llm_time_to_first_token_seconds", first_token_at - started,
+                        call=call, model=request["model"])
+    
+    def stream_career_explanation(self, career_name: str, user_profile: Dict[str, Any],
+                                  match_score: float, user_stage: str = "Student") -> Iterator[str]:
+        """
+        Streaming generate_career_explanation: yields text chunks as they arrive
+        (e.g. for st.write_stream).
+        """
+        request = self._explanation_request(career_name, user_profile, match_score, user_stage)
+        if request is None:
+            yield f"This career matches your interests and skills based on our analysis."
+            return
+        
+        yield from self._stream(
+            "generate_career_explanation",
+            request,
+            f"I believe {career_name} would be a great fit for you based on your interests and skills!"
+        )
+    
+    def stream_chat_response(self, user_input: str, conversation_context: str = "",
+                             system_prompt: str = "") -> Iterator[str]:
+        """
+        Streaming chat_response: yields text chunks as they arrive.
+
+        Not used by the UI yet: the conversation flow is button-driven and has
+        no free-text chat turn to stream into. Kept alongside chat_response for
+        when one is added.
+        """
+        yield from self._stream(
+            "chat_response",
+            self._chat_request(user_input, conversation_context, system_prompt),
+            "I'm here to help you explore career options! Could you tell me a bit about your interests?"
+        )
     
     def chat_response(self, user_input: str, conversation_context: str = "", 
                      system_prompt: str = "") -> str:
         """
         Generate a conversational response for general chat interactions.
         """
-        
-        if not system_prompt:
-            system_prompt = """You are Brainy, a friendly and encouraging AI career counselor. 
-            Help users explore career options in a conversational, supportive way. 
-            Ask thoughtful questions and provide helpful guidance."""
-        
         try:
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            if conversation_context:
-                messages.append({"role": "assistant", "content": f"Context: {conversation_context}"})
-            
-            messages.append({"role": "user", "content": user_input})
-            
-            response = self.groq_client.chat.completions.create(
-                model=self.models["groq_fast"],
-                messages=messages,
-                temperature=0.7,
-                max_tokens=500
-            )
-            
+            request = self._chat_request(user_input, conversation_context, system_prompt)
+            with span("llm.request", call="chat_response", model=request["model"]):
+                response = self.groq_client.chat.completions.create(**request)
             return response.choices[0].message.content
-            
         except Exception as e:
+            increment("fallbacks_total", call="chat_response")
             return "I'm here to help you explore career options! Could you tell me a bit about your interests?"
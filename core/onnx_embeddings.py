@@ -0,0 +1,92 @@
+# ONNX Runtime sentence encoder for CPU-only serving (int8-quantized MiniLM)
+import json
+import os
+from pathlib import Path
+
+ONNX_MODEL_FILES = ("model_int8.onnx", "model.onnx")
+ENCODER_CONFIG_FILE = "encoder_config.json"
+
+def default_onnx_model_dir(model_name: str) -> str:
+    """Where data/export_onnx_model.py writes the exported model"""
+    return os.getenv("EMBEDDING_ONNX_DIR", os.path.join("models", f"{model_name.replace('/', '_')}-onnx"))
+
+class OnnxSentenceEncoder:
+    """
+    Drop-in for SentenceTransformer.encode backed by ONNX Runtime.
+
+    Loads an exported transformer (preferably the dynamically quantized
+    model_int8.onnx) plus its tokenizer.json from a local directory, so no
+    network or torch is needed at serving time. Embeddings are mean-pooled
+    over the attention mask and L2-normalized, like all-MiniLM-L6-v2.
+
+    ONNX Runtime keeps its own intra-op thread pool, so encoding can use
+    several cores even though app.py pins OMP_NUM_THREADS=1 for torch
+    (ONNX_NUM_THREADS, default: all cores).
+    """
+
+    def __init__(self, model_dir: str, num_threads: int = None):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        self.model_dir = Path(model_dir)
+        model_path = next((self.model_dir / name for name in ONNX_MODEL_FILES
+                           if (self.model_dir / name).exists()), None)
+        if model_path is None:
+            raise FileNotFoundError(
+                f"No ONNX model in {self.model_dir}. Run `python data/export_onnx_model.py` first."
+            )
+        with open(self.model_dir / ENCODER_CONFIG_FILE, 'r', encoding='utf-8') as file:
+            self.config = json.load(file)
+        self.model_path = model_path
+        self.max_seq_length = int(self.config.get("max_seq_length", 256))
+        self.normalize = bool(self.config.get("normalize", True))
+
+        self.tokenizer = Tokenizer.from_file(str(self.model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=int(self.config.get("pad_token_id", 0)),
+                                      pad_token=self.config.get("pad_token", "[PAD]"))
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = num_threads or int(os.getenv("ONNX_NUM_THREADS", "0"))
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(str(model_path), options,
+                                                    providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return int(self.config["dimension"])
+
+    def _encode_batch(self, texts):
+        import numpy as np
+
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([encoding.type_ids for encoding in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+        mask = attention_mask[..., None].astype(np.float32)
+        embeddings = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.normalize:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings.astype(np.float32)
+
+    def encode(self, sentences, batch_size: int = 32, **kwargs):
+        """Embed sentences; returns a float32 array (a single vector for a single string)"""
+        import numpy as np
+
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        dimension = self.get_sentence_embedding_dimension()
+        if not texts:
+            return np.zeros((0, dimension), dtype=np.float32)
+
+        # Sort by length so each batch pads to similar lengths, then restore order
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        embeddings = np.empty((len(texts), dimension), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            batch = order[start:start + batch_size]
+            embeddings[batch] = self._encode_batch([texts[i] for i in batch])
+        return embeddings[0] if single else embeddings
@@ -0,0 +1,97 @@
+# Prompt templates loaded once from prompts/ and compiled for brace-safe rendering
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+PROMPTS_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+# Only {identifier} is a placeholder; any other braces (e.g. JSON examples) are literal text
+PLACEHOLDER_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+class PromptTemplate:
+    """
+    A prompt split once into literal segments and placeholder names.
+
+    Rendering is a single join with no parsing. Only {identifier} is a
+    placeholder, so literal JSON braces need no escaping, and every
+    placeholder must be supplied: an unfilled one is a bug, never text for
+    the model.
+    """
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = text
+        parts = PLACEHOLDER_PATTERN.split(text)
+        self._literals = parts[0::2]
+        self._fields = parts[1::2]
+        self.placeholders = frozenset(self._fields)
+
+    def render(self, **values) -> str:
+        """Fill in the placeholders; raises KeyError if one is not supplied"""
+        unsupplied = self.placeholders - values.keys()
+        if unsupplied:
+            raise KeyError(f"prompts/{self.name}.txt needs {sorted(unsupplied)}")
+        pieces = [self._literals[0]]
+        for field, literal in zip(self._fields, self._literals[1:]):
+            pieces.append(str(values[field]))
+            pieces.append(literal)
+        return "".join(pieces)
+
+class PromptRegistry:
+    """All prompt templates under prompts/, keyed by relative path without .txt"""
+
+    def __init__(self, prompts_dir: Path = PROMPTS_DIR):
+        self.prompts_dir = Path(prompts_dir)
+        self.templates = {}
+        for path in sorted(self.prompts_dir.rglob("*.txt")):
+            name = path.relative_to(self.prompts_dir).with_suffix("").as_posix()
+            self.templates[name] = PromptTemplate(name, path.read_text(encoding="utf-8").strip())
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """Accept "prompts/x/y.txt", "x/y.txt" or "x/y" and return "x/y" """
+        name = name.replace("\\", "/")
+        if name.startswith("prompts/"):
+            name = name[len("prompts/"):]
+        if name.endswith(".txt"):
+            name = name[:-len(".txt")]
+        return name
+
+    def get(self, name: str) -> Optional[PromptTemplate]:
+        """Template by name, or None if there is no such prompt file"""
+        return self.templates.get(self.normalize_name(name))
+
+    def validate(self, supplied_fields: Dict[str, Iterable[str]]) -> Dict[str, Dict[str, set]]:
+        """
+        Check templates against the fields their callers supply.
+
+        Returns, per template with a problem, the supplied fields the
+        template never uses ("unused") and the placeholders nobody supplies
+        ("unsupplied", which render would refuse). Missing templates are
+        reported with "missing": True.
+        """
+        problems = {}
+        for name, fields in supplied_fields.items():
+            template = self.get(name)
+            if template is None:
+                problems[name] = {"missing": True}
+                continue
+            fields = set(fields)
+            unused = fields - template.placeholders
+            unsupplied = template.placeholders - fields
+            if unused or unsupplied:
+                problems[name] = {"unused": unused, "unsupplied": unsupplied}
+        return problems
+
+_shared_registry = None
+_shared_registry_lock = threading.Lock()
+
+def get_prompt_registry() -> PromptRegistry:
+    """Process-wide registry, loaded from disk on first use"""
+    global _shared_registry
+    if _shared_registry is None:
+        with _shared_registry_lock:
+            if _shared_registry is None:
+                _shared_registry = PromptRegistry()
+    return _shared_registry
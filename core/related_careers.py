@@ -0,0 +1,282 @@
+# Precomputed career-to-career similarity graph behind "See related roles"
+import json
+import os
+import threading
+
+from .embeddings import encode_texts, get_embedding_backend, get_embedding_model_name
+
+# Neighbours stored per career
+DEFAULT_RELATED_K = 5
+
+# Facets blended into the career-to-career similarity, with their weights
+FACET_WEIGHTS = {
+    "skills": 0.5,
+    "personality_match": 0.25,
+    "industry": 0.25
+}
+
+# Metadata copied into each neighbour so a lookup needs nothing else
+NEIGHBOR_FIELDS = ("id", "title", "tagline", "emoji", "industry")
+
+def related_careers_path(chroma_manager):
+    return os.path.join(chroma_manager.path, "related_careers.json")
+
+def related_facets_paths(chroma_manager):
+    """Stored blended facet vectors (.npy) and the careers they belong to (.json)"""
+    return (os.path.join(chroma_manager.path, "related_facets.npy"),
+            os.path.join(chroma_manager.path, "related_facets.json"))
+
+def _facet_matrix(metadatas, model_name=None):
+    """
+    Blended facet embeddings: each facet is L2-normalized and scaled by
+    sqrt(weight), so one dot product between rows is the weighted sum of
+    per-facet cosine similarities.
+    """
+    import numpy as np
+
+    blocks = []
+    for facet, weight in FACET_WEIGHTS.items():
+        texts = [str(metadata.get(facet) or "") for metadata in metadatas]
+        block = np.asarray(encode_texts(texts, model_name), dtype=np.float32)
+        block /= np.maximum(np.linalg.norm(block, axis=1, keepdims=True), 1e-12)
+        blocks.append(block * np.sqrt(weight))
+    return np.hstack(blocks)
+
+def _facet_key(model_name=None):
+    """What stored facet vectors depend on; a mismatch means re-encoding everything"""
+    return {"model": model_name or get_embedding_model_name(), "backend": get_embedding_backend(),
+            "weights": FACET_WEIGHTS}
+
+def _career_entry(record_id, metadata):
+    """What the facet store keeps per career: its record id, content hash and neighbour fields"""
+    entry = {field: metadata[field] for field in NEIGHBOR_FIELDS if field in metadata}
+    entry["record_id"] = record_id
+    entry["content_hash"] = metadata.get("content_hash")
+    return entry
+
+def _related_rows(vectors, careers, rows, k, block_size=1024):
+    """
+    Neighbour lists for the careers at the given rows of vectors.
+
+    Careers with the same title as the source (or as an earlier neighbour)
+    are skipped, and ties are broken by id, so results are stable across
+    rebuilds. Similarities are computed block_size rows at a time to keep
+    memory bounded on large catalogs.
+    """
+    import numpy as np
+
+    ids = [career["id"] for career in careers]
+    titles = [str(career.get("title", "")).casefold() for career in careers]
+    # Extra candidates to survive the title dedup below
+    candidates = min(len(careers), k * 2 + 1)
+
+    graph = {}
+    for start in range(0, len(rows), block_size):
+        sources = rows[start:start + block_size]
+        scores = vectors[sources] @ vectors.T
+        top = np.argpartition(-scores, candidates - 1, axis=1)[:, :candidates]
+        for row, neighbours in enumerate(top):
+            source = sources[row]
+            neighbours = sorted(neighbours, key=lambda i: (-scores[row, i], ids[i]))
+            seen_titles = {titles[source]}
+            related = []
+            for i in neighbours:
+                if i == source or titles[i] in seen_titles:
+                    continue
+                seen_titles.add(titles[i])
+                entry = {field: careers[i][field] for field in NEIGHBOR_FIELDS if field in careers[i]}
+                entry["score"] = round(float(scores[row, i]), 4)
+                related.append(entry)
+                if len(related) == k:
+                    break
+            graph[ids[source]] = related
+    return graph
+
+def build_related_careers(metadatas, k=DEFAULT_RELATED_K, model_name=None, block_size=1024):
+    """
+    k nearest careers for every career, by blended skills/personality/industry
+    similarity (see _related_rows for dedup and tie-breaking)
+    """
+    careers = [metadata for metadata in metadatas if metadata.get("id")]
+    if not careers:
+        return {}
+    vectors = _facet_matrix(careers, model_name)
+    return _related_rows(vectors, careers, list(range(len(careers))), k, block_size)
+
+def _load_related_state(chroma_manager):
+    """(graph file, facet vectors, facet careers) if both were stored by the same build, else None"""
+    import numpy as np
+
+    vectors_path, careers_path = related_facets_paths(chroma_manager)
+    try:
+        with open(related_careers_path(chroma_manager), 'r', encoding='utf-8') as file:
+            graph = json.load(file)
+        with open(careers_path, 'r', encoding='utf-8') as file:
+            facets = json.load(file)
+        vectors = np.load(vectors_path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    if (facets.get("key") != _facet_key() or facets.get("version") != graph.get("version")
+            or len(vectors) != len(facets.get("careers", []))):
+        return None
+    return graph, vectors, facets["careers"]
+
+def related_careers_version(chroma_manager):
+    """Catalog version the stored graph and facet vectors were built for (None if missing or out of step)"""
+    state = _load_related_state(chroma_manager)
+    return None if state is None else state[0].get("version")
+
+def _save_related(chroma_manager, graph, vectors, careers, k, version):
+    import numpy as np
+
+    if version is None:
+        version = chroma_manager.catalog_version()
+    vectors_path, careers_path = related_facets_paths(chroma_manager)
+    # Facets first: the graph is what readers load, and its version must match them
+    vectors_tmp = f"{vectors_path}.{os.getpid()}.tmp.npy"
+    np.save(vectors_tmp, np.asarray(vectors, dtype=np.float32))
+    os.replace(vectors_tmp, vectors_path)
+    for path, payload in ((careers_path, {"version": version, "key": _facet_key(), "careers": careers}),
+                          (related_careers_path(chroma_manager), {"version": version, "k": k, "related": graph})):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(payload, file, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+def write_related_careers(chroma_manager, collection, k=DEFAULT_RELATED_K, chunk_size=1024, version=None):
+    """
+    Rebuild the graph from the collection and store it beside the database,
+    stamped with version (default: the current catalog version).
+
+    Facet vectors already stored for a career with the same content hash
+    are reused, so only new or changed careers are encoded.
+    """
+    import numpy as np
+
+    stored = {}
+    state = _load_related_state(chroma_manager)
+    if state is not None:
+        _, stored_vectors, stored_careers = state
+        stored = {(career["record_id"], career["content_hash"]): stored_vectors[row]
+                  for row, career in enumerate(stored_careers)}
+
+    careers, blocks = [], []
+    total = collection.count()
+    for offset in range(0, total, chunk_size):
+        batch = collection.get(include=['metadatas'], limit=chunk_size, offset=offset)
+        records = [(record_id, metadata) for record_id, metadata in zip(batch['ids'], batch['metadatas'])
+                   if metadata.get("id")]
+        chunk = [_career_entry(record_id, metadata) for record_id, metadata in records]
+        missing = [metadata for (_, metadata), career in zip(records, chunk)
+                   if (career["record_id"], career["content_hash"]) not in stored]
+        encoded = iter(_facet_matrix(missing)) if missing else iter(())
+        for career in chunk:
+            key = (career["record_id"], career["content_hash"])
+            blocks.append(stored[key] if key in stored else next(encoded))
+        careers.extend(chunk)
+
+    vectors = np.vstack(blocks) if blocks else np.zeros((0, 0), dtype=np.float32)
+    graph = _related_rows(vectors, careers, list(range(len(careers))), k) if careers else {}
+    _save_related(chroma_manager, graph, vectors, careers, k, version)
+    return len(graph)
+
+def update_related_careers(chroma_manager, upserted=(), deleted=(), k=DEFAULT_RELATED_K, version=None):
+    """
+    Apply a catalog change to the stored graph: upserted is an iterable of
+    (record id, metadata), deleted an iterable of record ids. Only those
+    careers are encoded, and only neighbour lists that can change are
+    recomputed: the changed careers' own, lists that contain a changed or
+    deleted career, lists a changed career now scores high enough to enter,
+    and lists that are short of k. Returns False (nothing written) when the
+    stored graph and facets are missing or out of step; rebuild with
+    write_related_careers then.
+    """
+    import numpy as np
+
+    state = _load_related_state(chroma_manager)
+    if state is None:
+        return False
+    graph, vectors, careers = state
+    if graph.get("k") != k:
+        return False
+    related = graph.get("related", {})
+    rows = {career["record_id"]: row for row, career in enumerate(careers)}
+
+    upserted = list(upserted)
+    removed = set(deleted) | {record_id for record_id, _ in upserted}
+    # Career ids whose neighbour entries are stale: old and new ids of every changed record
+    changed_ids = {careers[rows[record_id]]["id"] for record_id in removed if record_id in rows}
+    keep = [row for row, career in enumerate(careers) if career["record_id"] not in removed]
+    upserted = [(record_id, metadata) for record_id, metadata in upserted if metadata.get("id")]
+    changed_ids.update(metadata["id"] for _, metadata in upserted)
+
+    careers = [careers[row] for row in keep] + [_career_entry(record_id, metadata) for record_id, metadata in upserted]
+    blocks = [vectors[keep]] if keep else []
+    if upserted:
+        blocks.append(_facet_matrix([metadata for _, metadata in upserted]))
+    vectors = np.vstack(blocks) if careers else np.zeros((0, 0), dtype=np.float32)
+    new_rows = list(range(len(keep), len(careers)))
+
+    # A changed career enters a list if it scores at least the list's last neighbour
+    entering = np.zeros(len(careers), dtype=bool)
+    if new_rows:
+        for start in range(0, len(careers), 1024):
+            scores = vectors[start:start + 1024] @ vectors[new_rows].T
+            floors = np.array([related[career["id"]][-1]["score"] if related.get(career["id"]) else -np.inf
+                               for career in careers[start:start + 1024]], dtype=np.float32)
+            entering[start:start + 1024] = (scores >= floors[:, None] - 1e-4).any(axis=1)
+
+    affected = [row for row, career in enumerate(careers)
+                if row >= len(keep) or entering[row] or len(related.get(career["id"], [])) < k
+                or any(entry.get("id") in changed_ids for entry in related.get(career["id"], []))]
+    graph = {career["id"]: related[career["id"]] for career in careers if career["id"] in related}
+    if affected:
+        graph.update(_related_rows(vectors, careers, affected, k))
+    _save_related(chroma_manager, graph, vectors, careers, k, version)
+    return True
+
+class RelatedCareers:
+    """
+    Read side of the graph: a dict lookup per career, reloaded from disk
+    when ingestion moves the catalog version on.
+    """
+
+    def __init__(self, chroma_manager):
+        self.chroma_manager = chroma_manager
+        self.path = related_careers_path(chroma_manager)
+        self.related = {}
+        self.loaded_version = None
+        # (catalog version, file mtime) last found unusable, so it is not re-read per lookup
+        self.rejected = None
+        self._lock = threading.Lock()
+
+    def ensure_current(self):
+        version = self.chroma_manager.catalog_version()
+        if self.loaded_version == version:
+            return
+        with self._lock:
+            if self.loaded_version == version:
+                return
+            try:
+                checked = (version, os.stat(self.path).st_mtime_ns)
+            except OSError:
+                checked = (version, None)
+            if self.rejected == checked:
+                return
+            try:
+                with open(self.path, 'r', encoding='utf-8') as file:
+                    graph = json.load(file)
+            except (OSError, ValueError):
+                graph = {}
+            if graph.get("version") != version:
+                # Not built yet, or written for another catalog version: keep what
+                # is loaded until the catalog version or the file changes
+                self.rejected = checked
+                return
+            self.related = graph.get("related", {})
+            self.loaded_version = version
+
+    def lookup(self, career_id, top_k=3):
+        """Up to top_k related careers for career_id (empty if unknown)"""
+        self.ensure_current()
+        return [dict(entry) for entry in self.related.get(career_id, [])[:top_k]]
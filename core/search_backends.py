@@ -0,0 +1,287 @@
+# Pluggable vector search backends behind CareerCounselor.search_career_data
+import json
+import os
+import threading
+from types import MappingProxyType
+
+from .cache import LRUCache
+from .career_metadata import chroma_where, column_mask, restore_lists, typed_column_arrays
+from .embeddings import encode_queries, get_embedding_backend, get_embedding_model_name, normalize_query
+from .telemetry import increment, span
+
+# Search results shared across sessions, keyed by
+# (backend, model, encoder backend, normalized query, top_k, filters, catalog version)
+search_result_cache = LRUCache(
+    maxsize=int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("SEARCH_RESULT_CACHE_TTL", "600"))
+)
+
+def freeze_metadata(metadata):
+    """Read-only view of a result with its list fields restored, safe to share between sessions"""
+    return MappingProxyType(restore_lists(metadata))
+
+class ChromaSearchBackend:
+    """Approximate search through the persistent Chroma collection (HNSW)"""
+
+    name = "chroma"
+
+    def __init__(self, chroma_manager, collection=None):
+        self.chroma_manager = chroma_manager
+        self.collection = collection or chroma_manager.get_collection()
+
+    def version(self):
+        return self.chroma_manager.catalog_version()
+
+    def refresh(self):
+        """Nothing is exported for this backend"""
+
+    def query_embeddings(self, embeddings, top_k, where=None):
+        """Top-k result metadata for each query embedding, filtered by compiled clauses"""
+        with span("search.query", backend=self.name):
+            results = self.collection.query(
+                query_embeddings=[list(embedding) for embedding in embeddings],
+                n_results=top_k,
+                where=chroma_where(where) if where else None,
+                include=['metadatas', 'distances']
+            )
+        return [[freeze_metadata(metadata) for metadata in metadatas]
+                for metadatas in (results['metadatas'] or [])]
+
+def numpy_index_dir(chroma_manager):
+    return os.path.join(chroma_manager.path, "numpy_index")
+
+def write_numpy_index(chroma_manager, collection, chunk_size=1024, version=None):
+    """
+    Export the collection to an in-process index: L2-normalized float32
+    vectors in one contiguous .npy file plus a parallel metadata array.
+
+    Rows are streamed from Chroma chunk_size at a time into a memory-mapped
+    output file, so the export does not hold the catalog twice in RAM. The
+    index is stamped with version (default: the current catalog version).
+    """
+    import numpy as np
+
+    index_dir = numpy_index_dir(chroma_manager)
+    os.makedirs(index_dir, exist_ok=True)
+    if version is None:
+        version = chroma_manager.catalog_version()
+    total = collection.count()
+
+    ids, metadatas = [], []
+    vectors = None
+    vectors_tmp = os.path.join(index_dir, f"vectors.{os.getpid()}.tmp.npy")
+    for offset in range(0, total, chunk_size):
+        batch = collection.get(include=['embeddings', 'metadatas'], limit=chunk_size, offset=offset)
+        block = np.asarray(batch['embeddings'], dtype=np.float32)
+        if vectors is None:
+            vectors = np.lib.format.open_memmap(vectors_tmp, mode='w+', dtype=np.float32,
+                                                shape=(total, block.shape[1]))
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        block /= np.maximum(norms, 1e-12)
+        vectors[len(ids):len(ids) + len(block)] = block
+        ids.extend(batch['ids'])
+        metadatas.extend(batch['metadatas'])
+
+    if vectors is None:
+        vectors = np.lib.format.open_memmap(vectors_tmp, mode='w+', dtype=np.float32, shape=(0, 0))
+    vectors.flush()
+    del vectors
+    os.replace(vectors_tmp, os.path.join(index_dir, "vectors.npy"))
+
+    metadata_tmp = os.path.join(index_dir, f"metadata.{os.getpid()}.tmp.json")
+    with open(metadata_tmp, 'w', encoding='utf-8') as file:
+        json.dump({"version": version, "ids": ids, "metadatas": metadatas}, file, ensure_ascii=False)
+    os.replace(metadata_tmp, os.path.join(index_dir, "metadata.json"))
+    return len(ids)
+
+class NumpySearchBackend:
+    """
+    Exact brute-force cosine search over an in-RAM (optionally memory-mapped)
+    embedding matrix: one matrix-vector product plus argpartition per query.
+
+    Suited to catalogs of ~100-10,000 careers, where it is faster than a
+    round trip through Chroma's SQLite/HNSW layers. The index is exported
+    from the collection at ingestion time and reloaded when the catalog
+    version moves on. Searches never write the export: until ingestion (or
+    refresh() at warm-up) has written it for the current version, the
+    loaded index keeps serving.
+    """
+
+    name = "numpy"
+
+    def __init__(self, chroma_manager, collection=None, mmap=None):
+        self.chroma_manager = chroma_manager
+        self.collection = collection
+        self.index_dir = numpy_index_dir(chroma_manager)
+        if mmap is None:
+            mmap = os.getenv("NUMPY_INDEX_MMAP", "true").lower() not in ("0", "false", "no")
+        self.mmap = mmap
+        self.vectors = None
+        self.ids = ()
+        self.metadatas = ()
+        self.columns = {}
+        self.loaded_version = None
+        # (catalog version, metadata.json mtime) last found unusable, so it is not re-read per query
+        self.rejected = None
+        self._lock = threading.Lock()
+
+    def version(self):
+        """Catalog version of the loaded index; results are cached under it"""
+        self.ensure_current()
+        return self.loaded_version
+
+    def _load(self, version):
+        """Load the export if it was written for version; False (nothing changed) otherwise"""
+        import numpy as np
+
+        with open(os.path.join(self.index_dir, "metadata.json"), 'r', encoding='utf-8') as file:
+            index = json.load(file)
+        if index.get("version") != version:
+            return False
+        vectors = np.load(os.path.join(self.index_dir, "vectors.npy"), mmap_mode='r' if self.mmap else None)
+        if len(vectors) != len(index["ids"]):
+            raise ValueError("NumPy index files are out of step")
+        self.vectors = vectors
+        self.ids = tuple(index["ids"])
+        self.metadatas = tuple(freeze_metadata(metadata) for metadata in index["metadatas"])
+        # Typed filter columns (industry/job_outlook codes, salaries) as arrays
+        self.columns = typed_column_arrays(index["metadatas"])
+        self.loaded_version = index["version"]
+        return True
+
+    def ensure_current(self):
+        """
+        Load the export once it matches the catalog version. A missing or
+        stale export is checked again only when the catalog version or the
+        export changes; meanwhile the loaded index (if any) keeps serving.
+        """
+        version = self.chroma_manager.catalog_version()
+        if self.loaded_version == version:
+            return
+        with self._lock:
+            if self.loaded_version == version:
+                return
+            try:
+                checked = (version, os.stat(os.path.join(self.index_dir, "metadata.json")).st_mtime_ns)
+            except OSError:
+                checked = (version, None)
+            if self.rejected == checked:
+                return
+            try:
+                loaded = self._load(version)
+            except (OSError, ValueError, KeyError):
+                loaded = False
+            if not loaded:
+                self.rejected = checked
+
+    def refresh(self):
+        """
+        Rebuild the export from the collection if it lags the catalog, then
+        load it. Writes files, so only warm-up calls it, never a search.
+        """
+        self.ensure_current()
+        if self.loaded_version != self.chroma_manager.catalog_version():
+            with self._lock:
+                write_numpy_index(self.chroma_manager, self.collection or self.chroma_manager.get_collection())
+                self.rejected = None
+            self.ensure_current()
+
+    def query_embeddings(self, embeddings, top_k, where=None):
+        """Top-k result metadata for each query embedding, filtered by compiled clauses"""
+        with span("search.query", backend=self.name):
+            return self._query(embeddings, top_k, where)
+
+    def _query(self, embeddings, top_k, where):
+        import numpy as np
+
+        self.ensure_current()
+        mask = column_mask(self.columns, where) if where and len(self.ids) else None
+        candidates = len(self.ids) if mask is None else int(mask.sum())
+        if not candidates:
+            return [[] for _ in embeddings]
+
+        queries = np.asarray(embeddings, dtype=np.float32)
+        queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        scores = queries @ self.vectors.T
+        if mask is not None:
+            # Filtered-out careers can never reach the top k
+            scores[:, ~mask] = -np.inf
+
+        k = min(top_k, candidates)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return [[self.metadatas[i] for i in row] for row in top]
+
+SEARCH_BACKENDS = {
+    ChromaSearchBackend.name: ChromaSearchBackend,
+    NumpySearchBackend.name: NumpySearchBackend
+}
+
+def create_search_backend(chroma_manager, collection=None, name=None):
+    """Backend named by name or the SEARCH_BACKEND env var ("chroma" or "numpy")"""
+    name = (name or os.getenv("SEARCH_BACKEND", "chroma")).lower()
+    if name not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown SEARCH_BACKEND {name!r}; choose from {sorted(SEARCH_BACKENDS)}")
+    return SEARCH_BACKENDS[name](chroma_manager, collection)
+
+def cached_search(backend, query, top_k=5, where=None):
+    """
+    Vector search through backend with the shared result cache.
+
+    Results are cached per catalog version, so ingestion invalidates them
+    automatically. Each result is a read-only mapping, so sessions sharing
+    a cached entry cannot change each other's data.
+    """
+    return cached_search_many(backend, [query], top_k, where)[0]
+
+def cached_search_many(backend, queries, top_k=5, where=None):
+    """
+    Top-k results for each query, in order, through the shared result cache.
+
+    Cache misses are embedded in one encode batch and searched with one
+    batched backend call (one collection.query or one matrix product).
+    where (compiled filter clauses) is applied inside the backend search.
+    """
+    model_name = get_embedding_model_name()
+    version = backend.version()
+    encoder = get_embedding_backend()
+    keys = [(backend.name, model_name, encoder, normalize_query(query), top_k, where, version) for query in queries]
+
+    results = {}
+    missing = []
+    for key in keys:
+        if key in results or key in missing:
+            continue
+        cached = search_result_cache.get(key)
+        if cached is None:
+            missing.append(key)
+        else:
+            results[key] = cached
+    increment("cache_requests_total", len(results), cache="search_result", result="hit")
+    increment("cache_requests_total", len(missing), cache="search_result", result="miss")
+
+    if missing:
+        embeddings = encode_queries([key[3] for key in missing], model_name)
+        for key, metadatas in zip(missing, backend.query_embeddings(embeddings, top_k, where)):
+            results[key] = tuple(metadatas)
+            search_result_cache.set(key, results[key])
+    return [list(results[key]) for key in keys]
+
+def reciprocal_rank_fusion(result_lists, top_k=5, k=60):
+    """
+    Merge ranked result lists with reciprocal-rank fusion.
+
+    Each career scores sum(1 / (k + rank)) over the lists it appears in, so
+    careers that rank well for several queries rise to the top without
+    having to compare similarity scores across queries.
+    """
+    scores = {}
+    careers = {}
+    for results in result_lists:
+        for rank, career in enumerate(results, start=1):
+            career_id = career.get("id") or career.get("title")
+            scores[career_id] = scores.get(career_id, 0.0) + 1.0 / (k + rank)
+            careers.setdefault(career_id, career)
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [careers[career_id] for career_id in ranked[:top_k]]
@@ -0,0 +1,91 @@
+# Single-flight: concurrent identical calls share one in-flight execution
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution (threads).
+
+    The first caller for a key runs the function; callers that arrive while
+    it is running block until it finishes and get the same result, or the
+    same exception raised again. Nothing is remembered afterwards: the next
+    call for the key runs the function again (caching is the caller's job).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, _Call] = {}
+
+    def do(self, key, function: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """Return (result, shared); shared is True if another caller's execution was reused"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = function(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Forget the key before waking waiters so later callers start a fresh call
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+class AsyncSingleFlight:
+    """
+    Collapse concurrent awaits with the same key into one execution (asyncio).
+
+    The work runs as its own task and every caller, including the first,
+    awaits it through asyncio.shield: cancelling one caller (e.g. a profile
+    extraction that timed out) never cancels the request other sessions are
+    waiting on. Results and exceptions reach every caller. Tasks belong to
+    one event loop, so keys are tracked per loop.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, Any], asyncio.Task] = {}
+
+    async def do(self, key, function: Callable[..., Awaitable[Any]], *args, **kwargs) -> Tuple[Any, bool]:
+        """Return (result, shared); shared is True if another caller's execution was reused"""
+        task_key = (asyncio.get_running_loop(), key)
+        task = self._tasks.get(task_key)
+        shared = task is not None
+        if not shared:
+            task = asyncio.ensure_future(function(*args, **kwargs))
+            self._tasks[task_key] = task
+            task.add_done_callback(lambda finished: self._finished(task_key, finished))
+        return await asyncio.shield(task), shared
+
+    def _finished(self, task_key, task):
+        if self._tasks.get(task_key) is task:
+            del self._tasks[task_key]
+        # Mark the exception retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
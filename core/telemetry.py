@@ -0,0 +1,247 @@
+# Lightweight tracing spans, counters and a Prometheus text endpoint
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+# Off by default; when off, span() returns a shared no-op and counters return at once
+ENABLED = os.getenv("TELEMETRY_ENABLED", "false").lower() in ("1", "true", "yes")
+
+METRIC_PREFIX = "career_chatbot_"
+
+# Latency histogram buckets in seconds (Prometheus "le" bounds)
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_HELP = {
+    "span_duration_seconds": ("histogram", "Duration of traced operations"),
+    "span_errors_total": ("counter", "Traced operations that raised"),
+    "llm_time_to_first_token_seconds": ("histogram", "Time until the first streamed LLM token"),
+    "cache_requests_total": ("counter", "Cache lookups by cache and result (hit/miss)"),
+    "fallbacks_total": ("counter", "Canned fallback answers or results served instead of a real one"),
+    "errors_total": ("counter", "Errors caught and turned into st.error/print output"),
+    "ingested_records_total": ("counter", "Catalog records seen by ingestion, by outcome"),
+    "llm_requests_deduplicated_total": ("counter", "Structured LLM calls served by an identical request already in flight")
+}
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+
+# Per-session trace buffer (a deque) for the debug panel, set around each script run
+_session_trace = contextvars.ContextVar("session_trace", default=None)
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def increment(metric, amount=1, **labels):
+    """Add amount to a counter"""
+    if not ENABLED:
+        return
+    key = (metric, _label_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def observe(metric, value, **labels):
+    """Record one observation in a histogram"""
+    if not ENABLED:
+        return
+    key = (metric, _label_key(labels))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {"buckets": [0] * len(DURATION_BUCKETS), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                histogram["buckets"][i] += 1
+        histogram["sum"] += value
+        histogram["count"] += 1
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **labels):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class Span:
+    """Times a block with a monotonic clock and records it on exit"""
+
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def set(self, **labels):
+        """Attach labels discovered inside the block (e.g. cache hit/miss)"""
+        self.labels.update(labels)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        # BaseException subclasses (e.g. Streamlit's rerun/stop) are control flow, not errors
+        failed = exc_type is not None and issubclass(exc_type, Exception)
+        record_span(self.name, time.perf_counter() - self.started,
+                    error=exc_type.__name__ if failed else None, **self.labels)
+        return False
+
+def record_span(name, duration, error=None, **labels):
+    """Record an operation timed elsewhere (e.g. a stream that outlives its function call)"""
+    if not ENABLED:
+        return
+    observe("span_duration_seconds", duration, span=name, **labels)
+    if error:
+        increment("span_errors_total", span=name, error=error)
+    trace = _session_trace.get()
+    if trace is not None:
+        trace.append({"span": name, "labels": dict(labels), "ms": duration * 1000,
+                      "error": error, "at": time.time()})
+
+def span(name, **labels):
+    """Context manager timing a block, e.g. `with span("search.query", backend="numpy"):`"""
+    if not ENABLED:
+        return _NOOP_SPAN
+    return Span(name, labels)
+
+def traced(name, **labels):
+    """Decorator form of span() for a whole function"""
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return function(*args, **kwargs)
+            with Span(name, dict(labels)):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class session_trace:
+    """Collect the spans of the current script run into a per-session buffer"""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.token = None
+
+    def __enter__(self):
+        if ENABLED:
+            self.token = _session_trace.set(self.buffer)
+        return self.buffer
+
+    def __exit__(self, *exc_info):
+        if self.token is not None:
+            _session_trace.reset(self.token)
+        return False
+
+def new_trace_buffer():
+    return deque(maxlen=int(os.getenv("TELEMETRY_SESSION_SPANS", "200")))
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: {"buckets": list(value["buckets"]), "sum": value["sum"], "count": value["count"]}
+                      for key, value in _histograms.items()}
+
+    lines = []
+    metrics = sorted({metric for metric, _ in counters} | {metric for metric, _ in histograms})
+    for metric in metrics:
+        kind, help_text = METRIC_HELP.get(metric, ("counter", metric))
+        name = METRIC_PREFIX + metric
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (counter_metric, labels), value in sorted(counters.items()):
+            if counter_metric == metric:
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        for (histogram_metric, labels), histogram in sorted(histograms.items()):
+            if histogram_metric != metric:
+                continue
+            for bound, count in zip(DURATION_BUCKETS, histogram["buckets"]):
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', repr(bound))])} {count}")
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {histogram['count']}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram['sum']}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+def snapshot():
+    """Counters, per-span and other histogram count/mean summaries, for the debug panel"""
+    def summary(value):
+        return {"count": value["count"], "mean_ms": value["sum"] / value["count"] * 1000 if value["count"] else 0.0}
+
+    with _lock:
+        counters = {f"{metric}{_format_labels(labels)}": value for (metric, labels), value in _counters.items()}
+        spans = {_format_labels(labels): summary(value)
+                 for (metric, labels), value in _histograms.items() if metric == "span_duration_seconds"}
+        # e.g. llm_time_to_first_token_seconds for streamed explanations
+        histograms = {f"{metric}{_format_labels(labels)}": summary(value)
+                      for (metric, labels), value in _histograms.items() if metric != "span_duration_seconds"}
+    return {"counters": counters, "spans": spans, "histograms": histograms}
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+_server = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+def start_metrics_server(host=None, port=None):
+    """
+    Serve /metrics in the Prometheus text format from a daemon thread, once
+    per process (TELEMETRY_HOST/TELEMETRY_PORT, default 127.0.0.1:9464).
+    Returns the server, or None when telemetry is disabled or the port could
+    not be bound (only tried once, not on every Streamlit rerun).
+    """
+    global _server, _server_failed
+    if not ENABLED or _server_failed:
+        return None
+    if _server is None:
+        with _server_lock:
+            if _server is None and not _server_failed:
+                from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+                class MetricsHandler(BaseHTTPRequestHandler):
+                    def do_GET(self):
+                        if self.path.split("?")[0] not in ("/metrics", "/"):
+                            self.send_error(404)
+                            return
+                        body = render_prometheus().encode("utf-8")
+                        self.send_response(200)
+                        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                        self.send_header("Content-Length", str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+
+                    def log_message(self, format, *args):
+                        pass
+
+                host = host or os.getenv("TELEMETRY_HOST", "127.0.0.1")
+                port = int(port or os.getenv("TELEMETRY_PORT", "9464"))
+                try:
+                    server = ThreadingHTTPServer((host, port), MetricsHandler)
+                except OSError as e:
+                    # Another worker process already serves this port
+                    print(f"Metrics endpoint not started on {host}:{port}: {e}")
+                    _server_failed = True
+                    return None
+                threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+                _server = server
+    return _server
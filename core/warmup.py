@@ -0,0 +1,147 @@
+# Once-per-process warm-up of the catalog, embedding model and search indexes
+import os
+import threading
+import time
+
+from .lazy_imports import HEAVY_MODULES, lazy_import
+
+# Run in order by the warm-up thread; status() reports the current one
+WARMUP_STAGES = ("imports", "catalog", "embedding_model", "counselor", "kernels")
+
+class Warmup:
+    """
+    Background warm-up with a readiness flag.
+
+    Imports the search/LLM stack, syncs the catalog (an unchanged catalog is
+    a cheap no-op; a missing ./chroma_db is built here rather than inside a
+    user request), loads the embedding model, builds the shared counselor
+    and runs a throwaway encode and search so the first real query does not
+    pay for lazy kernel initialization. User-facing code waits on ready
+    instead of loading anything itself.
+
+    ready is set once the first attempt finishes, successful or not, so
+    waiting requests are released either way; they check error and fall
+    back while it is set. A failed attempt is retried by the warm-up
+    thread after a backoff (WARMUP_RETRY_BACKOFF seconds, doubling up to
+    WARMUP_RETRY_MAX_BACKOFF), never inside a request.
+    """
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.stage = None
+        self.error = None
+        self.attempts = 0
+        self.next_retry = None
+        self.timings = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the warm-up thread once per process and return it"""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self.run, kwargs={"retry": True},
+                                                    name="warmup", daemon=True)
+                    self._thread.start()
+        return self._thread
+
+    def run(self, retry=False):
+        """Warm up; with retry, keep retrying failed attempts after a growing backoff"""
+        backoff = float(os.getenv("WARMUP_RETRY_BACKOFF", "30"))
+        max_backoff = float(os.getenv("WARMUP_RETRY_MAX_BACKOFF", "600"))
+        while not self._attempt() and retry:
+            self.next_retry = time.time() + backoff
+            print(f"Retrying warm-up in {backoff:.0f}s")
+            time.sleep(backoff)
+            self.next_retry = None
+            backoff = min(backoff * 2, max_backoff)
+
+    def _attempt(self):
+        """One pass over WARMUP_STAGES; True if it succeeded"""
+        started = time.perf_counter()
+        self.attempts += 1
+        try:
+            for stage in WARMUP_STAGES:
+                self.stage = stage
+                stage_started = time.perf_counter()
+                getattr(self, f"_warm_{stage}")()
+                self.timings[stage] = time.perf_counter() - stage_started
+            self.stage = "ready"
+            # Cleared only now, so requests keep falling back while a retry runs
+            self.error = None
+            print(f"Warm-up finished in {time.perf_counter() - started:.2f}s")
+            return True
+        except Exception as e:
+            self.error = e
+            print(f"Warm-up failed during {self.stage}: {e}")
+            return False
+        finally:
+            # Set even on failure so waiting requests are released and fall back
+            self.ready.set()
+
+    def _warm_imports(self):
+        for name in HEAVY_MODULES:
+            lazy_import(name)
+
+    def _warm_catalog(self):
+        if os.getenv("WARMUP_SYNC_CATALOG", "true").lower() in ("0", "false", "no"):
+            return
+        from data.career_embeddings import populate_career_database
+        if not populate_career_database(test_search=False):
+            raise RuntimeError("career database sync failed")
+
+    def _warm_embedding_model(self):
+        from .embeddings import get_embedding_model
+        get_embedding_model()
+
+    def _warm_counselor(self):
+        from .career_counselor import get_career_counselor
+        get_career_counselor()
+
+    def _warm_kernels(self):
+        from .career_counselor import get_career_counselor
+        from .embeddings import get_embedding_model
+        counselor = get_career_counselor()
+        # The NumPy export is only ever rebuilt here or by ingestion, never in a search
+        counselor.search_backend.refresh()
+        # Encoded directly so the query caches stay clean
+        embedding = get_embedding_model().encode(["warm up career search"])[0]
+        counselor.search_backend.query_embeddings([embedding.tolist()], 1)
+        counselor.lexical_index.search("warm up", 1)
+        counselor.related_careers.ensure_current()
+
+    def wait(self, timeout=None):
+        """Block until warm-up finished (or timeout); True if it succeeded"""
+        return self.ready.wait(timeout) and self.error is None
+
+    def status(self):
+        return {
+            "ready": self.ready.is_set() and self.error is None,
+            "stage": self.stage,
+            "error": str(self.error) if self.error else None,
+            "attempts": self.attempts,
+            "next_retry": self.next_retry,
+            "timings": dict(self.timings)
+        }
+
+_warmup = Warmup()
+
+def start_warmup():
+    """Kick off the process-wide warm-up (no-op after the first call)"""
+    return _warmup.start()
+
+def is_ready():
+    return _warmup.ready.is_set() and _warmup.error is None
+
+def wait_until_ready(timeout=None):
+    return _warmup.wait(timeout)
+
+def warmup_status():
+    return _warmup.status()
+
+if __name__ == "__main__":
+    # Pre-deploy: sync the catalog, download the model and warm everything up
+    # before the server takes traffic (python -m core.warmup)
+    _warmup.run()
+    print(warmup_status())
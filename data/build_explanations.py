@@ -0,0 +1,86 @@
+# Batch job: pre-generate career explanations for every (career, stage, interest cluster)
+import sys
+import os
+import time
+import asyncio
+import argparse
+from dotenv import load_dotenv
+
+# Add the parent directory to the path so we can import from core
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+load_dotenv()
+
+async def build_explanations(store, careers, stages, clusters, concurrency):
+    """Generate every missing explanation with at most `concurrency` requests in flight"""
+    from core.async_llm_manager import AsyncLLMManager
+    from core.explanation_store import INTEREST_CLUSTERS, explanation_key
+    
+    manager = AsyncLLMManager(max_concurrency=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"generated": 0, "skipped": 0, "failed": 0}
+    started = time.perf_counter()
+    
+    async def generate(career, stage, cluster):
+        key = explanation_key(career['id'], stage, cluster)
+        async with semaphore:
+            try:
+                text = await manager.generate_career_explanation(
+                    career['title'],
+                    {
+                        "interest_cluster": INTEREST_CLUSTERS[cluster],
+                        "career_industry": career.get('industry', ''),
+                        "career_skills": career.get('skills', [])
+                    },
+                    "high",
+                    stage,
+                    raise_errors=True
+                )
+            except Exception as e:
+                stats["failed"] += 1
+                print(f"  ❌ {key}: {e}")
+                return
+        # Appended immediately, so an interrupted run resumes where it stopped
+        store.append(key, text)
+        stats["generated"] += 1
+        done = stats["generated"] + stats["failed"]
+        if done % 50 == 0:
+            rate = stats["generated"] / (time.perf_counter() - started)
+            print(f"  {done} done ({stats['failed']} failed) - {rate:.1f} explanations/s")
+    
+    jobs = []
+    for career in careers:
+        for stage in stages:
+            for cluster in clusters:
+                if explanation_key(career['id'], stage, cluster) in store:
+                    stats["skipped"] += 1
+                else:
+                    jobs.append(generate(career, stage, cluster))
+    
+    print(f"Generating {len(jobs)} explanations ({stats['skipped']} already stored)...")
+    await asyncio.gather(*jobs)
+    await manager.aclose()
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate career explanations offline")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at once")
+    parser.add_argument("--output", help="Explanation store path (default data/career_explanations.jsonl)")
+    parser.add_argument("--limit", type=int, help="Only the first N careers (for trial runs)")
+    args = parser.parse_args()
+    
+    from core.explanation_store import EXPLANATIONS_PATH, INTEREST_CLUSTERS, USER_STAGES, ExplanationStore
+    from data.career_catalog import load_career_catalog
+    
+    store = ExplanationStore(args.output or EXPLANATIONS_PATH)
+    careers = load_career_catalog()[:args.limit]
+    
+    started = time.perf_counter()
+    stats = asyncio.run(build_explanations(store, careers, USER_STAGES, list(INTEREST_CLUSTERS), args.concurrency))
+    print(f"✅ {stats['generated']} generated, {stats['skipped']} skipped, {stats['failed']} failed "
+          f"in {time.perf_counter() - started:.1f}s ({len(store)} stored in {store.path})")
+    if stats["failed"]:
+        print("Re-run the same command to retry the failures.")
+
+if __name__ == "__main__":
+    main()
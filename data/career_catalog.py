@@ -0,0 +1,85 @@
+# Career catalog sources: the full JSON catalog plus the hand-written sample list
+import json
+import os
+
+CAREER_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "career_data.json")
+
+# Characters read per refill when streaming a JSON array
+READ_SIZE = 1 << 16
+
+def _iter_json_array(file, read_size=READ_SIZE):
+    """Yield the elements of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+    in_array = False
+
+    while True:
+        # Skip whitespace (and element separators once inside the array)
+        while pos < len(buffer) and (buffer[pos].isspace() or (in_array and buffer[pos] == ',')):
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON career catalog")
+            chunk = file.read(read_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+
+        if not in_array:
+            if buffer[pos] != '[':
+                raise ValueError("Expected the JSON career catalog to be an array")
+            in_array = True
+            pos += 1
+            continue
+        if buffer[pos] == ']':
+            return
+
+        try:
+            record, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Element is split across reads: pull in more text and retry
+            if eof:
+                raise
+            chunk = file.read(read_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield record
+
+def _iter_json_lines(file):
+    """Yield one record per non-blank line of a JSONL file"""
+    for line in file:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def iter_catalog_records(path):
+    """Stream career records from a JSON array (.json) or JSON Lines (.jsonl/.ndjson) file"""
+    with open(path, 'r', encoding='utf-8') as file:
+        if path.endswith(('.jsonl', '.ndjson')):
+            yield from _iter_json_lines(file)
+        else:
+            yield from _iter_json_array(file)
+
+def iter_career_catalog(path=CAREER_DATA_PATH, include_samples=True):
+    """
+    Stream the merged career catalog with one entry per career id.
+
+    Entries from the catalog file take precedence; careers that only exist
+    in sample_careers.py are yielded after them. Only ids are kept in memory.
+    """
+    known_ids = set()
+    for career in iter_catalog_records(path):
+        known_ids.add(career.get('id'))
+        yield career
+
+    if include_samples:
+        from data.sample_careers import career_data_sample
+        for career in career_data_sample:
+            if career.get('id') not in known_ids:
+                known_ids.add(career.get('id'))
+                yield career
+
+def load_career_catalog(path=CAREER_DATA_PATH):
+    """Return the merged career catalog as a list"""
+    return list(iter_career_catalog(path))
@@ -1,6 +1,8 @@
 # Script to populate Chroma database with career data
 import sys
 import os
+import time
+import argparse
 from dotenv import load_dotenv
 
 # Add the parent directory to the path so we can import from core
@@ -8,74 +10,64 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 load_dotenv()
 
-def populate_career_database():
-    """Populate the Chroma database with career information"""
+def print_progress(stats):
+    """Print running sync progress and throughput"""
+    print(f"  {stats['processed']} records processed "
+          f"({stats['added']} added, {stats['updated']} updated) - "
+          f"{stats['records_per_second']:.0f} records/s")
+
+def populate_career_database(test_search=None, source=None, batch_size=None, chunk_size=None):
+    """
+    Incrementally sync the Chroma database with the career catalog.
+
+    Only new or changed careers are embedded and careers removed from the
+    catalog are deleted, so re-running on an unchanged catalog never loads
+    the embedding model. Records are streamed from source (a .json array or
+    .jsonl file, default data/career_data.json plus the sample careers) and
+    embedded/written in bounded batches. The search smoke test runs when
+    something changed, or always/never when test_search is True/False.
+    """
     try:
-        print("Initializing Career Counselor...")
-        
         # Import after path setup and with error handling
         from core.chroma_manager import ChromaManager
-        from data.sample_careers import career_data_sample
-        from sentence_transformers import SentenceTransformer
+        from core.embeddings import DEFAULT_BATCH_SIZE
+        from core.ingestion import DEFAULT_CHUNK_SIZE, sync_careers
+        from data.career_catalog import CAREER_DATA_PATH, iter_career_catalog
         
-        # Initialize components separately to avoid conflicts
+        started = time.perf_counter()
         print("Setting up Chroma database...")
         chroma_manager = ChromaManager()
-        collection = chroma_manager.get_or_create_collection()
-        
-        print("Loading embedding model...")
-        model_name = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
-        embedding_model = SentenceTransformer(model_name)
         
-        print(f"Populating database with {len(career_data_sample)} careers...")
+        if source:
+            careers = iter_career_catalog(source, include_samples=False)
+        else:
+            careers = iter_career_catalog(CAREER_DATA_PATH)
         
-        documents = []
-        metadatas = []
-        ids = []
-        
-        for i, career in enumerate(career_data_sample):
-            # Create text to embed for career description
-            skills_text = ' '.join(career.get('skills', []))
-            text_to_embed = f"{career['title']} {career['description']} {skills_text} {career['industry']}"
-            
-            # Convert metadata to ChromaDB-compatible format (no lists)
-            safe_metadata = {}
-            for key, value in career.items():
-                if isinstance(value, list):
-                    # Convert lists to comma-separated strings
-                    safe_metadata[key] = ', '.join(str(item) for item in value)
-                elif isinstance(value, (str, int, float, bool)):
-                    safe_metadata[key] = value
-                else:
-                    # Convert other types to string
-                    safe_metadata[key] = str(value)
-            
-            documents.append(text_to_embed)
-            metadatas.append(safe_metadata)
-            ids.append(f"career_{career.get('id', i)}")
-        
-        # Add to collection
-        collection.add(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
+        print(f"Syncing database with {source or 'the built-in career catalog'}...")
+        stats = sync_careers(
+            chroma_manager,
+            careers,
+            batch_size=batch_size or DEFAULT_BATCH_SIZE,
+            chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+            progress=print_progress
         )
+        changed = stats["added"] + stats["updated"] + stats["deleted"]
+        
+        print(f"✅ Career database in sync ({stats['added']} added, {stats['updated']} updated, "
+              f"{stats['deleted']} deleted, {stats['unchanged']} unchanged) "
+              f"in {time.perf_counter() - started:.2f}s, {stats['records_per_second']:.0f} records/s")
         
-        print("✅ Career database populated successfully!")
+        if test_search is None:
+            test_search = changed > 0
+        if not test_search:
+            return True
         
         # Test the search functionality
         print("\n🔍 Testing search functionality...")
         test_queries = ["creative design", "data analysis", "helping people", "technology"]
         
         for query in test_queries:
-            query_embedding = embedding_model.encode([query]).tolist()[0]
-            results = collection.query(
-                query_embeddings=[query_embedding],
-                n_results=3,
-                include=['metadatas', 'documents', 'distances']
-            )
-            
-            career_results = results['metadatas'][0] if results['metadatas'] else []
+            career_results = chroma_manager.search_careers(query, top_k=3)
             print(f"\nQuery: '{query}'")
             print(f"Found {len(career_results)} relevant careers:")
             for i, career in enumerate(career_results, 1):
@@ -88,8 +80,22 @@ def populate_career_database():
         print("Please install required packages: pip install -r requirements.txt")
         return False
     except Exception as e:
+        from core.telemetry import increment
+        increment("errors_total", operation="populate_career_database")
         print(f"❌ Error during database population: {e}")
         return False
 
 if __name__ == "__main__":
-    populate_career_database()
+    parser = argparse.ArgumentParser(description="Sync the career catalog into Chroma")
+    parser.add_argument("--source", help="Career catalog to ingest (.json array or .jsonl)")
+    parser.add_argument("--batch-size", type=int, help="Texts per SentenceTransformer.encode batch")
+    parser.add_argument("--chunk-size", type=int, help="Records compared and written per Chroma call")
+    parser.add_argument("--test-search", action="store_true", default=None,
+                        help="Always run the search smoke test")
+    args = parser.parse_args()
+    populate_career_database(
+        test_search=args.test_search,
+        source=args.source,
+        batch_size=args.batch_size,
+        chunk_size=args.chunk_size
+    )
@@ -0,0 +1,86 @@
+# Export the sentence-transformers embedding model to ONNX and quantize it to int8
+import argparse
+import json
+import os
+import sys
+
+# Add the parent directory to the path so we can import from core
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def export_onnx_model(model_name=None, output_dir=None, quantize=True, opset=14):
+    """
+    Export the transformer behind a SentenceTransformer to ONNX, then apply
+    dynamic int8 quantization (weights stored as int8, activations quantized
+    on the fly) with ONNX Runtime.
+
+    Writes model.onnx, model_int8.onnx, tokenizer.json and encoder_config.json
+    to output_dir, which is all core/onnx_embeddings.py needs at serving time.
+    Needs torch, sentence-transformers and onnxruntime (build time only).
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    from core.embeddings import get_embedding_model_name
+    from core.onnx_embeddings import ENCODER_CONFIG_FILE, default_onnx_model_dir
+
+    model_name = model_name or get_embedding_model_name()
+    output_dir = output_dir or default_onnx_model_dir(model_name)
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"Loading {model_name}...")
+    sentence_model = SentenceTransformer(model_name, device="cpu")
+    transformer = sentence_model[0].auto_model.eval()
+    tokenizer = sentence_model.tokenizer
+    normalize = any(type(module).__name__ == "Normalize" for module in sentence_model)
+
+    sample = tokenizer(["export the career embedding model"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    model_path = os.path.join(output_dir, "model.onnx")
+    print(f"Exporting to {model_path}...")
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            model_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantized_path = os.path.join(output_dir, "model_int8.onnx")
+        print(f"Quantizing to {quantized_path}...")
+        quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, "tokenizer.json"))
+    with open(os.path.join(output_dir, ENCODER_CONFIG_FILE), 'w', encoding='utf-8') as file:
+        json.dump({
+            "model_name": model_name,
+            "dimension": sentence_model.get_sentence_embedding_dimension(),
+            "max_seq_length": sentence_model.max_seq_length,
+            "pooling": "mean",
+            "normalize": normalize,
+            "pad_token": tokenizer.pad_token,
+            "pad_token_id": tokenizer.pad_token_id
+        }, file, indent=2)
+
+    for name in sorted(os.listdir(output_dir)):
+        size = os.path.getsize(os.path.join(output_dir, name)) / 1024 / 1024
+        print(f"  {name}: {size:.1f} MB")
+    print("✅ Export complete. Serve it with EMBEDDING_BACKEND=onnx, then check accuracy with "
+          "`python benchmarks/bench_embedding_backends.py`.")
+    return output_dir
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX (int8)")
+    parser.add_argument("--model", help="Sentence-transformers model (default: EMBEDDING_MODEL)")
+    parser.add_argument("--output", help="Output directory (default: EMBEDDING_ONNX_DIR or models/<model>-onnx)")
+    parser.add_argument("--no-quantize", action="store_true", help="Only export the float32 ONNX model")
+    parser.add_argument("--opset", type=int, default=14)
+    args = parser.parse_args()
+    export_onnx_model(args.model, args.output, quantize=not args.no_quantize, opset=args.opset)
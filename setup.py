@@ -6,13 +6,14 @@ This script initializes the Chroma vector database with career data
 
 import os
 import sys
+import argparse
 from dotenv import load_dotenv
 
 # Add the current directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-def setup_database():
-    """Initialize the vector database with career data"""
+def setup_database(test_search=None):
+    """Initialize or incrementally sync the vector database with career data"""
     print("🚀 Setting up Career Discovery Chatbot...")
     print("=" * 50)
     
@@ -21,26 +22,12 @@ def setup_database():
     
     try:
         # Import after adding to path
-        from core.career_counselor import CareerCounselor
-        from data.sample_careers import career_data_sample
+        from data.career_embeddings import populate_career_database
         
-        print("✅ Initializing Career Counselor...")
-        counselor = CareerCounselor()
-        
-        print(f"📚 Populating database with {len(career_data_sample)} careers...")
-        counselor.populate_career_database(career_data_sample)
-        
-        print("✅ Career database populated successfully!")
-        
-        # Test the search functionality
-        print("\n🔍 Testing search functionality...")
-        test_queries = ["creative design", "data analysis", "helping people", "technology"]
-        
-        for query in test_queries:
-            results = counselor.search_career_data(query, top_k=2)
-            print(f"  Query: '{query}' -> Found {len(results)} careers")
-            for career in results:
-                print(f"    - {career.get('title', 'Unknown')}")
+        # Only new or changed careers are embedded; an unchanged catalog
+        # is a no-op that never loads the embedding model
+        if not populate_career_database(test_search=test_search):
+            return False
         
         print("\n🎉 Setup completed successfully!")
         print("You can now run: streamlit run app.py")
@@ -57,4 +44,8 @@ def setup_database():
     return True
 
 if __name__ == "__main__":
-    setup_database()
+    parser = argparse.ArgumentParser(description="Initialize or sync the career database")
+    parser.add_argument("--test-search", action="store_true", default=None,
+                        help="Always run the search smoke test, even if nothing changed")
+    args = parser.parse_args()
+    setup_database(test_search=args.test_search)